@@ -5,6 +5,8 @@ Vibe Coder Core Modules
 from core.research import ResearchAgent, Trend, AppIdea
 from core.duplicate_checker import DuplicateChecker, DuplicateCheck
 from core.generator import AppGenerator, AppGenerationResult
+from core.templates import TemplateStore, TemplateBundle
+from core.scheduler import GenerationScheduler, GenerationJob
 
 __all__ = [
     'ResearchAgent',
@@ -14,4 +16,8 @@ __all__ = [
     'DuplicateCheck',
     'AppGenerator',
     'AppGenerationResult',
+    'TemplateStore',
+    'TemplateBundle',
+    'GenerationScheduler',
+    'GenerationJob',
 ]
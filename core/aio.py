@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Async I/O
+
+Subprocess and HTTP helpers for the asyncio cycle, so waiting on `gh`,
+git, the AI tool or the network never blocks the event loop.
+"""
+
+import asyncio
+import json
+import subprocess
+import urllib.request
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # optional (requirements.txt); urllib in a worker thread instead
+    aiohttp = None
+
+
+async def run_command(cmd: List[str], cwd: str = None, env: dict = None,
+                      timeout: float = None, input: str = None) -> subprocess.CompletedProcess:
+    """subprocess.run(cmd, capture_output=True, text=True) without blocking the loop.
+
+    Like subprocess.run, the process is killed and subprocess.TimeoutExpired
+    raised after timeout seconds. It is also killed if the caller is cancelled.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(input.encode('utf-8') if input is not None else None),
+            timeout
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        stdout.decode('utf-8', errors='replace'),
+        stderr.decode('utf-8', errors='replace')
+    )
+
+
+@asynccontextmanager
+async def http_session():
+    """Shared aiohttp session for a batch of requests, or None without aiohttp."""
+    if aiohttp is None:
+        yield None
+        return
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+async def fetch_json(url: str, timeout: float = 10, session=None):
+    """GET url and decode its JSON body."""
+    if session is not None:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    return await asyncio.to_thread(_fetch_json, url, timeout)
+
+
+def _fetch_json(url: str, timeout: float) -> Optional[object]:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
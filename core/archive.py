@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Project Archive
+
+Packs old or already-published projects into compressed tarballs with a
+central manifest, and extracts them back only when their files are needed.
+"""
+
+import json
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.publisher import load_published
+
+
+# Enough README for the duplicate checker and `list` output
+README_HEAD_CHARS = 500
+
+
+@dataclass
+class ProjectRecord:
+    """A project, live on disk or archived."""
+    name: str
+    path: str
+    archived: bool
+    readme_head: str = ''
+    github_repo: Optional[str] = None
+
+
+class ProjectArchive:
+    """Archival tier for projects/."""
+
+    def __init__(self, projects_dir: str, config: dict = None, published_file: str = None):
+        archive_config = (config or {}).get('archive', {})
+        self.projects_dir = projects_dir
+        self.published_file = published_file
+        self.archive_dir = os.path.join(projects_dir, '.archive')
+        self.manifest_file = os.path.join(self.archive_dir, 'manifest.json')
+        self.after_days = archive_config.get('after_days', 14)
+        self.archive_pushed = archive_config.get('archive_pushed', True)
+        self.compression = archive_config.get('compression', 'gz')
+        self._lock = threading.Lock()
+
+    def list_projects(self) -> List[ProjectRecord]:
+        """All projects, live ones read from disk and archived ones from the manifest."""
+        records = {}
+        for name, entry in self.load_manifest().items():
+            records[name] = ProjectRecord(
+                name=name,
+                path=os.path.join(self.projects_dir, name),
+                archived=True,
+                readme_head=entry.get('readme_head', ''),
+                github_repo=entry.get('github_repo')
+            )
+
+        if os.path.exists(self.projects_dir):
+            for entry in os.scandir(self.projects_dir):
+                # Skip internal stores such as .templates/ and .archive/
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                records[entry.name] = ProjectRecord(
+                    name=entry.name,
+                    path=entry.path,
+                    archived=False,
+                    readme_head=_read_head(os.path.join(entry.path, 'README.md'))
+                )
+
+        return [records[name] for name in sorted(records)]
+
+    def is_archived(self, name: str) -> bool:
+        return name in self.load_manifest()
+
+    def archive_eligible(self, now: float = None, dry_run: bool = False) -> List[str]:
+        """Archive projects older than after_days or already pushed; returns names."""
+        now = now or time.time()
+        pushed = self._pushed_apps() if self.archive_pushed else {}
+        archived = []
+
+        for record in self.list_projects():
+            if record.archived:
+                continue
+            age_days = (now - _newest_mtime(record.path)) / 86400
+            if age_days < self.after_days and record.name not in pushed:
+                continue
+            if dry_run:
+                archived.append(record.name)
+                continue
+            try:
+                self.archive_project(record.name, github_repo=pushed.get(record.name))
+                archived.append(record.name)
+            except (OSError, tarfile.TarError) as e:
+                print(f"⚠️  Could not archive {record.name}: {e}")
+
+        return archived
+
+    def archive_project(self, name: str, github_repo: Optional[str] = None) -> dict:
+        """Pack projects/<name> into the archive and remove the live tree."""
+        project_path = os.path.join(self.projects_dir, name)
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        archive_name = f"{name}.tar.{self.compression}"
+        archive_path = os.path.join(self.archive_dir, archive_name)
+        fd, tmp_path = tempfile.mkstemp(prefix='.pack-', dir=self.archive_dir)
+        os.close(fd)
+
+        size = 0
+        files = 0
+        try:
+            with tarfile.open(tmp_path, f"w:{self.compression}") as tar:
+                tar.add(project_path, arcname=name)
+            with tarfile.open(tmp_path, f"r:{self.compression}") as tar:
+                for member in tar.getmembers():
+                    if member.isfile():
+                        size += member.size
+                        files += 1
+            os.replace(tmp_path, archive_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        entry = {
+            'archive': archive_name,
+            'archived_at': datetime.utcnow().isoformat(),
+            'files': files,
+            'size_bytes': size,
+            'archive_bytes': os.path.getsize(archive_path),
+            'readme_head': _read_head(os.path.join(project_path, 'README.md')),
+            'github_repo': github_repo,
+        }
+        with self._lock:
+            manifest = self.load_manifest()
+            manifest[name] = entry
+            self._save_manifest(manifest)
+
+        shutil.rmtree(project_path)
+        print(f"🗄️  Archived {name} ({size / 1024:.0f} KB -> {entry['archive_bytes'] / 1024:.0f} KB)")
+        return entry
+
+    def ensure_extracted(self, name: str) -> str:
+        """Return projects/<name>, extracting it from the archive if needed."""
+        project_path = os.path.join(self.projects_dir, name)
+        with self._lock:
+            manifest = self.load_manifest()
+            entry = manifest.get(name)
+            if entry is None or os.path.isdir(project_path):
+                return project_path
+
+            print(f"📤 Extracting {name} from archive...")
+            archive_path = os.path.join(self.archive_dir, entry['archive'])
+            with tarfile.open(archive_path, 'r:*') as tar:
+                members = [m for m in tar.getmembers() if _is_within(m.name, name)]
+                unsafe = [m for m in members if not _link_within(m, name)]
+                for member in unsafe:
+                    print(f"⚠️  Skipping {member.name}: links outside {name}")
+                members = [m for m in members if m not in unsafe]
+                if hasattr(tarfile, 'data_filter'):
+                    # Also refuses anything resolving outside projects/, and
+                    # leaves every file writable by its owner
+                    tar.extractall(self.projects_dir, members=members, filter='data')
+                else:
+                    tar.extractall(self.projects_dir, members=members)
+                    # Archives packed from hardlinked template files carry their read-only mode
+                    for member in members:
+                        if member.isfile() and not member.mode & stat.S_IWUSR:
+                            os.chmod(os.path.join(self.projects_dir, member.name), (member.mode & 0o777) | 0o644)
+
+            del manifest[name]
+            self._save_manifest(manifest)
+            os.unlink(archive_path)
+        return project_path
+
+    def stats(self) -> dict:
+        manifest = self.load_manifest()
+        return {
+            'archived': len(manifest),
+            'size_bytes': sum(e.get('size_bytes', 0) for e in manifest.values()),
+            'archive_bytes': sum(e.get('archive_bytes', 0) for e in manifest.values()),
+        }
+
+    def load_manifest(self) -> Dict[str, dict]:
+        if os.path.exists(self.manifest_file):
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+    def _save_manifest(self, manifest: Dict[str, dict]):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    def _pushed_apps(self) -> Dict[str, str]:
+        """App names with a confirmed GitHub repo URL."""
+        return {name: entry.get('url') for name, entry in load_published(self.published_file).items()}
+
+def _read_head(path: str) -> str:
+    if not os.path.exists(path):
+        return ''
+    try:
+        with open(path, 'r') as f:
+            return f.read(README_HEAD_CHARS)
+    except Exception:
+        return ''
+
+
+def _newest_mtime(path: str) -> float:
+    """Newest mtime among a project's top-level entries."""
+    newest = os.path.getmtime(path)
+    for entry in os.scandir(path):
+        try:
+            newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+        except OSError:
+            continue
+    return newest
+
+
+def _is_within(member_name: str, name: str) -> bool:
+    """Guard against archive members escaping projects/<name>."""
+    normalized = os.path.normpath(member_name)
+    return not os.path.isabs(normalized) and (normalized == name or normalized.startswith(name + os.sep))
+
+
+def _link_within(member: tarfile.TarInfo, name: str) -> bool:
+    """Guard against symlink and hardlink members pointing outside projects/<name>."""
+    if member.issym():
+        target = os.path.join(os.path.dirname(member.name), member.linkname)
+    elif member.islnk():
+        target = member.linkname
+    else:
+        return True
+    return not os.path.isabs(member.linkname) and _is_within(target, name)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Configuration
+
+config.yaml is parsed and validated once per change: the result is kept
+in memory (checked against the file's mtime and size on every read) and in
+state/config.cache.json (keyed by the file's hash), so later starts skip
+the YAML parse. A running daemon or worker polls the file and hands
+changed sections to the components that subscribed to them, so new
+schedules, thresholds and sources apply without a restart.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import yaml
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+CONFIG_FILE = os.path.normpath(os.path.join(ROOT_DIR, 'config.yaml'))
+CACHE_FILE = os.path.join(ROOT_DIR, 'state', 'config.cache.json')
+CACHE_VERSION = 1
+
+# One service per config file, shared by the whole process
+_services: Dict[str, 'ConfigService'] = {}
+_SERVICES_LOCK = threading.Lock()
+_CACHE_LOCK = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """config.yaml can't be parsed or has invalid settings."""
+
+
+class ConfigService:
+    """One config file, parsed once per change, with per-section subscribers."""
+
+    def __init__(self, config_file: str, validate: Callable[[dict], dict] = None,
+                 cache_file: str = None):
+        self.config_file = config_file
+        self.validate = validate
+        self.cache_file = cache_file or CACHE_FILE
+        self._lock = threading.Lock()
+        self._config: Optional[dict] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._hash: Optional[str] = None
+        # What subscribers were last told about
+        self._published: Optional[dict] = None
+        self._subscribers: List[Tuple[Tuple[str, ...], Callable[[dict], None]]] = []
+
+    def get(self) -> dict:
+        """The current config (a copy, safe to modify)."""
+        return copy.deepcopy(self._current())
+
+    def section(self, name: str) -> dict:
+        return copy.deepcopy(self._current().get(name) or {})
+
+    def subscribe(self, sections: Union[str, Iterable[str]], callback: Callable[[dict], None]):
+        """Call callback(config) on the watcher's loop whenever one of sections changes."""
+        if isinstance(sections, str):
+            sections = (sections,)
+        with self._lock:
+            self._subscribers.append((tuple(sections), callback))
+        return callback
+
+    def unsubscribe(self, callback: Callable[[dict], None]):
+        with self._lock:
+            self._subscribers = [(s, c) for s, c in self._subscribers if c is not callback]
+
+    def reload(self) -> List[str]:
+        """Re-read the file if it changed and notify subscribers; the changed sections."""
+        self._current()
+        with self._lock:
+            before, after = self._published or {}, self._config or {}
+            changed = sorted(k for k in set(before) | set(after) if before.get(k) != after.get(k))
+            self._published = self._config
+            callbacks = [c for sections, c in self._subscribers if set(sections) & set(changed)]
+        if changed:
+            print(f"🔁 {os.path.basename(self.config_file)} changed: {', '.join(changed)}")
+        for callback in callbacks:
+            try:
+                callback(self.get())
+            except Exception as e:
+                print(f"⚠️  Applying config change failed: {e}")
+        return changed
+
+    async def watch(self):
+        """Poll the file every reload.poll_seconds (0 stops watching) until cancelled."""
+        while True:
+            poll_seconds = self.section('reload').get('poll_seconds', 5)
+            if not poll_seconds:
+                return
+            await asyncio.sleep(poll_seconds)
+            await asyncio.to_thread(self._current)
+            self.reload()
+
+    def _current(self) -> dict:
+        """The config, re-parsed only when the file's contents changed."""
+        try:
+            st = os.stat(self.config_file)
+            stat = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stat = None
+
+        with self._lock:
+            if self._config is not None and stat == self._stat:
+                return self._config
+
+            if stat is None:
+                raw, digest = None, None
+            else:
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+                digest = hashlib.sha256(raw).hexdigest()
+
+            if self._config is None or digest != self._hash:
+                try:
+                    config = self._compile(raw, digest)
+                except ConfigError as e:
+                    if self._config is None:
+                        raise
+                    # Keep running on the last good config until the file is fixed
+                    print(f"⚠️  Ignoring invalid {os.path.basename(self.config_file)}: {e}")
+                    self._stat = stat
+                    return self._config
+                if self._published is None:
+                    self._published = config
+                self._config, self._hash = config, digest
+            self._stat = stat
+            return self._config
+
+    def _compile(self, raw: Optional[bytes], digest: Optional[str]) -> dict:
+        """Parsed and validated config, from the compiled cache when the hash matches."""
+        if raw is None:
+            return self.validate({}) if self.validate else {}
+
+        key = os.path.abspath(self.config_file)
+        cached = _load_cache(self.cache_file).get(key)
+        if cached is not None and cached.get('sha256') == digest:
+            config = cached['config']
+        else:
+            try:
+                config = yaml.safe_load(raw)
+            except yaml.YAMLError as e:
+                raise ConfigError(str(e))
+            if config is None:
+                config = {}
+            if not isinstance(config, dict):
+                raise ConfigError("the top level must be a mapping of sections")
+            config = self.validate(config) if self.validate else config
+            _save_cache(self.cache_file, key, digest, config)
+        return config
+
+
+def validate_config(config: dict) -> dict:
+    """config with empty sections filled in; raises ConfigError listing every problem."""
+    # Imported here: both read their settings through this module
+    from core.profiles import load_profiles
+    from core.schedule import Schedule
+
+    config = dict(config)
+    errors = []
+    for name, section in config.items():
+        if name == 'profiles':
+            if section is not None and not isinstance(section, list):
+                errors.append("profiles must be a list")
+            config[name] = section or []
+        elif section is None:
+            config[name] = {}
+        elif not isinstance(section, dict):
+            errors.append(f"{name} must be a mapping")
+    if errors:
+        raise ConfigError('; '.join(errors))
+
+    threshold = config.get('duplicate_check', {}).get('similarity_threshold', 0.7)
+    if not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
+        errors.append("duplicate_check.similarity_threshold must be between 0 and 1")
+    if not isinstance(config.get('research', {}).get('sources', []), list):
+        errors.append("research.sources must be a list")
+
+    try:
+        for profile in load_profiles(config):
+            try:
+                Schedule.from_config(profile.config)
+            except (ValueError, KeyError, TypeError) as e:
+                errors.append(f"loop ({profile.name}): {e}")
+    except (ValueError, OSError, AttributeError) as e:
+        errors.append(f"profiles: {e}")
+
+    if errors:
+        raise ConfigError('; '.join(errors))
+    return config
+
+
+def get_config(config_file: str = None) -> ConfigService:
+    """Process-wide service for a config file (default config.yaml); relative paths are from the repo root."""
+    path = os.path.normpath(os.path.join(ROOT_DIR, config_file or 'config.yaml'))
+    with _SERVICES_LOCK:
+        service = _services.get(path)
+        if service is None:
+            # Only config.yaml itself is checked as a whole; profile files are overrides
+            validate = validate_config if path == CONFIG_FILE else None
+            service = _services[path] = ConfigService(path, validate)
+        return service
+
+
+def load_config(config_file: str = None) -> dict:
+    """The current contents of config.yaml (or config_file)."""
+    return get_config(config_file).get()
+
+
+def _load_cache(cache_file: str) -> dict:
+    try:
+        with open(cache_file, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def _save_cache(cache_file: str, key: str, digest: str, config: dict):
+    """Store a compiled config; values JSON can't hold are just not cached."""
+    try:
+        entry = json.loads(json.dumps({'sha256': digest, 'config': config}))
+    except (TypeError, ValueError):
+        return
+    if entry['config'] != config:
+        return
+    with _CACHE_LOCK:
+        files = _load_cache(cache_file)
+        files[key] = entry
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': files}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
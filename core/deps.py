@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Dependency Store
+
+Resolves each template's npm dependencies once into a lockfile template,
+keeps the resolved packages in a content-addressed store under
+projects/.deps/, and installs generated projects from that store:
+hardlinked, except for packages the install writes to, which get their
+own copies. Only `vibe_coder.py deps` and the cache
+warm-up resolve and download; generation just copies stored lockfiles.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from core.templates import FileCloner
+
+
+DEFAULT_REGISTRY = 'https://registry.npmjs.org/'
+
+# failures.json is shared by every process using the store
+_FAILURES_LOCK = threading.Lock()
+
+
+class DependencyError(Exception):
+    """Resolution or installation could not be completed."""
+
+
+@dataclass
+class InstallResult:
+    """Outcome of an offline install into a project."""
+    packages: int = 0
+    fetched: int = 0
+    rebuilt: List[str] = field(default_factory=list)
+    clone_method: str = ''
+
+
+class DependencyStore:
+    """Lockfile templates plus a content-addressed store of npm packages."""
+
+    def __init__(self, store_dir: str, registry: str = None, npm: str = 'npm',
+                 method: str = 'auto', timeout: float = 300, retry_seconds: float = 86400,
+                 fetch_workers: int = 8):
+        self.store_dir = store_dir
+        self.registry = os.environ.get('VIBE_NPM_REGISTRY') or registry or DEFAULT_REGISTRY
+        self.npm = npm
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.fetch_workers = max(1, fetch_workers)
+        self.cloner = FileCloner(method)
+        # Packages an install writes to are never hardlinked to the store
+        self.copier = FileCloner(method, editable=True)
+        self.locks_dir = os.path.join(store_dir, 'locks')
+        self.packages_dir = os.path.join(store_dir, 'packages')
+        # npm's own cache, used only while resolving
+        self.npm_cache = os.path.join(store_dir, 'npm-cache')
+        # Failed resolutions, so later warm-ups don't retry them every cycle
+        self.failures_file = os.path.join(store_dir, 'failures.json')
+        os.makedirs(self.locks_dir, exist_ok=True)
+        os.makedirs(self.packages_dir, exist_ok=True)
+
+    def lock_key(self, template: str, version: str, package_json: dict) -> str:
+        """Lockfile identity: template version, dependency specs and registry."""
+        spec = {
+            'dependencies': package_json.get('dependencies', {}),
+            'devDependencies': package_json.get('devDependencies', {}),
+            'registry': self.registry,
+        }
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{template}-{version}-{digest[:16]}"
+
+    def stored_lockfile(self, template: str, version: str, package_json: dict) -> Optional[dict]:
+        """The resolved lockfile template for package_json, or None; never resolves."""
+        lock_path = os.path.join(self.locks_dir, f"{self.lock_key(template, version, package_json)}.json")
+        try:
+            with open(lock_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def lockfile_for(self, template: str, version: str, package_json: dict, force: bool = False) -> dict:
+        """Lockfile template for package_json, resolving and prefetching it on first use.
+
+        A resolution that failed within retry_seconds (in any process) raises
+        again without running npm, unless force.
+        """
+        lock = self.stored_lockfile(template, version, package_json)
+        if lock is not None:
+            return lock
+        key = self.lock_key(template, version, package_json)
+        failure = self._failures().get(key)
+        if failure and not force and time.time() - failure['failed_at'] < self.retry_seconds:
+            raise DependencyError(f"{failure['error']} (not retried until deps.retry_hours pass)")
+
+        print(f"📦 Resolving dependencies for {template} template v{version}...")
+        try:
+            lock = self._resolve(package_json)
+            self.prefetch(lock)
+        except (DependencyError, OSError) as e:
+            self._record_failure(key, str(e))
+            raise DependencyError(str(e))
+        self._record_failure(key, None)
+
+        lock_path = os.path.join(self.locks_dir, f"{key}.json")
+        tmp_path = lock_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(lock, f, indent=2)
+        os.replace(tmp_path, lock_path)
+        return lock
+
+    def write_lockfile(self, project_dir: str, lock: dict, name: str, version: str = '1.0.0') -> str:
+        """Write package-lock.json for a project from a lockfile template."""
+        lock = json.loads(json.dumps(lock))
+        lock['name'] = name
+        lock['version'] = version
+        root = lock.get('packages', {}).get('')
+        if root is not None:
+            root['name'] = name
+            root['version'] = version
+
+        path = os.path.join(project_dir, 'package-lock.json')
+        with open(path, 'w') as f:
+            json.dump(lock, f, indent=2)
+            f.write('\n')
+        return path
+
+    def prefetch(self, lock: dict) -> int:
+        """Make sure every locked package is in the store; returns packages fetched.
+
+        Tarballs are downloaded fetch_workers at a time.
+        """
+        entries = list({self.package_dir(e): e for e in _locked_packages(lock).values()}.values())
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            return sum(pool.map(self._ensure_package, entries))
+
+    def install(self, project_dir: str) -> InstallResult:
+        """Install node_modules from package-lock.json out of the store.
+
+        Packages already in the store are hardlinked (or reflinked) in; any
+        that are missing are downloaded into the store first, so a project
+        whose lockfile was prefetched installs without the network. Packages
+        with install scripts or bins are copied instead, since the install
+        writes to them. The first are rebuilt with `npm rebuild --offline`,
+        but their scripts can still fetch prebuilt binaries or compile, so
+        those rebuilds may need the network after all.
+        """
+        lock_path = os.path.join(project_dir, 'package-lock.json')
+        if not os.path.exists(lock_path):
+            raise DependencyError(f"no package-lock.json in {project_dir}")
+        with open(lock_path, 'r') as f:
+            lock = json.load(f)
+
+        result = InstallResult()
+        needs_rebuild = []
+        for location, entry in sorted(_locked_packages(lock).items()):
+            if self._ensure_package(entry):
+                result.fetched += 1
+            store_dir = self.package_dir(entry)
+            bins = self._bins(location, store_dir)
+            private = bool(entry.get('hasInstallScript') or bins)
+            package_dir = self._link_tree(store_dir, os.path.join(project_dir, location), private)
+            self._link_bins(project_dir, package_dir, bins)
+            result.packages += 1
+            if entry.get('hasInstallScript'):
+                needs_rebuild.append(entry.get('name') or location.rsplit('node_modules/', 1)[-1])
+
+        if needs_rebuild:
+            rebuild = subprocess.run(
+                [self.npm, 'rebuild', '--offline', '--cache', self.npm_cache, '--no-audit', '--no-fund'] + needs_rebuild,
+                cwd=project_dir,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+            if rebuild.returncode != 0:
+                raise DependencyError(f"npm rebuild failed: {rebuild.stderr.strip()[-500:]}")
+            result.rebuilt = needs_rebuild
+
+        result.clone_method = self.cloner.active_method
+        return result
+
+    def package_dir(self, entry: dict) -> str:
+        """Store location of a package, keyed by its tarball hash."""
+        algorithm, digest = _integrity_hex(entry['integrity'])
+        return os.path.join(self.packages_dir, digest[:2], f"{algorithm}-{digest}")
+
+    def stats(self) -> dict:
+        packages = 0
+        for prefix in os.listdir(self.packages_dir):
+            prefix_dir = os.path.join(self.packages_dir, prefix)
+            if os.path.isdir(prefix_dir) and not prefix.startswith('.'):
+                packages += len(os.listdir(prefix_dir))
+        return {'lockfiles': len(os.listdir(self.locks_dir)), 'packages': packages,
+                'failed': len(self._failures())}
+
+    def _failures(self) -> Dict[str, dict]:
+        try:
+            with open(self.failures_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_failure(self, key: str, error: Optional[str]):
+        """Remember (or, with error None, forget) a failed resolution."""
+        with _FAILURES_LOCK:
+            failures = self._failures()
+            if error is None and key not in failures:
+                return
+            if error is None:
+                del failures[key]
+            else:
+                failures[key] = {'error': error, 'failed_at': time.time()}
+            tmp_file = f"{self.failures_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(failures, f, indent=2)
+            os.replace(tmp_file, self.failures_file)
+
+    def _resolve(self, package_json: dict) -> dict:
+        """Let npm resolve the tree without installing it."""
+        tmp_dir = tempfile.mkdtemp(prefix='.resolve-', dir=self.store_dir)
+        try:
+            with open(os.path.join(tmp_dir, 'package.json'), 'w') as f:
+                json.dump({
+                    'name': 'vibe-template',
+                    'version': '1.0.0',
+                    'dependencies': package_json.get('dependencies', {}),
+                    'devDependencies': package_json.get('devDependencies', {}),
+                }, f, indent=2)
+            try:
+                result = subprocess.run(
+                    [self.npm, 'install', '--package-lock-only', '--ignore-scripts', '--no-audit', '--no-fund',
+                     '--registry', self.registry, '--cache', self.npm_cache,
+                     '--fetch-retries', '1', '--fetch-timeout', '30000'],
+                    cwd=tmp_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                raise DependencyError(f"npm could not resolve dependencies: {e}")
+            if result.returncode != 0:
+                raise DependencyError(f"npm could not resolve dependencies: {result.stderr.strip()[-500:]}")
+            with open(os.path.join(tmp_dir, 'package-lock.json'), 'r') as f:
+                return json.load(f)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _ensure_package(self, entry: dict) -> bool:
+        """Fetch, verify and unpack one package into the store; False if present."""
+        target = self.package_dir(entry)
+        if os.path.isdir(target):
+            return False
+
+        with urllib.request.urlopen(entry['resolved'], timeout=self.timeout) as response:
+            data = response.read()
+        _verify_integrity(data, entry['integrity'], entry['resolved'])
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.unpack-', dir=self.packages_dir)
+        try:
+            _unpack_tarball(data, tmp_dir)
+            os.chmod(tmp_dir, 0o755)
+            try:
+                os.rename(tmp_dir, target)
+            except OSError:
+                # Another job unpacked the same package first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return True
+
+    def _link_tree(self, src_dir: str, dst_dir: str, private: bool = False) -> str:
+        """Clone every file of a stored package into dst_dir; private makes writable copies."""
+        for root, dirs, files in os.walk(src_dir):
+            rel = os.path.relpath(root, src_dir)
+            target_root = dst_dir if rel == '.' else os.path.join(dst_dir, rel)
+            os.makedirs(target_root, exist_ok=True)
+            for name in files:
+                target = os.path.join(target_root, name)
+                if os.path.lexists(target):
+                    os.unlink(target)
+                source = os.path.join(root, name)
+                if private:
+                    self.copier.clone(source, target)
+                    # Keeps executables executable
+                    os.chmod(target, stat.S_IMODE(os.stat(source).st_mode) | stat.S_IWUSR)
+                else:
+                    self.cloner.clone(source, target)
+        return dst_dir
+
+    def _bins(self, location: str, package_dir: str) -> Dict[str, str]:
+        """The bins a top-level package puts in node_modules/.bin."""
+        if location.count('node_modules/') != 1:
+            return {}
+        with open(os.path.join(package_dir, 'package.json'), 'r') as f:
+            manifest = json.load(f)
+        bins = manifest.get('bin') or {}
+        if isinstance(bins, str):
+            bins = {manifest['name'].split('/')[-1]: bins}
+        return bins
+
+    def _link_bins(self, project_dir: str, package_dir: str, bins: Dict[str, str]):
+        """Create node_modules/.bin entries for a package's bins."""
+        bin_dir = os.path.join(project_dir, 'node_modules', '.bin')
+        for name, rel_path in bins.items():
+            os.makedirs(bin_dir, exist_ok=True)
+            link = os.path.join(bin_dir, name)
+            if os.path.lexists(link):
+                os.unlink(link)
+            target = os.path.join(package_dir, rel_path)
+            if os.path.exists(target):
+                # The project's own copy, so the store is untouched
+                os.chmod(target, os.stat(target).st_mode | 0o555)
+            os.symlink(os.path.relpath(target, bin_dir), link)
+
+
+def _locked_packages(lock: dict) -> Dict[str, dict]:
+    """node_modules/... entries of a v2/v3 lockfile that come from a registry."""
+    return {
+        location: entry
+        for location, entry in lock.get('packages', {}).items()
+        if location.startswith('node_modules/') and entry.get('resolved') and entry.get('integrity')
+        and not entry.get('link')
+    }
+
+
+def _integrity_hex(integrity: str) -> Tuple[str, str]:
+    """Algorithm and hex digest of the strongest hash in an SRI string."""
+    algorithm, _, encoded = _strongest(integrity)
+    return algorithm, base64.b64decode(encoded).hex()
+
+
+def _strongest(integrity: str):
+    order = ['sha1', 'sha256', 'sha384', 'sha512']
+    parts = [p.partition('-') for p in integrity.split() if p.partition('-')[0] in order]
+    if not parts:
+        raise DependencyError(f"unsupported integrity: {integrity}")
+    return max(parts, key=lambda p: order.index(p[0]))
+
+
+def _verify_integrity(data: bytes, integrity: str, source: str):
+    algorithm, _, encoded = _strongest(integrity)
+    if base64.b64encode(hashlib.new(algorithm, data).digest()).decode('ascii') != encoded:
+        raise DependencyError(f"integrity mismatch for {source}")
+
+
+def _unpack_tarball(data: bytes, target: str):
+    """Unpack an npm tarball, dropping its top-level directory (usually package/)."""
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as tar:
+        for member in tar.getmembers():
+            parts = member.name.replace('\\', '/').split('/', 1)
+            if len(parts) < 2 or not parts[1] or member.issym() or member.islnk():
+                continue
+            rel = os.path.normpath(parts[1])
+            if rel.startswith('..') or os.path.isabs(rel):
+                continue
+            path = os.path.join(target, rel)
+            if member.isdir():
+                os.makedirs(path, exist_ok=True)
+            elif member.isfile():
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with tar.extractfile(member) as src, open(path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                # Shared by hardlink across projects, so read-only; packages
+                # that get written to are copied out
+                mode = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+                if member.mode & 0o111:
+                    mode |= stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+                os.chmod(path, mode)
+    for root, dirs, _ in os.walk(target):
+        for name in dirs:
+            os.chmod(os.path.join(root, name), 0o755)
+
+
+def get_store(projects_dir: str, config: dict = None) -> DependencyStore:
+    """Dependency store kept inside projects/ so hardlinks stay on one filesystem."""
+    deps_config = (config or {}).get('deps', {})
+    return DependencyStore(
+        os.path.join(projects_dir, '.deps'),
+        registry=deps_config.get('registry'),
+        npm=deps_config.get('npm_path', 'npm'),
+        method=(config or {}).get('generator', {}).get('template_link', 'auto'),
+        timeout=deps_config.get('timeout_seconds', 300),
+        retry_seconds=deps_config.get('retry_hours', 24) * 3600,
+        fetch_workers=deps_config.get('fetch_workers', 8)
+    )
@@ -5,14 +5,24 @@ Vibe Coder - Duplicate Checker
 Checks if a similar project already exists in GitHub repos or local projects.
 """
 
+import asyncio
+import hashlib
 import json
 import os
-import subprocess
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from difflib import SequenceMatcher
 from typing import List, Optional, Tuple
 
+from core.aio import run_command
+from core.archive import ProjectArchive
+from core.idea_queue import GENERATING, IdeaQueue
+from core.prefetch import PrefetchCache
+
+# duplicates.json is rewritten from worker threads
+_STATE_LOCK = threading.Lock()
+
 
 @dataclass
 class DuplicateCheck:
@@ -22,105 +32,202 @@ class DuplicateCheck:
     similarity_score: float
     matching_projects: List[dict]
     checked_at: str
+    # Only a duplicate of ideas other workers are still generating; if
+    # those fail, the idea is worth building after all
+    pending: bool = False
 
 
 class DuplicateChecker:
     """Checks for duplicate projects."""
     
-    def __init__(self, github_user: str = "vkumar-dev", config_path: str = "config.yaml"):
+    def __init__(self, github_user: str = "vkumar-dev", config_path: str = "config.yaml",
+                 cache: Optional[PrefetchCache] = None, registry: Optional[IdeaQueue] = None,
+                 projects_dir: str = None, state_dir: str = None, gh_env: Optional[dict] = None,
+                 similarity_threshold: float = 0.7):
         self.github_user = github_user
         self.config_path = config_path
-        self.local_projects_dir = os.path.join(os.path.dirname(__file__), '..', 'projects')
-        self.state_file = os.path.join(os.path.dirname(__file__), '..', 'state', 'duplicates.json')
+        # Above this similarity an idea counts as a duplicate (and above the
+        # match threshold, a project is reported as a potential one)
+        self.similarity_threshold = similarity_threshold
+        self.match_threshold = min(0.5, similarity_threshold)
+        # A profile's own projects and check history
+        self.local_projects_dir = projects_dir or os.path.join(os.path.dirname(__file__), '..', 'projects')
+        state_dir = state_dir or os.path.join(os.path.dirname(__file__), '..', 'state')
+        self.state_file = os.path.join(state_dir, 'duplicates.json')
+        # `gh` runs as the profile's account when it has its own token
+        self.gh_env = gh_env
+        # Repo catalog and local index, shared with the idle-time warm-up
+        self.cache = cache
+        # Ideas other workers are generating (shared idea queue), not yet on GitHub
+        self.registry = registry
         
-    def check_github_repos(self, idea_title: str, idea_description: str) -> Tuple[bool, List[dict], float]:
+    async def fetch_repo_catalog(self, refresh: bool = False) -> Optional[List[dict]]:
+        """The user's repos (name, description), from the prefetch cache when fresh."""
+        key = f"repo_catalog:{self.github_user}"
+        if self.cache is not None and not refresh:
+            repos = self.cache.get(key)
+            if repos is not None:
+                return repos
+        
+        result = await run_command(
+            ["gh", "repo", "list", self.github_user, "--limit", "100", "--json", "name,description"],
+            env=self.gh_env,
+            timeout=30
+        )
+        if result.returncode != 0:
+            return None
+        repos = json.loads(result.stdout)
+        if self.cache is not None:
+            self.cache.put(key, repos)
+        return repos
+    
+    def local_index(self, refresh: bool = False) -> List[dict]:
+        """Live and archived projects (name, path, archived, README head).
+        
+        Reading every README is the slow part, so the index is cached until
+        the projects directory changes.
+        """
+        if not os.path.exists(self.local_projects_dir):
+            return []
+        
+        key = f"local_index:{os.path.abspath(self.local_projects_dir)}"
+        signature = self._local_signature()
+        if self.cache is not None and not refresh:
+            index = self.cache.get(key, signature)
+            if index is not None:
+                return index
+        
+        # Live projects from disk, archived ones via the archive manifest
+        index = [
+            {'name': p.name, 'path': p.path, 'archived': p.archived, 'readme_head': p.readme_head}
+            for p in ProjectArchive(self.local_projects_dir).list_projects()
+        ]
+        if self.cache is not None:
+            self.cache.put(key, index, signature)
+        return index
+    
+    async def check_github_repos(self, idea_title: str, idea_description: str) -> Tuple[bool, List[dict], float]:
         """Check GitHub repos for similar projects."""
         print(f"🔍 Checking GitHub repos for duplicates...")
         
-        matching_repos = []
-        max_similarity = 0.0
-        
         try:
             # Get all user repos
-            result = subprocess.run(
-                ["gh", "repo", "list", self.github_user, "--limit", "100", "--json", "name,description"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                repos = json.loads(result.stdout)
-                
-                for repo in repos:
-                    # Check name similarity
-                    name_similarity = self._calculate_similarity(idea_title, repo['name'])
-                    
-                    # Check description similarity
-                    desc_similarity = 0.0
-                    if repo.get('description'):
-                        desc_similarity = self._calculate_similarity(idea_description, repo['description'])
-                    
-                    # Take max of name and description similarity
-                    similarity = max(name_similarity, desc_similarity)
-                    
-                    if similarity > 0.5:  # Threshold for potential duplicate
-                        matching_repos.append({
-                            'source': 'github',
-                            'name': repo['name'],
-                            'description': repo.get('description', ''),
-                            'similarity': similarity
-                        })
-                        max_similarity = max(max_similarity, similarity)
+            repos = await self.fetch_repo_catalog()
         except Exception as e:
             print(f"⚠️  GitHub check error: {e}")
+            repos = None
         
-        is_duplicate = max_similarity > 0.7
-        return is_duplicate, matching_repos, max_similarity
+        return self._match_repos(repos or [], idea_title, idea_description)
     
     def check_local_projects(self, idea_title: str, idea_description: str) -> Tuple[bool, List[dict], float]:
         """Check local projects directory for similar projects."""
         print(f"🔍 Checking local projects for duplicates...")
+        return self._match_local(self.local_index(), idea_title, idea_description)
+    
+    def check_in_flight(self, idea_id: str, idea_title: str) -> Tuple[bool, List[dict], float]:
+        """Check ideas other workers sharing the idea queue are building or built.
+
+        Only titles are compared: research writes descriptions from a few
+        templates, so those match across unrelated ideas.
+        """
+        if self.registry is None:
+            return False, [], 0.0
+        print(f"🔍 Checking ideas in flight for duplicates...")
+        try:
+            in_flight = self.registry.in_flight(idea_id)
+        except Exception as e:
+            print(f"⚠️  In-flight check error: {e}")
+            return False, [], 0.0
         
-        matching_projects = []
+        matching_ideas = []
         max_similarity = 0.0
+        for other in in_flight:
+            similarity = self._title_similarity(idea_title, other['title'])
+            if similarity > self.match_threshold:
+                matching_ideas.append({
+                    'source': 'in_flight',
+                    'name': other['app_name'] or other['title'],
+                    'status': other['status'],
+                    'worker': other['owner'],
+                    'similarity': similarity
+                })
+                max_similarity = max(max_similarity, similarity)
         
-        if not os.path.exists(self.local_projects_dir):
-            return False, [], 0.0
+        return max_similarity > self.similarity_threshold, matching_ideas, max_similarity
+    
+    def screen(self, idea_title: str, idea_description: str) -> Tuple[bool, float]:
+        """Quick check against cached data only (no network); for ranking the backlog."""
+        repos = (self.cache.get(f"repo_catalog:{self.github_user}") if self.cache is not None else None) or []
+        gh_duplicate, _, gh_score = self._match_repos(repos, idea_title, idea_description)
+        local_duplicate, _, local_score = self._match_local(self.local_index(), idea_title, idea_description)
+        return gh_duplicate or local_duplicate, max(gh_score, local_score)
+    
+    def _match_repos(self, repos: List[dict], idea_title: str, idea_description: str) -> Tuple[bool, List[dict], float]:
+        matching_repos = []
+        max_similarity = 0.0
+        
+        for repo in repos:
+            # Check name similarity
+            name_similarity = self._calculate_similarity(idea_title, repo['name'])
+            
+            # Check description similarity
+            desc_similarity = 0.0
+            if repo.get('description'):
+                desc_similarity = self._calculate_similarity(idea_description, repo['description'])
+            
+            # Take max of name and description similarity
+            similarity = max(name_similarity, desc_similarity)
+            
+            if similarity > self.match_threshold:  # Threshold for potential duplicate
+                matching_repos.append({
+                    'source': 'github',
+                    'name': repo['name'],
+                    'description': repo.get('description', ''),
+                    'similarity': similarity
+                })
+                max_similarity = max(max_similarity, similarity)
+        
+        is_duplicate = max_similarity > self.similarity_threshold
+        return is_duplicate, matching_repos, max_similarity
+    
+    def _match_local(self, index: List[dict], idea_title: str, idea_description: str) -> Tuple[bool, List[dict], float]:
+        matching_projects = []
+        max_similarity = 0.0
         
-        # Scan project directories
-        for project_name in os.listdir(self.local_projects_dir):
-            project_path = os.path.join(self.local_projects_dir, project_name)
+        for project in index:
+            # Check project name similarity
+            name_similarity = self._calculate_similarity(idea_title, project['name'])
             
-            if os.path.isdir(project_path):
-                # Check project name similarity
-                name_similarity = self._calculate_similarity(idea_title, project_name)
-                
-                # Try to read README for description match
-                desc_similarity = 0.0
-                readme_path = os.path.join(project_path, 'README.md')
-                if os.path.exists(readme_path):
-                    try:
-                        with open(readme_path, 'r') as f:
-                            readme_content = f.read(500)  # First 500 chars
-                            desc_similarity = self._calculate_similarity(idea_description, readme_content)
-                    except Exception:
-                        pass
-                
-                similarity = max(name_similarity, desc_similarity)
-                
-                if similarity > 0.5:
-                    matching_projects.append({
-                        'source': 'local',
-                        'name': project_name,
-                        'path': project_path,
-                        'similarity': similarity
-                    })
-                    max_similarity = max(max_similarity, similarity)
-        
-        is_duplicate = max_similarity > 0.7
+            # README head for description match
+            desc_similarity = 0.0
+            if project['readme_head']:
+                desc_similarity = self._calculate_similarity(idea_description, project['readme_head'])
+            
+            similarity = max(name_similarity, desc_similarity)
+            
+            if similarity > self.match_threshold:
+                matching_projects.append({
+                    'source': 'local',
+                    'name': project['name'],
+                    'path': project['path'],
+                    'archived': project['archived'],
+                    'similarity': similarity
+                })
+                max_similarity = max(max_similarity, similarity)
+        
+        is_duplicate = max_similarity > self.similarity_threshold
         return is_duplicate, matching_projects, max_similarity
     
+    def _local_signature(self) -> str:
+        """Changes whenever a project is added, removed, archived or has files renamed into it."""
+        projects = sorted(
+            (e.name, e.stat().st_mtime_ns) for e in os.scandir(self.local_projects_dir)
+            if not e.name.startswith('.') and e.is_dir()
+        )
+        manifest_file = ProjectArchive(self.local_projects_dir).manifest_file
+        manifest_mtime = os.stat(manifest_file).st_mtime_ns if os.path.exists(manifest_file) else 0
+        return hashlib.sha1(json.dumps([projects, manifest_mtime]).encode('utf-8')).hexdigest()
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two strings."""
         if not text1 or not text2:
@@ -133,31 +240,49 @@ class DuplicateChecker:
         # Use SequenceMatcher for similarity
         return SequenceMatcher(None, text1_lower, text2_lower).ratio()
     
-    def check_duplicate(self, idea_id: str, idea_title: str, idea_description: str) -> DuplicateCheck:
+    def _title_similarity(self, title1: str, title2: str) -> float:
+        """Similarity of two idea titles, leaving out a label they share (like "AI-Powered: Show HN:")."""
+        words1, words2 = title1.split(), title2.split()
+        label = 0
+        for i, (word1, word2) in enumerate(zip(words1, words2)):
+            if word1.lower() != word2.lower():
+                break
+            if word1.endswith(':'):
+                label = i + 1
+        return self._calculate_similarity(' '.join(words1[label:]), ' '.join(words2[label:]))
+    
+    async def check_duplicate(self, idea_id: str, idea_title: str, idea_description: str) -> DuplicateCheck:
         """Run full duplicate check."""
         print(f"\n🔍 Checking duplicates for: {idea_title[:50]}...")
         
-        # Check GitHub
-        gh_duplicate, gh_matches, gh_score = self.check_github_repos(idea_title, idea_description)
-        
-        # Check local
-        local_duplicate, local_matches, local_score = self.check_local_projects(idea_title, idea_description)
+        # Check GitHub, local projects and other workers' ideas (file and
+        # database reads, so in worker threads) together
+        (gh_duplicate, gh_matches, gh_score), (local_duplicate, local_matches, local_score), \
+            (flight_duplicate, flight_matches, flight_score) = await asyncio.gather(
+                self.check_github_repos(idea_title, idea_description),
+                asyncio.to_thread(self.check_local_projects, idea_title, idea_description),
+                asyncio.to_thread(self.check_in_flight, idea_id, idea_title)
+            )
         
         # Combine results
-        is_duplicate = gh_duplicate or local_duplicate
-        max_score = max(gh_score, local_score)
-        all_matches = gh_matches + local_matches
+        is_duplicate = gh_duplicate or local_duplicate or flight_duplicate
+        max_score = max(gh_score, local_score, flight_score)
+        all_matches = gh_matches + local_matches + flight_matches
+        pending = flight_duplicate and not (gh_duplicate or local_duplicate) and all(
+            m['status'] == GENERATING for m in flight_matches if m['similarity'] > self.similarity_threshold
+        )
         
         check = DuplicateCheck(
             idea_id=idea_id,
             is_duplicate=is_duplicate,
             similarity_score=max_score,
             matching_projects=all_matches,
-            checked_at=datetime.utcnow().isoformat()
+            checked_at=datetime.utcnow().isoformat(),
+            pending=pending
         )
         
         # Save to state
-        self._save_check(check)
+        await asyncio.to_thread(self._save_check, check)
         
         if is_duplicate:
             print(f"⚠️  DUPLICATE DETECTED (similarity: {max_score:.2f})")
@@ -170,30 +295,30 @@ class DuplicateChecker:
     
     def _save_check(self, check: DuplicateCheck):
         """Save check result to state file."""
-        state_dir = os.path.join(os.path.dirname(__file__), '..', 'state')
-        os.makedirs(state_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
         
-        # Load existing checks
-        checks = []
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r') as f:
-                    checks = json.load(f)
-            except Exception:
-                checks = []
-        
-        # Add new check
-        checks.append({
-            'idea_id': check.idea_id,
-            'is_duplicate': check.is_duplicate,
-            'similarity_score': check.similarity_score,
-            'matching_projects': check.matching_projects,
-            'checked_at': check.checked_at
-        })
-        
-        # Save (keep last 1000 checks)
-        with open(self.state_file, 'w') as f:
-            json.dump(checks[-1000:], f, indent=2)
+        with _STATE_LOCK:
+            # Load existing checks
+            checks = []
+            if os.path.exists(self.state_file):
+                try:
+                    with open(self.state_file, 'r') as f:
+                        checks = json.load(f)
+                except Exception:
+                    checks = []
+            
+            # Add new check
+            checks.append({
+                'idea_id': check.idea_id,
+                'is_duplicate': check.is_duplicate,
+                'similarity_score': check.similarity_score,
+                'matching_projects': check.matching_projects,
+                'checked_at': check.checked_at
+            })
+            
+            # Save (keep last 1000 checks)
+            with open(self.state_file, 'w') as f:
+                json.dump(checks[-1000:], f, indent=2)
     
     def get_previous_checks(self) -> List[dict]:
         """Get all previous duplicate checks."""
@@ -207,10 +332,10 @@ if __name__ == "__main__":
     checker = DuplicateChecker()
     
     # Test with a sample idea
-    check = checker.check_duplicate(
+    check = asyncio.run(checker.check_duplicate(
         idea_id="test-001",
         idea_title="AI-powered code review tool",
         idea_description="Automated code review using AI to find bugs and suggest improvements"
-    )
+    ))
     
     print(f"\nResult: Duplicate={check.is_duplicate}, Score={check.similarity_score}")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Pipeline Events
+
+A typed, in-process publish/subscribe bus for what the pipeline is doing
+(trends found, ideas ranked, duplicate checks, generation progress,
+publishes, finished cycles). Every subscriber gets its own bounded queue:
+a slow one loses its oldest events, and publishing never blocks the
+pipeline. With events.socket set, a running daemon also streams events
+as JSON lines to local clients (the GUI, `vibe_coder.py events`).
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+TREND_FOUND = 'trend_found'
+IDEA_RANKED = 'idea_ranked'
+DUPLICATE_CHECKED = 'duplicate_checked'
+GENERATION_PROGRESS = 'generation_progress'
+APP_PUBLISHED = 'app_published'
+CYCLE_DONE = 'cycle_done'
+
+EVENT_TYPES = (TREND_FOUND, IDEA_RANKED, DUPLICATE_CHECKED, GENERATION_PROGRESS, APP_PUBLISHED, CYCLE_DONE)
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+# The TCP fallback is for local clients only, never other hosts
+EVENT_HOST = '127.0.0.1'
+
+# One bus per process, shared by every cycle, worker and profile in it
+_bus: Optional['EventBus'] = None
+_BUS_LOCK = threading.Lock()
+
+
+@dataclass
+class Event:
+    """Something the pipeline did; seq numbers the process's events, so gaps show drops."""
+    type: str
+    data: Dict = field(default_factory=dict)
+    at: float = field(default_factory=time.time)
+    seq: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> 'Event':
+        return cls(**json.loads(line))
+
+
+class Subscription:
+    """One subscriber's bounded queue of events, read from a thread or a coroutine."""
+
+    def __init__(self, bus: 'EventBus', types: Optional[Iterable[str]] = None, maxsize: int = 1000):
+        self.bus = bus
+        self.types = frozenset(types) if types else None
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self._events = deque()
+        self._cond = threading.Condition()
+        self._waiter = None
+
+    def get(self, timeout: float = None) -> Optional[Event]:
+        """The next event, waiting up to timeout; None on timeout or once closed."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._events or self.closed, timeout):
+                return None
+            return self._events.popleft() if self._events else None
+
+    async def next(self) -> Optional[Event]:
+        """The next event; None once closed."""
+        while True:
+            with self._cond:
+                if self._events:
+                    return self._events.popleft()
+                if self.closed:
+                    return None
+                wakeup = asyncio.Event()
+                self._waiter = (asyncio.get_running_loop(), wakeup)
+            await wakeup.wait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self.next()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        self.bus.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._wake()
+
+    def _offer(self, event: Event):
+        if self.types is not None and event.type not in self.types:
+            return
+        with self._cond:
+            if self.closed:
+                return
+            if len(self._events) >= self.maxsize:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+            self._wake()
+
+    def _wake(self):
+        self._cond.notify_all()
+        if self._waiter is not None:
+            loop, wakeup = self._waiter
+            self._waiter = None
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # Its loop has closed
+                pass
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Delivers each published event to every matching subscription."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._seq = itertools.count(1)
+
+    def subscribe(self, types: Optional[Iterable[str]] = None, maxsize: int = None) -> Subscription:
+        """A new subscription to types (all events by default)."""
+        subscription = Subscription(self, types, maxsize or self.maxsize)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, event_type: str, **data) -> Event:
+        """Publish an event (from any thread); never blocks."""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type!r}")
+        with self._lock:
+            event = Event(event_type, data, seq=next(self._seq))
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._offer(event)
+        return event
+
+
+class EventServer:
+    """Streams the bus's events as JSON lines to clients of a local socket."""
+
+    def __init__(self, bus: 'EventBus', path: str = None, port: int = 0, maxsize: int = 1000):
+        self.bus = bus
+        self.path = path
+        self.port = port
+        self.maxsize = maxsize
+        self._server = None
+        # One per connected client
+        self._subscriptions = set()
+
+    @classmethod
+    def from_config(cls, bus: 'EventBus', config: dict) -> Optional['EventServer']:
+        """The configured server, or None when events.socket and events.port are off."""
+        path, port = event_address(config)
+        if path is None and not port:
+            return None
+        return cls(bus, path, port, (config or {}).get('events', {}).get('queue_size', 1000))
+
+    async def start(self):
+        if self.path is not None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path):
+                if _listening(self.path):
+                    raise OSError(f"another process is streaming events on {self.path}")
+                # Left behind by a process that was killed
+                os.unlink(self.path)
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+            print(f"📡 Streaming events on {self.path}")
+        else:
+            self._server = await asyncio.start_server(self._serve, host=EVENT_HOST, port=self.port)
+            print(f"📡 Streaming events on {EVENT_HOST}:{self.port}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        # Ends every client's stream, so their connections close too
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        await self._server.wait_closed()
+        self._server = None
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        with self.bus.subscribe(maxsize=self.maxsize) as subscription:
+            self._subscriptions.add(subscription)
+            # Clients only listen; reading tells us when one goes away
+            closed = asyncio.ensure_future(reader.read())
+            try:
+                while not closed.done():
+                    event = asyncio.ensure_future(subscription.next())
+                    await asyncio.wait({event, closed}, return_when=asyncio.FIRST_COMPLETED)
+                    if not event.done():
+                        event.cancel()
+                        break
+                    if event.result() is None:
+                        break
+                    writer.write((event.result().to_json() + '\n').encode('utf-8'))
+                    await writer.drain()
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                self._subscriptions.discard(subscription)
+                closed.cancel()
+                writer.close()
+
+
+def get_bus() -> EventBus:
+    """Process-wide event bus."""
+    global _bus
+    with _BUS_LOCK:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
+
+
+def emit(event_type: str, **data) -> Event:
+    """Publish an event on the process's bus."""
+    return get_bus().publish(event_type, **data)
+
+
+def _listening(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def event_address(config: dict):
+    """(socket path, port) from events.*; the port (off by default) is used where Unix sockets aren't available."""
+    events_config = (config or {}).get('events', {})
+    path = events_config.get('socket')
+    if path and hasattr(socket, 'AF_UNIX') and hasattr(asyncio, 'start_unix_server'):
+        return os.path.normpath(os.path.join(ROOT_DIR, path)), 0
+    return None, events_config.get('port') or 0
+
+
+def stream_events(config: dict, types: Optional[Iterable[str]] = None,
+                  timeout: float = 5) -> Iterator[Event]:
+    """Events from a running daemon's socket, until it closes (for threads and scripts).
+
+    Raises OSError when nothing is serving events.
+    """
+    path, port = event_address(config)
+    if path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = path
+    elif port:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = (EVENT_HOST, port)
+    else:
+        raise OSError("events.socket and events.port are both off")
+    types = frozenset(types) if types else None
+    with sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.settimeout(None)
+        with sock.makefile('r', encoding='utf-8') as lines:
+            for line in lines:
+                event = Event.from_json(line)
+                if types is None or event.type in types:
+                    yield event
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Generation Cache
+
+Content-addressed cache of AI-generated file trees, keyed by the hash of
+the generation prompt and the AI tool version.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from typing import List, Optional
+
+from core.templates import FileCloner
+
+
+class GenerationCache:
+    """Stores generated trees under the hash of (tool, version, prompt)."""
+
+    def __init__(self, cache_dir: str, max_mb: float = 2048, method: str = 'auto'):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # Restored trees are edited in place, so never share inodes with the cache
+        self.cloner = FileCloner(method, editable=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(prompt: str, tool: str, tool_version: str) -> str:
+        """Cache key for one generation request."""
+        digest = hashlib.sha256()
+        for part in (tool, tool_version, prompt):
+            digest.update(part.encode('utf-8') + b'\0')
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Files of a cached tree, or None on a miss."""
+        meta = self._read_meta(key)
+        if meta is None:
+            return None
+        return meta['files']
+
+    def materialize(self, key: str, output_dir: str) -> Optional[List[str]]:
+        """Place a cached tree into output_dir; returns its files or None."""
+        files = self.get(key)
+        if files is None:
+            return None
+
+        tree_dir = os.path.join(self.entry_path(key), 'tree')
+        for rel_path in files:
+            dst = os.path.join(output_dir, rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            self.cloner.clone(os.path.join(tree_dir, rel_path), dst)
+
+        # Entry mtime doubles as the LRU clock
+        os.utime(self.entry_path(key))
+        return files
+
+    def put(self, key: str, source_dir: str, files: List[str], info: dict = None):
+        """Store files from source_dir under key, then evict down to max size."""
+        entry = self.entry_path(key)
+        if os.path.isdir(entry):
+            return
+
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.put-', dir=self.cache_dir)
+        size = 0
+
+        try:
+            stored = []
+            for rel_path in files:
+                src = os.path.join(source_dir, rel_path)
+                if not os.path.isfile(src) or os.path.islink(src):
+                    continue
+                dst = os.path.join(tmp_dir, 'tree', rel_path)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copyfile(src, dst)
+                # Cloned into projects, never edited in place
+                os.chmod(dst, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                size += os.path.getsize(dst)
+                stored.append(rel_path)
+
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({
+                    'key': key,
+                    'files': stored,
+                    'size': size,
+                    'stored_at': time.time(),
+                    'info': info or {}
+                }, f, indent=2)
+            os.chmod(tmp_dir, 0o755)
+
+            try:
+                os.rename(tmp_dir, entry)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under max size; returns bytes freed."""
+        entries = []
+        total = 0
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if prefix.startswith('.') or not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                meta = self._read_meta(key)
+                if meta is None:
+                    continue
+                entry = self.entry_path(key)
+                entries.append((os.path.getmtime(entry), meta['size'], entry))
+                total += meta['size']
+
+        freed = 0
+        for _, size, entry in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            freed += size
+
+        if freed:
+            print(f"🧹 Evicted {freed / 1024 / 1024:.1f} MB from generation cache")
+        return freed
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        meta_path = os.path.join(self.entry_path(key), 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
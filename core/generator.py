@@ -5,14 +5,32 @@ Vibe Coder - App Generator Agent
 Uses Qwen CLI to autonomously build vibe apps.
 """
 
+import asyncio
 import json
 import os
 import subprocess
 import shutil
+import tempfile
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
+from core.aio import run_command
+from core.archive import ProjectArchive
+from core.deps import DependencyError, get_store as get_dependency_store
+from core.events import GENERATION_PROGRESS, emit
+from core.gen_cache import GenerationCache
+from core.journal import COMMITTED, DONE, FAILED, GENERATING, ROLLED_BACK, SYNCED, SYNCING, CycleJournal
+from core.git_writer import DEFAULT_AUTHOR, GitRepoWriter, GitWriteError
+from core.manifest import IncrementalHasher, ManifestBuilder, TreeDiff, read_manifest, sync_tree, write_manifest
+from core.planner import Deadline
+from core.profiles import Profile
+from core.publisher import PublishOutbox
+from core.templates import TEMPLATE_BUNDLES, get_store
+from core.tool_pool import get_pool, resolve_tool
+from core.tool_runner import ToolFailed, ToolStalled, run_session, run_streaming
+
 
 @dataclass
 class AppGenerationResult:
@@ -23,6 +41,9 @@ class AppGenerationResult:
     success: bool
     files_created: List[str] = field(default_factory=list)
     github_repo: Optional[str] = None
+    publish_job: Optional[str] = None
+    git_commit: Optional[str] = None
+    changes: Optional[dict] = None
     error: Optional[str] = None
     duration_seconds: float = 0.0
     generated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -31,21 +52,97 @@ class AppGenerationResult:
 class AppGenerator:
     """Generates apps using Qwen CLI."""
     
-    def __init__(self, config: dict = None):
+    def __init__(self, config: dict = None, profile: Optional[Profile] = None):
         self.config = config or {}
         self.projects_dir = os.path.join(os.path.dirname(__file__), '..', 'projects')
         self.logs_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
+        # Caches and stores shared by every profile
+        self.shared_dir = self.projects_dir
+        if profile is not None:
+            self.projects_dir = profile.projects_dir
+            self.logs_dir = profile.logs_dir
+            self.shared_dir = profile.shared_dir
         self.ai_tool = self.config.get('generator', {}).get('ai_tool', 'qwen-code')
         self.repo_prefix = self.config.get('generator', {}).get('repo_prefix', 'vibe-')
         self.auto_push = self.config.get('generator', {}).get('auto_push', True)
         
+        # Per-job caps on the AI tool subprocess
+        limits = self.config.get('generator', {}).get('limits', {})
+        self.cpu_seconds = limits.get('cpu_seconds')
+        self.memory_mb = limits.get('memory_mb')
+        self.wall_seconds = limits.get('wall_seconds', 600)
+        self.stall_seconds = limits.get('stall_seconds', 180)
+        self.max_log_bytes = int(limits.get('max_log_mb', 5) * 1024 * 1024)
+        
+        # generations.json is shared by concurrent jobs
+        self._log_lock = threading.Lock()
+        
         # Ensure directories exist
         os.makedirs(self.projects_dir, exist_ok=True)
         os.makedirs(self.logs_dir, exist_ok=True)
+        
+        # Shared template bundles for the no-AI-tool fallback
+        self.template_store = get_store(
+            self.shared_dir,
+            method=self.config.get('generator', {}).get('template_link', 'auto')
+        )
+        
+        # Lockfile templates and a shared package store for generated projects
+        self.deps_enabled = self.config.get('deps', {}).get('enabled', True)
+        self.dep_store = get_dependency_store(self.shared_dir, self.config)
+        
+        # Content-addressed cache of AI tool output
+        cache_config = self.config.get('generator', {}).get('cache', {})
+        self.use_cache = cache_config.get('enabled', True)
+        self.generation_cache = GenerationCache(
+            os.path.join(self.shared_dir, '.cache', 'generations'),
+            max_mb=cache_config.get('max_mb', 2048),
+            method=self.config.get('generator', {}).get('template_link', 'auto')
+        )
+        self._tool_version = None
+        
+        # Tool discovery happens once per process; warm sessions are shared
+        # by every job when the tool supports a session mode
+        self.tool_path = resolve_tool(self.ai_tool)
+        self.tool_pool = get_pool(self.config, wrap=self._session_command)
+        
+        # Archived projects are extracted back before being regenerated
+        self.archive = ProjectArchive(
+            self.projects_dir,
+            self.config,
+            published_file=profile.state_path('published.json') if profile is not None else None
+        )
+        
+        # Publishing happens off the critical path through a durable outbox
+        if profile is not None:
+            self.outbox = PublishOutbox(profile.state_path('outbox'), profile.state_path('published.json'))
+        else:
+            self.outbox = PublishOutbox()
+        self.visibility = self.config.get('github', {}).get('visibility', 'public')
+        self.topics = self.config.get('github', {}).get('topics', [])
+        
+        # In-process git writer; template blobs go to one shared object store
+        self.git_fast_path = self.config.get('generator', {}).get('git_fast_path', True)
+        self.git_author = self.config.get('generator', {}).get('git_author', DEFAULT_AUTHOR)
+        self.git_writer = GitRepoWriter(
+            os.path.join(self.shared_dir, '.git-objects'),
+            author=self.git_author
+        )
+        
+        # The cycle's checkpoint journal, when the cycle keeps one
+        self.journal: Optional[CycleJournal] = None
     
-    def generate_app(self, idea_title: str, idea_description: str, idea_features: List[str], 
-                     idea_id: str, is_ai_infused: bool = True, ai_capabilities: List[str] = None) -> AppGenerationResult:
-        """Generate a complete app using Qwen CLI."""
+    async def generate_app(self, idea_title: str, idea_description: str, idea_features: List[str], 
+                           idea_id: str, is_ai_infused: bool = True, ai_capabilities: List[str] = None,
+                           work_dir: str = None, deadline: Deadline = None) -> AppGenerationResult:
+        """Generate a complete app using Qwen CLI.
+
+        work_dir, when given, is the job's private working directory for the
+        AI tool (its cwd and TMPDIR). The AI tool runs on the event loop;
+        file and git work runs in worker threads. deadline (the cycle's)
+        shortens the AI tool's wall-clock limit. Each step is checkpointed
+        to the cycle journal so recover_projects can settle a killed run.
+        """
         print(f"\n🚀 Generating app: {idea_title[:50]}...")
         print(f"   Type: {'🤖 AI-Infused' if is_ai_infused else '📱 Viral App'}")
         if is_ai_infused and ai_capabilities:
@@ -56,24 +153,62 @@ class AppGenerator:
         # Create app name from title
         app_name = self._sanitize_name(idea_title)
         app_path = os.path.join(self.projects_dir, app_name)
+        emit(GENERATION_PROGRESS, app_name=app_name, stage='started', idea_id=idea_id, title=idea_title)
         
-        # Create project directory
+        # Create project directory (restoring it first if it was archived);
+        # a rollback only ever removes a directory this run created
+        await asyncio.to_thread(self.archive.ensure_extracted, app_name)
+        existed = await asyncio.to_thread(os.path.isdir, app_path)
         os.makedirs(app_path, exist_ok=True)
         
         try:
             # Build the prompt for Qwen CLI
             prompt = self._build_generation_prompt(idea_title, idea_description, idea_features, is_ai_infused, ai_capabilities)
             
-            # Run Qwen CLI to generate the app
-            files_created = self._run_qwen_code(prompt, app_path, is_ai_infused)
+            # Run Qwen CLI into a staging dir; files are hashed as they appear
+            staging_dir = await asyncio.to_thread(self._staging_dir, app_name, work_dir)
+            await self._checkpoint(
+                app_name,
+                stage=GENERATING,
+                idea_id=idea_id,
+                description=idea_description,
+                existed=existed,
+                work_dir=work_dir or os.path.dirname(staging_dir)
+            )
+            try:
+                staged = IncrementalHasher(staging_dir)
+                wall_seconds = deadline.clamp(self.wall_seconds) if deadline else self.wall_seconds
+                await self._run_qwen_code(prompt, staging_dir, is_ai_infused, work_dir, staged, wall_seconds)
+                
+                # Only files whose content changed are moved into the project
+                hasher = IncrementalHasher(app_path)
+                planned = await asyncio.to_thread(ManifestBuilder(staging_dir).build, staged)
+                if not planned:
+                    # Syncing nothing would delete the project's files
+                    raise Exception("generation produced no files")
+                # The paths the sync may write, so a rollback touches nothing else
+                await self._checkpoint(app_name, stage=SYNCING, paths=[entry.path for entry in planned])
+                diff = await asyncio.to_thread(self._sync_staged, staging_dir, app_path, app_name, planned, hasher)
+                await self._checkpoint(app_name, stage=SYNCED)
+            finally:
+                await asyncio.to_thread(
+                    shutil.rmtree, staging_dir if work_dir else os.path.dirname(staging_dir), ignore_errors=True
+                )
+            print(f"   Changes: {diff.summary()}")
             
-            # Initialize git repo
-            self._init_git_repo(app_path)
+            # Manifest of tracked files (honours .gitignore), stored beside the project
+            manifest = await asyncio.to_thread(self._write_project_manifest, app_path, app_name, hasher)
+            files_created = [entry.path for entry in manifest]
             
-            # Push to GitHub if enabled
-            github_repo = None
+            # Initialize git repo (or add a commit for what changed)
+            git_commit = await self._init_git_repo(app_path, manifest, diff)
+            await self._checkpoint(app_name, stage=COMMITTED, git_commit=git_commit)
+            
+            # Queue the GitHub push; the publish worker confirms the repo later
+            publish_job = None
             if self.auto_push:
-                github_repo = self._push_to_github(app_path, app_name)
+                publish_job = await asyncio.to_thread(self._queue_publish, app_path, app_name, idea_description)
+            await self._checkpoint(app_name, stage=DONE, publish_job=publish_job)
             
             duration = (datetime.utcnow() - start_time).total_seconds()
             
@@ -83,14 +218,16 @@ class AppGenerator:
                 app_path=app_path,
                 success=True,
                 files_created=files_created,
-                github_repo=github_repo,
+                publish_job=publish_job,
+                git_commit=git_commit,
+                changes=diff.to_dict(),
                 duration_seconds=duration
             )
             
             print(f"✅ App generated successfully in {duration:.1f}s")
             print(f"   Path: {app_path}")
-            if github_repo:
-                print(f"   Repo: {github_repo}")
+            if publish_job:
+                print(f"   Publish: queued ({publish_job})")
             
         except Exception as e:
             duration = (datetime.utcnow() - start_time).total_seconds()
@@ -105,12 +242,124 @@ class AppGenerator:
             )
             
             print(f"❌ App generation failed: {e}")
+            emit(GENERATION_PROGRESS, app_name=app_name, stage=FAILED, error=str(e), duration_seconds=duration)
         
         # Save generation log
-        self._save_generation_log(result)
+        await asyncio.to_thread(self._save_generation_log, result)
         
         return result
     
+    async def recover_projects(self) -> List[AppGenerationResult]:
+        """Settle projects the journal shows a generation stopped part-way through.
+
+        That is generations killed with the process, cancelled at the
+        deadline or failed. Projects whose files were all in place are
+        completed (manifest, commit, publish); the rest are rolled back to
+        their last commit, or removed if they never had one. Returns the
+        completed apps.
+        """
+        completed = []
+        if self.journal is None:
+            return completed
+        
+        for app_name, project in self.journal.unsettled_projects().items():
+            app_path = os.path.join(self.projects_dir, app_name)
+            if project.get('work_dir'):
+                await asyncio.to_thread(shutil.rmtree, project['work_dir'], ignore_errors=True)
+            
+            try:
+                if project.get('stage') in (SYNCED, COMMITTED):
+                    completed.append(await self._complete_project(app_name, app_path, project))
+                    print(f"♻️  Completed unfinished project {app_name}")
+                else:
+                    await self._roll_back_project(app_name, app_path, project)
+                    await self._checkpoint(app_name, stage=ROLLED_BACK)
+                    print(f"♻️  Rolled back unfinished project {app_name}")
+            except Exception as e:
+                await self._checkpoint(app_name, stage=FAILED, error=f"recovery failed: {e}")
+                print(f"⚠️  Could not recover {app_name}: {e}")
+        
+        return completed
+    
+    async def _complete_project(self, app_name: str, app_path: str, project: dict) -> AppGenerationResult:
+        """Finish the steps after a completed sync."""
+        manifest = await asyncio.to_thread(self._write_project_manifest, app_path, app_name, IncrementalHasher(app_path))
+        git_commit = project.get('git_commit')
+        if project['stage'] == SYNCED:
+            git_commit = await self._init_git_repo(app_path, manifest)
+            await self._checkpoint(app_name, stage=COMMITTED, git_commit=git_commit)
+        
+        publish_job = None
+        if self.auto_push:
+            publish_job = await asyncio.to_thread(self._queue_publish, app_path, app_name, project.get('description', ''))
+        await self._checkpoint(app_name, stage=DONE, publish_job=publish_job)
+        
+        return AppGenerationResult(
+            idea_id=project.get('idea_id', ''),
+            app_name=app_name,
+            app_path=app_path,
+            success=True,
+            files_created=[entry.path for entry in manifest],
+            publish_job=publish_job,
+            git_commit=git_commit
+        )
+    
+    async def _roll_back_project(self, app_name: str, app_path: str, project: dict):
+        """Undo what a cut-off sync wrote to a project.
+
+        A project directory this run created is removed. In one that was
+        already there, only the paths the sync could have written (its
+        planned files and the previous manifest's) are put back to their
+        last commit, and planned files that commit doesn't have are deleted;
+        nothing else in it is touched.
+        """
+        if not project.get('existed'):
+            await asyncio.to_thread(shutil.rmtree, app_path, ignore_errors=True)
+            manifest_path = self._manifest_path(app_name)
+            if os.path.exists(manifest_path):
+                os.unlink(manifest_path)
+            return
+        
+        if project.get('stage') != SYNCING:
+            return  # the AI tool never touched the project
+        head = await run_command(["git", "rev-parse", "--verify", "-q", "HEAD"], cwd=app_path)
+        if head.returncode != 0:
+            print(f"⚠️  {app_name} has no commit to roll back to, leaving its files as they are")
+            return
+        listed = await run_command(["git", "ls-tree", "-r", "-z", "--name-only", "HEAD"], cwd=app_path)
+        if listed.returncode != 0:
+            raise RuntimeError(f"git ls-tree failed: {listed.stderr.strip()}")
+        committed = set(filter(None, listed.stdout.split('\0')))
+        
+        # The previous manifest is only replaced after a sync, so it still matches HEAD
+        planned = set(project.get('paths', []))
+        touched = planned | {entry.path for entry in read_manifest(self._manifest_path(app_name))}
+        restore = sorted(touched & committed)
+        if restore:
+            result = await run_command(["git", "checkout", "-f", "HEAD", "--"] + restore, cwd=app_path)
+            if result.returncode != 0:
+                raise RuntimeError(f"git checkout failed: {result.stderr.strip()}")
+        for path in sorted(planned - committed):
+            full_path = os.path.join(app_path, path)
+            if os.path.isfile(full_path) or os.path.islink(full_path):
+                os.unlink(full_path)
+    
+    async def _checkpoint(self, app_name: str, **fields):
+        emit(GENERATION_PROGRESS, app_name=app_name, stage=fields['stage'])
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.record_project, app_name, **fields)
+    
+    def _sync_staged(self, staging_dir: str, app_path: str, app_name: str,
+                     planned: list, hasher: IncrementalHasher) -> TreeDiff:
+        """Move the staged files that changed into the project."""
+        return sync_tree(staging_dir, app_path, planned, read_manifest(self._manifest_path(app_name)), hasher)
+    
+    def _write_project_manifest(self, app_path: str, app_name: str, hasher: IncrementalHasher) -> list:
+        """Build and store the project's manifest."""
+        manifest = ManifestBuilder(app_path).build(hasher)
+        write_manifest(self._manifest_path(app_name), manifest)
+        return manifest
+    
     def _build_generation_prompt(self, title: str, description: str, features: List[str], 
                                    is_ai_infused: bool = True, ai_capabilities: List[str] = None) -> str:
         """Build the prompt for Qwen CLI."""
@@ -191,66 +440,171 @@ Focus on clean, maintainable code with proper error handling.
 """
         return prompt
     
-    def _run_qwen_code(self, prompt: str, output_dir: str, is_ai_infused: bool = False) -> List[str]:
+    async def _run_qwen_code(self, prompt: str, output_dir: str, is_ai_infused: bool = False,
+                             work_dir: str = None, hasher: IncrementalHasher = None,
+                             wall_seconds: float = None) -> List[str]:
         """Run Qwen CLI to generate code."""
+        hasher = hasher or IncrementalHasher(output_dir)
+        wall_seconds = self.wall_seconds if wall_seconds is None else wall_seconds
         print(f"🤖 Running Qwen CLI to generate code...")
         
         files_created = []
-        log_file = os.path.join(self.logs_dir, f"generation-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.log")
+        log_file = os.path.join(
+            self.logs_dir,
+            f"generation-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{os.path.basename(output_dir)}.log"
+        )
         
         try:
-            # Try using qwen-code CLI if available
-            # First check if it's installed
-            check_result = subprocess.run(
-                ["which", "qwen-code"],
-                capture_output=True,
-                text=True
-            )
-            
-            if check_result.returncode == 0:
-                # qwen-code is available
+            # Try using qwen-code CLI if available (resolved once at startup)
+            if self.tool_path:
+                # qwen-code is available; reuse an identical earlier generation
+                cache_key = GenerationCache.make_key(prompt, self.ai_tool, await self._get_tool_version())
+                if self.use_cache:
+                    cached = await asyncio.to_thread(self.generation_cache.materialize, cache_key, output_dir)
+                    if cached is not None:
+                        print(f"⚡ Generation cache hit ({cache_key[:12]}), reusing {len(cached)} files")
+                        with open(log_file, 'w') as log:
+                            log.write(f"Cache hit at {datetime.utcnow().isoformat()}\n")
+                            log.write(f"Key: {cache_key}\n")
+                            log.write(f"Files: {cached}\n")
+                        return cached
+                
                 with open(log_file, 'w') as log:
                     log.write(f"Generation started at {datetime.utcnow().isoformat()}\n")
                     log.write(f"Prompt: {prompt[:500]}...\n")
                     log.write(f"Type: {'AI-Infused' if is_ai_infused else 'Standard'}\n\n")
                     
-                    # Run qwen-code with the prompt
+                    # Run qwen-code with the prompt, streaming its output
                     # Note: Adjust command based on actual qwen-code CLI interface
-                    result = subprocess.run(
-                        ["qwen-code", "--prompt", prompt, "--output", output_dir],
-                        capture_output=True,
-                        text=True,
-                        timeout=600  # 10 minute timeout
-                    )
+                    log.write("Output:\n")
+                    log.flush()
+                    on_progress = lambda path, size: self._report_progress(path, size, hasher)
+                    async with self.tool_pool.session_async() as session:
+                        if session is not None:
+                            # The session protocol is blocking; it gets a worker thread
+                            log.write(f"[warm session pid {session.process.pid}, request {session.requests + 1}]\n")
+                            result = await asyncio.to_thread(
+                                run_session,
+                                session,
+                                {
+                                    'type': 'generate',
+                                    'prompt': prompt,
+                                    'output_dir': os.path.abspath(output_dir),
+                                    'cwd': os.path.abspath(work_dir) if work_dir else None,
+                                    'tmpdir': os.path.abspath(work_dir) if work_dir else None,
+                                },
+                                output_dir,
+                                log,
+                                wall_seconds=wall_seconds,
+                                stall_seconds=self.stall_seconds,
+                                max_log_bytes=self.max_log_bytes,
+                                on_progress=on_progress
+                            )
+                        else:
+                            result = await run_streaming(
+                                self._limited_command([self.tool_path, "--prompt", prompt, "--output", output_dir]),
+                                output_dir,
+                                log,
+                                cwd=work_dir,
+                                env=self._tool_env(work_dir),
+                                wall_seconds=wall_seconds,
+                                stall_seconds=self.stall_seconds,
+                                max_log_bytes=self.max_log_bytes,
+                                on_progress=on_progress
+                            )
                     
-                    log.write(f"Exit code: {result.returncode}\n")
-                    log.write(f"Stdout: {result.stdout}\n")
-                    log.write(f"Stderr: {result.stderr}\n")
+                    log.write(f"\nExit code: {result.returncode}\n")
+                    log.write(f"Duration: {result.duration_seconds:.1f}s\n")
+                
+                # Scan for created files, reusing hashes taken while streaming
+                manifest = await asyncio.to_thread(ManifestBuilder(output_dir).build, hasher)
+                files_created = [entry.path for entry in manifest]
                 
-                # Scan for created files
-                for root, dirs, files in os.walk(output_dir):
-                    for file in files:
-                        rel_path = os.path.relpath(os.path.join(root, file), output_dir)
-                        files_created.append(rel_path)
+                if result.returncode != 0:
+                    raise ToolFailed(f"Qwen CLI exited with code {result.returncode}")
+                if files_created:
+                    await asyncio.to_thread(self._cache_generation, cache_key, output_dir, files_created)
             else:
                 # qwen-code not available, create a template app
                 print("⚠️  qwen-code CLI not found, creating template app...")
-                files_created = self._create_template_app(output_dir, prompt, is_ai_infused)
+                files_created = await asyncio.to_thread(self._create_template_app, output_dir, prompt, is_ai_infused)
                 
                 with open(log_file, 'w') as log:
                     log.write(f"Template app created at {datetime.utcnow().isoformat()}\n")
                     log.write(f"Type: {'AI-Infused' if is_ai_infused else 'Standard'}\n")
                     log.write(f"Files: {files_created}\n")
         
+        except ToolFailed:
+            raise
+        except ToolStalled:
+            raise Exception(f"Qwen CLI stalled: no output or new files for {self.stall_seconds}s")
         except subprocess.TimeoutExpired:
-            raise Exception("Qwen CLI timed out after 10 minutes")
+            raise Exception(f"Qwen CLI timed out after {wall_seconds:.0f}s")
         except Exception as e:
             # Fallback to template
             print(f"⚠️  Qwen CLI failed, using template: {e}")
-            files_created = self._create_template_app(output_dir, prompt, is_ai_infused)
+            files_created = await asyncio.to_thread(self._create_template_app, output_dir, prompt, is_ai_infused)
         
         return files_created
     
+    async def _get_tool_version(self) -> str:
+        """AI tool version, part of the generation cache key."""
+        if self._tool_version is None:
+            try:
+                result = await run_command(
+                    [self.tool_path or self.ai_tool, "--version"],
+                    timeout=30
+                )
+                self._tool_version = (result.stdout or result.stderr).strip() or "unknown"
+            except Exception:
+                self._tool_version = "unknown"
+        return self._tool_version
+    
+    def _cache_generation(self, cache_key: str, output_dir: str, files: List[str]):
+        """Store the tracked part of a fresh generation in the cache."""
+        try:
+            self.generation_cache.put(cache_key, output_dir, files, info={'app': os.path.basename(output_dir)})
+        except OSError as e:
+            print(f"⚠️  Could not cache generation: {e}")
+    
+    def _report_progress(self, path: str, size: int, hasher: IncrementalHasher = None):
+        """Progress event for a file the AI tool just wrote."""
+        print(f"   📄 {path} ({size} bytes)")
+        if hasher is not None:
+            hasher.update(path)
+    
+    def _limited_command(self, cmd: List[str]) -> List[str]:
+        """Wrap cmd so the shell applies CPU and memory rlimits before exec.
+
+        Done with ulimit rather than preexec_fn, which is unsafe when
+        generations run on several threads. The memory cap is ulimit -v,
+        which limits address space rather than resident memory, so it also
+        counts what V8 and other runtimes only reserve.
+        """
+        if os.name != 'posix' or not (self.cpu_seconds or self.memory_mb):
+            return cmd
+        
+        limits = []
+        if self.cpu_seconds:
+            limits.append(f"ulimit -t {int(self.cpu_seconds)}")
+        if self.memory_mb:
+            limits.append(f"ulimit -v {int(self.memory_mb) * 1024}")
+        return ["/bin/sh", "-c", "; ".join(limits) + '; exec "$@"', "sh"] + cmd
+    
+    def _session_command(self, cmd: List[str]) -> List[str]:
+        """Memory (address space) cap for a warm session; a CPU cap would add up across its jobs."""
+        if os.name != 'posix' or not self.memory_mb:
+            return cmd
+        return ["/bin/sh", "-c", f"ulimit -v {int(self.memory_mb) * 1024}; " + 'exec "$@"', "sh"] + cmd
+    
+    def _tool_env(self, work_dir: str = None) -> Optional[dict]:
+        """Environment for the AI tool, with scratch files kept in the job dir."""
+        if not work_dir:
+            return None
+        env = dict(os.environ)
+        env['TMPDIR'] = work_dir
+        return env
+    
     def _create_template_app(self, output_dir: str, prompt: str, is_ai_infused: bool = False) -> List[str]:
         """Create a template app structure when Qwen CLI is unavailable."""
         files_created = []
@@ -263,6 +617,9 @@ Focus on clean, maintainable code with proper error handling.
     def _create_ai_template_app(self, output_dir: str, files_created: List[str]) -> List[str]:
         """Create an AI-infused template app."""
         
+        # Shared skeleton (server, client, AI service layer) from the bundle
+        files_created.extend(self.template_store.materialize('ai', output_dir))
+        
         # Create package.json with AI dependencies
         package_json = {
             "name": os.path.basename(output_dir),
@@ -273,18 +630,24 @@ Focus on clean, maintainable code with proper error handling.
                 "start": "node server.js",
                 "dev": "nodemon server.js",
                 "client": "cd client && npm start",
-                "build": "cd client && npm run build"
+                "build": "cd client && npm run build",
+                "loadtest": "node scripts/load-test.js"
+            },
+            "engines": {
+                "node": ">=18"
             },
             "dependencies": {
                 "express": "^4.18.2",
                 "cors": "^2.8.5",
                 "better-sqlite3": "^9.0.0",
+                "compression": "^1.7.4",
                 "langchain": "^0.1.0",
                 "@anthropic-ai/sdk": "^0.10.0",
                 "openai": "^4.20.0",
                 "dotenv": "^16.3.0"
             },
             "devDependencies": {
+                "autocannon": "^7.12.0",
                 "nodemon": "^3.0.0"
             }
         }
@@ -293,111 +656,9 @@ Focus on clean, maintainable code with proper error handling.
         with open(package_path, 'w') as f:
             json.dump(package_json, f, indent=2)
         files_created.append('package.json')
+        files_created.extend(self._write_lockfiles(output_dir, 'ai', package_json))
         
-        # Create AI service layer
-        ai_service_js = """const { LangChain } = require('langchain');
-
-class AIService {
-  constructor() {
-    this.apiKey = process.env.AI_API_KEY;
-    this.enabled = !!this.apiKey;
-
-    if (!this.enabled) {
-      console.log('ℹ️  AI service running in demo mode');
-    }
-  }
-
-  async generate(prompt, context = {}) {
-    if (!this.enabled) {
-      return this.getDemoResponse(prompt, context);
-    }
-
-    try {
-      // Using LangChain for orchestration
-      const response = await this.callAI(prompt, context);
-      return {
-        success: true,
-        data: response,
-        timestamp: new Date().toISOString()
-      };
-    } catch (error) {
-      console.error('AI service error:', error);
-      return this.getDemoResponse(prompt, context);
-    }
-  }
-
-  async callAI(prompt, context) {
-    // Implement actual AI call here
-    // This is a placeholder for the AI integration
-    return {
-      message: 'AI response placeholder',
-      suggestions: ['Suggestion 1', 'Suggestion 2', 'Suggestion 3']
-    };
-  }
-
-  getDemoResponse(prompt, context) {
-    // Demo mode response
-    return {
-      success: true,
-      data: {
-        message: 'Demo mode: AI features available with API key',
-        suggestions: this.generateSimpleSuggestions(prompt)
-      },
-      demo: true
-    };
-  }
-
-  generateSimpleSuggestions(input) {
-    // Simple rule-based suggestions as fallback
-    const keywords = input.toLowerCase().split(' ');
-    const suggestions = [];
-
-    if (keywords.includes('create') || keywords.includes('build')) {
-      suggestions.push('Start with a template');
-      suggestions.push('Break down into smaller tasks');
-    }
-    if (keywords.includes('help') || keywords.includes('how')) {
-      suggestions.push('Check the documentation');
-      suggestions.push('Try our interactive tutorial');
-    }
-
-    return suggestions.length > 0 ? suggestions : ['Get started now', 'Explore features', 'View examples'];
-  }
-
-  async analyze(text) {
-    // Sentiment analysis, categorization, etc.
-    return {
-      sentiment: 'neutral',
-      categories: ['general'],
-      confidence: 0.8
-    };
-  }
-
-  async summarize(text) {
-    // Text summarization
-    return text.substring(0, 200) + '...';
-  }
-}
-
-module.exports = new AIService();
-"""
-        ai_service_path = os.path.join(output_dir, 'services', 'ai-service.js')
-        os.makedirs(os.path.dirname(ai_service_path), exist_ok=True)
-        with open(ai_service_path, 'w') as f:
-            f.write(ai_service_js)
-        files_created.append('services/ai-service.js')
-        
-        # Create .env template
-        env_content = """# App Configuration
-PORT=3000
-NODE_ENV=development
-"""
-        env_path = os.path.join(output_dir, '.env.example')
-        with open(env_path, 'w') as f:
-            f.write(env_content)
-        files_created.append('.env.example')
-        
-        # Create standard app files
+        # Create per-app files
         files_created.extend(self._create_standard_app_files(output_dir, True))
         
         return files_created
@@ -405,6 +666,9 @@ NODE_ENV=development
     def _create_standard_template_app(self, output_dir: str, files_created: List[str]) -> List[str]:
         """Create a standard (non-AI) template app."""
         
+        # Shared skeleton (server, client) from the bundle
+        files_created.extend(self.template_store.materialize('standard', output_dir))
+        
         # Create package.json
         package_json = {
             "name": os.path.basename(output_dir),
@@ -415,14 +679,20 @@ NODE_ENV=development
                 "start": "node server.js",
                 "dev": "nodemon server.js",
                 "client": "cd client && npm start",
-                "build": "cd client && npm run build"
+                "build": "cd client && npm run build",
+                "loadtest": "node scripts/load-test.js"
+            },
+            "engines": {
+                "node": ">=18"
             },
             "dependencies": {
                 "express": "^4.18.2",
                 "cors": "^2.8.5",
-                "better-sqlite3": "^9.0.0"
+                "better-sqlite3": "^9.0.0",
+                "compression": "^1.7.4"
             },
             "devDependencies": {
+                "autocannon": "^7.12.0",
                 "nodemon": "^3.0.0"
             }
         }
@@ -431,72 +701,82 @@ NODE_ENV=development
         with open(package_path, 'w') as f:
             json.dump(package_json, f, indent=2)
         files_created.append('package.json')
+        files_created.extend(self._write_lockfiles(output_dir, 'standard', package_json))
         
-        # Create standard app files
+        # Create per-app files
         files_created.extend(self._create_standard_app_files(output_dir, False))
         
         return files_created
     
+    def _write_lockfiles(self, output_dir: str, bundle: str, package_json: dict) -> List[str]:
+        """Write package-lock.json files from the dependency store's lockfile templates.
+
+        Only lockfiles already resolved (by `vibe_coder.py deps` or the cache
+        warm-up) are used; generation never runs npm or downloads packages.
+        """
+        if not self.deps_enabled:
+            return []
+        
+        version = TEMPLATE_BUNDLES[bundle]['version']
+        written = []
+        try:
+            for template, rel_dir, package in self._template_packages(output_dir, bundle, package_json):
+                lock = self.dep_store.stored_lockfile(template, version, package)
+                if lock is None:
+                    continue
+                self.dep_store.write_lockfile(os.path.join(output_dir, rel_dir), lock, package['name'], package['version'])
+                written.append(f"{rel_dir}/package-lock.json" if rel_dir else 'package-lock.json')
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  No lockfile for the {bundle} template: {e}")
+        return written
+    
+    def _template_packages(self, output_dir: str, bundle: str, package_json: dict) -> list:
+        """(template, directory, package.json) for each package of a template app."""
+        with open(os.path.join(output_dir, 'client', 'package.json'), 'r') as f:
+            client_package = json.load(f)
+        return [(bundle, '', package_json), ('client', 'client', client_package)]
+    
+    def prepare_dependencies(self, force: bool = False) -> dict:
+        """Resolve and prefetch dependencies for every template bundle.
+
+        Resolutions that failed recently are skipped unless force.
+        """
+        work_root = os.path.join(self.projects_dir, '.work')
+        os.makedirs(work_root, exist_ok=True)
+        # Bundles share packages (the client), so each lockfile is resolved once
+        wanted = {}
+        for bundle, is_ai in (('standard', False), ('ai', True)):
+            version = TEMPLATE_BUNDLES[bundle]['version']
+            tmp_dir = tempfile.mkdtemp(prefix='deps-', dir=work_root)
+            try:
+                app_dir = os.path.join(tmp_dir, 'vibe-template')
+                self._create_template_app(app_dir, '', is_ai)
+                with open(os.path.join(app_dir, 'package.json'), 'r') as f:
+                    package_json = json.load(f)
+                for template, _, package in self._template_packages(app_dir, bundle, package_json):
+                    wanted[self.dep_store.lock_key(template, version, package)] = (template, version, package)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        
+        for template, version, package in wanted.values():
+            try:
+                self.dep_store.lockfile_for(template, version, package, force)
+            except DependencyError as e:
+                print(f"⚠️  Could not resolve the {template} template's dependencies: {e}")
+        return self.dep_store.stats()
+    
     def _create_standard_app_files(self, output_dir: str, is_ai: bool = False) -> List[str]:
-        """Create standard app files (server, client, etc)."""
+        """Create the per-app files that aren't shared through the template bundle."""
         files_created = []
         
-        # Create server.js
-        server_js = """const express = require('express');
-const cors = require('cors');
-const Database = require('better-sqlite3');
-const path = require('path');
-
-const app = express();
-const PORT = process.env.PORT || 3000;
-
-// Middleware
-app.use(cors());
-app.use(express.json());
-app.use(express.static(path.join(__dirname, 'client/build')));
-
-// Initialize database
-const db = new Database('./database/app.db');
-
-// Create tables
-db.exec(`
-  CREATE TABLE IF NOT EXISTS items (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
-    description TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-  )
-`);
-
-// API Routes
-app.get('/api/items', (req, res) => {
-  const items = db.prepare('SELECT * FROM items').all();
-  res.json(items);
-});
-
-app.post('/api/items', (req, res) => {
-  const { name, description } = req.body;
-  const stmt = db.prepare('INSERT INTO items (name, description) VALUES (?, ?)');
-  const result = stmt.run(name, description);
-  res.json({ id: result.lastInsertRowid, name, description });
-});
-
-// Serve React app
-app.get('*', (req, res) => {
-  res.sendFile(path.join(__dirname, 'client/build/index.html'));
-});
-
-app.listen(PORT, () => {
-  console.log(`Server running on http://localhost:${PORT}`);
-});
-"""
-        server_path = os.path.join(output_dir, 'server.js')
-        with open(server_path, 'w') as f:
-            f.write(server_js)
-        files_created.append('server.js')
-        
         # Create README.md
         app_type = "AI-powered " if is_ai else ""
+        ai_stack = "- LangChain (AI Orchestration)\n- Anthropic/OpenAI (AI Models)" if is_ai else ""
+        ai_endpoints = (
+            "- `POST /api/ai/generate` - AI response (cached, coalesced, rate limited)\n"
+            "- `POST /api/ai/stream` - Same, streamed as server-sent events\n"
+            "- `GET /api/ai/stats` - Cache and rate limit counters\n"
+        ) if is_ai else ""
         readme = f"""# {os.path.basename(output_dir)}
 
 {app_type}Vibe-coded application generated by Vibe Coder.
@@ -504,8 +784,8 @@ app.listen(PORT, () => {
 ## Quick Start
 
 ```bash
-# Install dependencies
-npm install
+# Install dependencies (package-lock.json pins the exact tree)
+npm ci
 
 # Run server
 npm start
@@ -516,15 +796,23 @@ npm run dev
 
 ## API Endpoints
 
-- `GET /api/items` - Get all items
+- `GET /api/items?limit=50&cursor=...` - Newest items first, keyset-paginated (`nextCursor` fetches the next page)
+- `GET /api/items/count` - Total number of items
 - `POST /api/items` - Create new item
+{ai_endpoints}
+## Load Test
+
+```bash
+npm start
+npm run loadtest   # TARGET, DURATION, CONNECTIONS, SEED env vars
+```
 
 ## Tech Stack
 
 - Express.js (Backend)
 - React (Frontend)
 - SQLite (Database)
-{('- LangChain (AI Orchestration)\n- Anthropic/OpenAI (AI Models)' if is_ai else '')}
+{ai_stack}
 
 Generated by Vibe Coder - Autonomous App Factory
 """
@@ -533,196 +821,87 @@ Generated by Vibe Coder - Autonomous App Factory
             f.write(readme)
         files_created.append('README.md')
         
-        # Create client directory structure
-        client_dir = os.path.join(output_dir, 'client')
-        os.makedirs(client_dir, exist_ok=True)
-        os.makedirs(os.path.join(client_dir, 'public'), exist_ok=True)
-        os.makedirs(os.path.join(client_dir, 'src'), exist_ok=True)
-        
-        # Create client package.json
-        client_package = {
-            "name": "client",
-            "version": "0.1.0",
-            "private": True,
-            "dependencies": {
-                "react": "^18.2.0",
-                "react-dom": "^18.2.0",
-                "react-scripts": "5.0.1"
-            },
-            "scripts": {
-                "start": "react-scripts start",
-                "build": "react-scripts build"
-            },
-            "browserslist": {
-                "production": [">0.2%", "not dead", "not op_mini all"],
-                "development": ["last 1 chrome version", "last 1 firefox version"]
-            }
-        }
-        
-        client_package_path = os.path.join(client_dir, 'package.json')
-        with open(client_package_path, 'w') as f:
-            json.dump(client_package, f, indent=2)
-        files_created.append('client/package.json')
-        
-        # Create public/index.html
-        index_html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>Vibe App</title>
-</head>
-<body>
-  <noscript>You need to enable JavaScript to run this app.</noscript>
-  <div id="root"></div>
-</body>
-</html>
-"""
-        index_path = os.path.join(client_dir, 'public', 'index.html')
-        with open(index_path, 'w') as f:
-            f.write(index_html)
-        files_created.append('client/public/index.html')
-        
-        # Create src/index.js
-        index_js = """import React from 'react';
-import ReactDOM from 'react-dom/client';
-import App from './App';
-
-const root = ReactDOM.createRoot(document.getElementById('root'));
-root.render(
-  <React.StrictMode>
-    <App />
-  </React.StrictMode>
-);
-"""
-        src_index_path = os.path.join(client_dir, 'src', 'index.js')
-        with open(src_index_path, 'w') as f:
-            f.write(index_js)
-        files_created.append('client/src/index.js')
-        
-        # Create src/App.js
-        app_js = """import React, { useState, useEffect } from 'react';
-
-function App() {
-  const [items, setItems] = useState([]);
-  const [name, setName] = useState('');
-  const [description, setDescription] = useState('');
-
-  useEffect(() => {
-    fetch('/api/items')
-      .then(res => res.json())
-      .then(data => setItems(data));
-  }, []);
-
-  const handleSubmit = (e) => {
-    e.preventDefault();
-    fetch('/api/items', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ name, description })
-    })
-      .then(res => res.json())
-      .then(item => {
-        setItems([...items, item]);
-        setName('');
-        setDescription('');
-      });
-  };
-
-  return (
-    <div style={{ padding: '20px', maxWidth: '800px', margin: '0 auto' }}>
-      <h1>Vibe App</h1>
-      <form onSubmit={handleSubmit} style={{ marginBottom: '20px' }}>
-        <input
-          type="text"
-          placeholder="Name"
-          value={name}
-          onChange={(e) => setName(e.target.value)}
-          style={{ display: 'block', width: '100%', marginBottom: '10px', padding: '8px' }}
-        />
-        <textarea
-          placeholder="Description"
-          value={description}
-          onChange={(e) => setDescription(e.target.value)}
-          style={{ display: 'block', width: '100%', marginBottom: '10px', padding: '8px' }}
-        />
-        <button type="submit" style={{ padding: '10px 20px' }}>Add Item</button>
-      </form>
-      <h2>Items</h2>
-      <ul>
-        {items.map(item => (
-          <li key={item.id}>
-            <strong>{item.name}</strong>: {item.description}
-          </li>
-        ))}
-      </ul>
-    </div>
-  );
-}
-
-export default App;
-"""
-        app_js_path = os.path.join(client_dir, 'src', 'App.js')
-        with open(app_js_path, 'w') as f:
-            f.write(app_js)
-        files_created.append('client/src/App.js')
-        
         # Create database directory
         db_dir = os.path.join(output_dir, 'database')
         os.makedirs(db_dir, exist_ok=True)
         
-        # Create .gitignore
-        gitignore = """node_modules/
-*.db
-.DS_Store
-client/build/
-.env
-"""
-        gitignore_path = os.path.join(output_dir, '.gitignore')
-        with open(gitignore_path, 'w') as f:
-            f.write(gitignore)
-        files_created.append('.gitignore')
-        
         return files_created
     
-    def _init_git_repo(self, app_path: str):
-        """Initialize git repository."""
-        print(f"📦 Initializing git repo...")
+    async def _init_git_repo(self, app_path: str, manifest: list, diff: TreeDiff = None) -> str:
+        """Initialize git repository (or commit a regeneration) and return the commit SHA."""
+        head = await asyncio.to_thread(self.git_writer.head, app_path)
+        if head and diff is not None and not diff.changed:
+            print(f"📦 No changes, keeping commit {head[:12]}")
+            return head
+        
+        if head:
+            print(f"📦 Committing regenerated files...")
+            message = f"Regenerate app: {diff.summary() if diff else 'updated files'}"
+        else:
+            print(f"📦 Initializing git repo...")
+            message = "Initial commit: Vibe-coded app"
         
-        subprocess.run(
-            ["git", "init"],
-            cwd=app_path,
-            capture_output=True
-        )
-        subprocess.run(
-            ["git", "add", "."],
-            cwd=app_path,
-            capture_output=True
-        )
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit: Vibe-coded app"],
-            cwd=app_path,
-            capture_output=True
+        if self.git_fast_path:
+            try:
+                return await asyncio.to_thread(self._commit_tree, app_path, manifest, message)
+            except (OSError, GitWriteError) as e:
+                print(f"⚠️  Fast git path failed, falling back to git CLI: {e}")
+        
+        return await self._init_git_repo_cli(app_path, message)
+    
+    def _commit_tree(self, app_path: str, manifest: list, message: str) -> str:
+        """Commit the manifest with the in-process git writer."""
+        self.git_writer.seed_shared(self.template_store.shared_files())
+        return self.git_writer.commit_tree(
+            app_path,
+            [entry.path for entry in manifest],
+            message,
+            hashes={entry.path: entry.hash for entry in manifest}
         )
     
-    def _push_to_github(self, app_path: str, app_name: str) -> str:
-        """Push to GitHub."""
-        print(f"🚀 Pushing to GitHub...")
-        
+    async def _init_git_repo_cli(self, app_path: str, message: str) -> str:
+        """Initialize git repository with the git CLI."""
+        name, _, email = self.git_author.partition(' <')
+        identity = ["-c", f"user.name={name}", "-c", f"user.email={email.rstrip('>')}"]
+        
+        for step, args in (
+            ("init", ["-c", "init.defaultBranch=main", "init"]),
+            ("add", ["add", "."]),
+            ("commit", identity + ["commit", "-m", message]),
+            ("rev-parse", ["rev-parse", "HEAD"]),
+        ):
+            result = await run_command(["git"] + args, cwd=app_path)
+            if result.returncode != 0:
+                raise RuntimeError(f"git {step} failed: {result.stderr.strip() or result.stdout.strip()}")
+        
+        return result.stdout.strip()
+    
+    def _queue_publish(self, app_path: str, app_name: str, description: str = '') -> str:
+        """Queue a GitHub publish job in the outbox."""
         repo_name = f"{self.repo_prefix}{app_name}"
-        
-        try:
-            # Create repo via gh CLI
-            subprocess.run(
-                ["gh", "repo", "create", repo_name, "--public", "--source", app_path, "--push"],
-                cwd=app_path,
-                capture_output=True,
-                timeout=60
-            )
-            return f"{self.config.get('github_user', 'vkumar-dev')}/{repo_name}"
-        except Exception as e:
-            print(f"⚠️  GitHub push failed: {e}")
-            return None
+        job = self.outbox.enqueue(
+            app_name=app_name,
+            app_path=os.path.abspath(app_path),
+            repo_name=repo_name,
+            visibility=self.visibility,
+            topics=self.topics,
+            description=description[:350]
+        )
+        return job.job_id
+    
+    def _staging_dir(self, app_name: str, work_dir: str = None) -> str:
+        """Fresh projects/.work/.../<app_name> the AI tool writes into."""
+        if not work_dir:
+            os.makedirs(os.path.join(self.projects_dir, '.work'), exist_ok=True)
+        parent = work_dir or tempfile.mkdtemp(prefix='regen-', dir=os.path.join(self.projects_dir, '.work'))
+        staging_dir = os.path.join(parent, app_name)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        return staging_dir
+    
+    def _manifest_path(self, app_name: str) -> str:
+        """Compact per-project manifest, kept beside projects/<app>."""
+        return os.path.join(self.projects_dir, '.manifests', f"{app_name}.tsv")
     
     def _sanitize_name(self, title: str) -> str:
         """Sanitize app name for filesystem and GitHub."""
@@ -735,44 +914,52 @@ client/build/
     
     def _save_generation_log(self, result: AppGenerationResult):
         """Save generation result to log."""
-        log_file = os.path.join(self.logs_dir, 'generations.json')
-        
-        # Load existing logs
-        logs = []
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
-            except Exception:
-                logs = []
-        
-        # Add new result
-        logs.append({
-            'idea_id': result.idea_id,
-            'app_name': result.app_name,
-            'app_path': result.app_path,
-            'success': result.success,
-            'files_created': result.files_created,
-            'github_repo': result.github_repo,
-            'error': result.error,
-            'duration_seconds': result.duration_seconds,
-            'generated_at': result.generated_at
-        })
-        
-        # Save
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        # Concurrent jobs share generations.json
+        with self._log_lock:
+            log_file = os.path.join(self.logs_dir, 'generations.json')
+            
+            # Load existing logs
+            logs = []
+            if os.path.exists(log_file):
+                try:
+                    with open(log_file, 'r') as f:
+                        logs = json.load(f)
+                except Exception:
+                    logs = []
+            
+            # Add new result
+            logs.append({
+                'idea_id': result.idea_id,
+                'app_name': result.app_name,
+                'app_path': result.app_path,
+                'success': result.success,
+                # Full file list lives in the project manifest
+                'file_count': len(result.files_created),
+                'manifest': os.path.relpath(self._manifest_path(result.app_name), self.projects_dir) if result.success else None,
+                'github_repo': result.github_repo,
+                'publish_job': result.publish_job,
+                'git_commit': result.git_commit,
+                # Counts only; the file lists are in the result and the manifest
+                'changes': {k: (len(v) if isinstance(v, list) else v) for k, v in result.changes.items()} if result.changes else None,
+                'error': result.error,
+                'duration_seconds': result.duration_seconds,
+                'generated_at': result.generated_at
+            })
+            
+            # Save
+            with open(log_file, 'w') as f:
+                json.dump(logs, f, indent=2)
 
 
 if __name__ == "__main__":
     generator = AppGenerator()
     
     # Test generation
-    result = generator.generate_app(
+    result = asyncio.run(generator.generate_app(
         idea_title="Task Management Dashboard",
         idea_description="A simple task manager with drag-and-drop",
         idea_features=["Create tasks", "Drag and drop", "Due dates"],
         idea_id="test-001"
-    )
+    ))
     
     print(f"\nResult: Success={result.success}, Files={len(result.files_created)}")
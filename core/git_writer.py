@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - In-Process Git Writer
+
+Creates a project's initial commit by writing loose objects, the index and
+refs directly, without forking git. Blobs shared with template bundles live
+in one object store that every project references through alternates.
+"""
+
+import hashlib
+import os
+import stat
+import struct
+import tempfile
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_BRANCH = 'main'
+DEFAULT_AUTHOR = 'Vibe Coder <vibe-coder@users.noreply.github.com>'
+
+GIT_CONFIG = """[core]
+\trepositoryformatversion = 0
+\tfilemode = true
+\tbare = false
+\tlogallrefupdates = true
+"""
+
+
+class GitWriteError(Exception):
+    """Raised when the fast path cannot produce a repository."""
+
+
+class LooseObjectStore:
+    """A git objects/ directory written with zlib-compressed loose objects."""
+
+    def __init__(self, objects_dir: str):
+        self.objects_dir = objects_dir
+        os.makedirs(os.path.join(self.objects_dir, 'info'), exist_ok=True)
+        os.makedirs(os.path.join(self.objects_dir, 'pack'), exist_ok=True)
+
+    def object_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha[2:])
+
+    def has(self, sha: str) -> bool:
+        return os.path.exists(self.object_path(sha))
+
+    def write(self, obj_type: str, data: bytes, sha: Optional[str] = None) -> str:
+        """Write an object if missing and return its SHA-1."""
+        if sha is None:
+            sha = hash_object(obj_type, data)
+        path = self.object_path(sha)
+        if os.path.exists(path):
+            return sha
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = zlib.compress(f"{obj_type} {len(data)}\0".encode('ascii') + data, 1)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-obj-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return sha
+
+
+def hash_object(obj_type: str, data: bytes) -> str:
+    """SHA-1 of a git object as `git hash-object` computes it."""
+    return hashlib.sha1(f"{obj_type} {len(data)}\0".encode('ascii') + data).hexdigest()
+
+
+class GitRepoWriter:
+    """Builds a project's initial commit without spawning git."""
+
+    def __init__(self, shared_objects_dir: str, author: str = DEFAULT_AUTHOR, branch: str = DEFAULT_BRANCH):
+        self.shared = LooseObjectStore(shared_objects_dir)
+        self.author = author
+        self.branch = branch
+        self._seeded = set()
+
+    def seed_shared(self, paths: Iterable[str]):
+        """Store blobs for shared files (template layers) in the shared store."""
+        for path in paths:
+            if path in self._seeded:
+                continue
+            with open(path, 'rb') as f:
+                self.shared.write('blob', f.read())
+            self._seeded.add(path)
+
+    def head(self, app_path: str) -> Optional[str]:
+        """Tip of the branch in app_path, or None if it has no commits yet."""
+        ref_path = os.path.join(app_path, '.git', 'refs', 'heads', self.branch)
+        if not os.path.exists(ref_path):
+            return None
+        with open(ref_path, 'r') as f:
+            return f.read().strip() or None
+
+    def commit_tree(self, app_path: str, files: List[str], message: str,
+                    hashes: Dict[str, str] = None) -> str:
+        """Write objects, index and refs for files; returns the commit SHA.
+
+        hashes maps paths to known blob ids (from the manifest) so files whose
+        blob is already in the shared store are never read.
+        """
+        hashes = hashes or {}
+        git_dir = os.path.join(app_path, '.git')
+        parent = self._init_layout(app_path, git_dir)
+        local = LooseObjectStore(os.path.join(git_dir, 'objects'))
+
+        entries = []
+        for rel_path in sorted(set(files), key=lambda p: p.encode('utf-8')):
+            full_path = os.path.join(app_path, rel_path)
+            st = os.lstat(full_path)
+            if stat.S_ISLNK(st.st_mode):
+                data = os.readlink(full_path).encode('utf-8')
+                mode = 0o120000
+            elif stat.S_ISREG(st.st_mode):
+                mode = 0o100755 if st.st_mode & stat.S_IXUSR else 0o100644
+                sha = hashes.get(rel_path)
+                if sha and (self.shared.has(sha) or local.has(sha)):
+                    entries.append((rel_path, mode, sha, st))
+                    continue
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+            else:
+                continue
+
+            sha = hash_object('blob', data)
+            if not self.shared.has(sha):
+                local.write('blob', data, sha)
+            entries.append((rel_path, mode, sha, st))
+
+        tree_sha = self._write_trees(local, [(p, m, s) for p, m, s, _ in entries])
+        commit_sha = self._write_commit(local, tree_sha, parent, message)
+
+        self._write_index(git_dir, entries)
+        self._update_ref(git_dir, commit_sha)
+        return commit_sha
+
+    def _init_layout(self, app_path: str, git_dir: str) -> Optional[str]:
+        """Create .git if needed; returns the current branch tip, if any."""
+        if os.path.isdir(git_dir):
+            with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+                head = f.read().strip()
+            if head != f"ref: refs/heads/{self.branch}":
+                raise GitWriteError(f"unexpected HEAD: {head}")
+            ref_path = os.path.join(git_dir, 'refs', 'heads', self.branch)
+            if os.path.exists(ref_path):
+                with open(ref_path, 'r') as f:
+                    return f.read().strip()
+            if os.path.exists(os.path.join(git_dir, 'packed-refs')):
+                raise GitWriteError("packed refs are not supported by the fast path")
+            return None
+
+        os.makedirs(os.path.join(git_dir, 'refs', 'heads'))
+        os.makedirs(os.path.join(git_dir, 'refs', 'tags'))
+        os.makedirs(os.path.join(git_dir, 'objects', 'info'))
+        with open(os.path.join(git_dir, 'HEAD'), 'w') as f:
+            f.write(f"ref: refs/heads/{self.branch}\n")
+        with open(os.path.join(git_dir, 'config'), 'w') as f:
+            f.write(GIT_CONFIG)
+
+        # Relative, so the whole projects/ tree can be moved as a unit
+        alternate = os.path.relpath(self.shared.objects_dir, os.path.join(git_dir, 'objects'))
+        with open(os.path.join(git_dir, 'objects', 'info', 'alternates'), 'w') as f:
+            f.write(alternate.replace(os.sep, '/') + '\n')
+        return None
+
+    def _write_trees(self, store: LooseObjectStore, entries: List[Tuple[str, int, str]]) -> str:
+        """Write nested tree objects and return the root tree SHA."""
+        root: Dict = {}
+        for rel_path, mode, sha in entries:
+            node = root
+            parts = rel_path.split('/')
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = (mode, sha)
+
+        def write(node: Dict) -> str:
+            items = []
+            for name, value in node.items():
+                if isinstance(value, dict):
+                    items.append((name + '/', name, 0o40000, write(value)))
+                else:
+                    items.append((name, name, value[0], value[1]))
+            # Git sorts directories as if their names ended in '/'
+            items.sort(key=lambda item: item[0].encode('utf-8'))
+            data = b''.join(
+                f"{mode:o} {name}".encode('utf-8') + b'\0' + bytes.fromhex(sha)
+                for _, name, mode, sha in items
+            )
+            return store.write('tree', data)
+
+        return write(root)
+
+    def _write_commit(self, store: LooseObjectStore, tree_sha: str, parent: Optional[str], message: str) -> str:
+        stamp = f"{int(time.time())} +0000"
+        lines = [f"tree {tree_sha}"]
+        if parent:
+            lines.append(f"parent {parent}")
+        lines.append(f"author {self.author} {stamp}")
+        lines.append(f"committer {self.author} {stamp}")
+        data = ('\n'.join(lines) + '\n\n' + message.rstrip('\n') + '\n').encode('utf-8')
+        return store.write('commit', data)
+
+    def _write_index(self, git_dir: str, entries: list):
+        """Write a version 2 index so `git status` sees a clean tree."""
+        body = [b'DIRC', struct.pack('>II', 2, len(entries))]
+        for rel_path, mode, sha, st in entries:
+            name = rel_path.encode('utf-8')
+            fields = [
+                int(st.st_ctime), st.st_ctime_ns % 1000000000,
+                int(st.st_mtime), st.st_mtime_ns % 1000000000,
+                st.st_dev, st.st_ino, mode, st.st_uid, st.st_gid, st.st_size,
+            ]
+            entry = struct.pack('>10I', *(v & 0xFFFFFFFF for v in fields))
+            entry += bytes.fromhex(sha) + struct.pack('>H', min(len(name), 0xFFF)) + name
+            entry += b'\0' * (8 - (len(entry) % 8))
+            body.append(entry)
+
+        data = b''.join(body)
+        self._atomic_write(os.path.join(git_dir, 'index'), data + hashlib.sha1(data).digest())
+
+    def _update_ref(self, git_dir: str, commit_sha: str):
+        ref_path = os.path.join(git_dir, 'refs', 'heads', self.branch)
+        self._atomic_write(ref_path, (commit_sha + '\n').encode('ascii'))
+
+    def _atomic_write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Shared Idea Queue
+
+A lease-based queue of researched ideas in SQLite (state/ideas.db by
+default), shared by every worker that points queue.path at the same file.
+Workers claim ideas under a lease they keep alive with heartbeats; a lease
+that isn't renewed within the visibility timeout goes back to the queue.
+Once generation of an idea starts it is never handed out again, so each
+idea is generated at most once however many workers share the stream.
+Ideas nobody claims within max_age_hours are dropped as stale.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional
+
+from core.research import AppIdea
+
+
+# Idea statuses
+QUEUED = 'queued'           # waiting for a worker
+LEASED = 'leased'           # claimed; duplicate check or wait for a generation slot
+GENERATING = 'generating'   # generation started; never handed out again
+DONE = 'done'
+FAILED = 'failed'
+DUPLICATE = 'duplicate'
+
+FINISHED = (DONE, FAILED, DUPLICATE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ideas (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idea_id TEXT NOT NULL UNIQUE,
+    idea TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    app_name TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ideas_status ON ideas (status, priority, seq);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+def default_worker_id() -> str:
+    """VIBE_WORKER_ID, else host-pid."""
+    return os.environ.get('VIBE_WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class IdeaQueue:
+    """Ideas shared between workers, each leased to one worker at a time."""
+
+    def __init__(self, db_file: str = None, worker_id: str = None, lease_seconds: float = 300,
+                 heartbeat_seconds: float = 60, max_attempts: int = 3, registry_hours: float = 24,
+                 retain_days: float = 30, max_age_hours: float = 168):
+        self.db_file = db_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'ideas.db')
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_attempts = max_attempts
+        self.registry_hours = registry_hours
+        self.retain_days = retain_days
+        self.max_age_hours = max_age_hours
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: dict, state_dir: str = None) -> Optional['IdeaQueue']:
+        """The configured queue, or None when queue.enabled is off.
+
+        VIBE_QUEUE overrides queue.path; relative paths are from the repo root.
+        Without either, the queue is ideas.db in state_dir (default state/).
+        """
+        queue_config = (config or {}).get('queue', {})
+        if not queue_config.get('enabled', True):
+            return None
+        db_file = os.environ.get('VIBE_QUEUE') or queue_config.get('path')
+        if db_file and not os.path.isabs(db_file):
+            db_file = os.path.join(os.path.dirname(__file__), '..', db_file)
+        elif not db_file and state_dir:
+            db_file = os.path.join(state_dir, 'ideas.db')
+        return cls(
+            db_file=db_file,
+            lease_seconds=queue_config.get('lease_seconds', 300),
+            heartbeat_seconds=queue_config.get('heartbeat_seconds', 60),
+            max_attempts=queue_config.get('max_attempts', 3),
+            registry_hours=queue_config.get('registry_hours', 24),
+            retain_days=queue_config.get('retain_days', 30),
+            max_age_hours=queue_config.get('max_age_hours', 168)
+        )
+
+    def enqueue(self, ideas: Iterable[AppIdea]) -> int:
+        """Add ideas not seen before; returns how many were new."""
+        now = time.time()
+        added = 0
+        with self._transaction() as db:
+            for idea in ideas:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO ideas (idea_id, idea, title, description, priority, status, "
+                    "enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (idea.id, json.dumps(asdict(idea)), idea.title, idea.description,
+                     idea.priority, QUEUED, now, now)
+                )
+                added += cursor.rowcount
+        return added
+
+    def claim(self) -> Optional[AppIdea]:
+        """Lease the next queued idea (highest priority, then oldest) to this worker."""
+        now = time.time()
+        with self._transaction() as db:
+            self._expire(db, now)
+            row = db.execute(
+                "SELECT seq, idea FROM ideas WHERE status = ? ORDER BY priority DESC, seq LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE ideas SET status = ?, owner = ?, lease_expires = ?, updated_at = ? WHERE seq = ?",
+                (LEASED, self.worker_id, now + self.lease_seconds, now, row['seq'])
+            )
+        return AppIdea(**json.loads(row['idea']))
+
+    def start(self, idea_id: str) -> bool:
+        """Commit to generating a leased idea; False if the lease was lost to another worker."""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE ideas SET status = ?, lease_expires = ?, updated_at = ? "
+                "WHERE idea_id = ? AND status = ? AND owner = ? AND lease_expires >= ?",
+                (GENERATING, now + self.lease_seconds, now, idea_id, LEASED, self.worker_id, now)
+            )
+            return cursor.rowcount == 1
+
+    def finish(self, idea_id: str, status: str, app_name: str = None, error: str = None):
+        """Record the outcome (done, failed or duplicate) of an idea this worker holds.
+
+        The worker stays recorded as its owner, so in_flight can tell its
+        own finished ideas from other workers'.
+        """
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE ideas SET status = ?, lease_expires = NULL, app_name = ?, "
+                "error = ?, updated_at = ? WHERE idea_id = ? AND owner = ? AND status IN (?, ?)",
+                (status, app_name, error, time.time(), idea_id, self.worker_id, LEASED, GENERATING)
+            )
+
+    def adopt(self, worker_ids: Iterable[str]) -> int:
+        """Take over what earlier runs of this worker still hold; returns how many ideas.
+
+        worker_ids come from the journal of an interrupted cycle. Ideas they
+        only leased go straight back to the queue; ideas whose generation
+        they started become this worker's, so the resumed cycle can release
+        or finish them as its own.
+        """
+        worker_ids = [w for w in worker_ids if w and w != self.worker_id]
+        if not worker_ids:
+            return 0
+        now = time.time()
+        owners = ', '.join('?' * len(worker_ids))
+        with self._transaction() as db:
+            released = db.execute(
+                "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, updated_at = ? "
+                f"WHERE owner IN ({owners}) AND status = ?",
+                (QUEUED, now, *worker_ids, LEASED)
+            ).rowcount
+            adopted = db.execute(
+                "UPDATE ideas SET owner = ?, lease_expires = ?, updated_at = ? "
+                f"WHERE owner IN ({owners}) AND status = ?",
+                (self.worker_id, now + self.lease_seconds, now, *worker_ids, GENERATING)
+            ).rowcount
+        return released + adopted
+
+    def release(self, idea_id: str):
+        """Put an idea this worker holds back in the queue.
+
+        Only for ideas whose generation never started or was rolled back;
+        the idea keeps its place in the queue order.
+        """
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE idea_id = ? AND owner = ? AND status IN (?, ?)",
+                (QUEUED, time.time(), idea_id, self.worker_id, LEASED, GENERATING)
+            )
+
+    def settle(self, results: Iterable = ()):
+        """Record generation results, then let go of everything this worker still holds.
+
+        Ideas never started go back to the queue for any worker; ideas whose
+        generation started but has no result are failed, not retried.
+        """
+        for result in results:
+            self.finish(
+                result.idea_id,
+                DONE if result.success else FAILED,
+                app_name=result.app_name,
+                error=result.error
+            )
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE owner = ? AND status = ?",
+                (QUEUED, now, self.worker_id, LEASED)
+            )
+            db.execute(
+                "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE owner = ? AND status = ?",
+                (FAILED, 'interrupted during generation', now, self.worker_id, GENERATING)
+            )
+            db.execute("DELETE FROM workers WHERE worker_id = ?", (self.worker_id,))
+            db.execute(
+                "DELETE FROM ideas WHERE status IN (?, ?, ?) AND updated_at < ?",
+                (*FINISHED, now - self.retain_days * 86400)
+            )
+
+    def heartbeat(self) -> int:
+        """Extend this worker's leases; returns how many it holds."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, seen_at) VALUES (?, ?)",
+                (self.worker_id, now)
+            )
+            cursor = db.execute(
+                "UPDATE ideas SET lease_expires = ? WHERE owner = ? AND status IN (?, ?)",
+                (now + self.lease_seconds, self.worker_id, LEASED, GENERATING)
+            )
+            return cursor.rowcount
+
+    async def keep_alive(self):
+        """Heartbeat every heartbeat_seconds until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.heartbeat)
+            except Exception as e:
+                print(f"⚠️  Idea queue heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    def in_flight(self, idea_id: str) -> List[dict]:
+        """Ideas a duplicate check of idea_id must treat as taken.
+
+        That is ideas other workers are generating or generated within
+        registry_hours. Ideas only leased may still turn out to be
+        duplicates or never be built, and this worker's own apps are in its
+        projects/ already, so neither counts.
+        """
+        now = time.time()
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT idea_id, title, description, status, owner, app_name FROM ideas "
+                "WHERE idea_id != ? AND (owner IS NULL OR owner != ?) AND ("
+                "  (status = ? AND lease_expires >= ?)"
+                "  OR (status = ? AND updated_at >= ?))",
+                (idea_id, self.worker_id, GENERATING, now, DONE, now - self.registry_hours * 3600)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def stats(self) -> Dict:
+        """Idea counts by status and the workers seen within a lease."""
+        now = time.time()
+        with self._connect() as db:
+            counts = {r['status']: r['n'] for r in db.execute(
+                "SELECT status, COUNT(*) AS n FROM ideas GROUP BY status")}
+            workers = [r['worker_id'] for r in db.execute(
+                "SELECT worker_id FROM workers WHERE seen_at >= ? ORDER BY worker_id",
+                (now - self.lease_seconds,))]
+            held = [dict(r) for r in db.execute(
+                "SELECT title, status, owner FROM ideas WHERE status IN (?, ?) ORDER BY seq",
+                (LEASED, GENERATING))]
+        return {'counts': counts, 'workers': workers, 'held': held}
+
+    def _expire(self, db: sqlite3.Connection, now: float):
+        """Apply the visibility timeout to leases whose worker stopped heartbeating, and drop stale ideas."""
+        db.execute(
+            "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, attempts = attempts + 1, "
+            "error = ?, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts + 1 >= ?",
+            (FAILED, 'lease expired too many times', now, LEASED, now, self.max_attempts)
+        )
+        db.execute(
+            "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, attempts = attempts + 1, "
+            "updated_at = ? WHERE status = ? AND lease_expires < ?",
+            (QUEUED, now, LEASED, now)
+        )
+        # Generation may have got part-way; retrying could build the app twice
+        db.execute(
+            "UPDATE ideas SET status = ?, owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (FAILED, 'worker lost during generation', now, GENERATING, now)
+        )
+        # The trend behind an idea nobody got to has moved on; research can add it again
+        if self.max_age_hours:
+            db.execute(
+                "DELETE FROM ideas WHERE status = ? AND enqueued_at < ?",
+                (QUEUED, now - self.max_age_hours * 3600)
+            )
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        db = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            if not self._ready:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(_SCHEMA)
+                self._ready = True
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """A write transaction; BEGIN IMMEDIATE takes the write lock up front so claims never race."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+
+def load_idea_queue(config: dict = None, state_dir: str = None) -> Dict:
+    """Queue stats for status output; empty when the queue is off or unused."""
+    queue = IdeaQueue.from_config(config, state_dir)
+    if queue is None or not os.path.exists(queue.db_file):
+        return {}
+    try:
+        return queue.stats()
+    except sqlite3.Error:
+        return {}
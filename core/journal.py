@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Cycle Journal
+
+Checkpoints each stage of the running cycle to state/cycle.json: the
+researched ideas, every duplicate-check verdict and how far each project
+got. A cycle that was killed part-way resumes from it on the next start.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional, Set
+
+from core.duplicate_checker import DuplicateCheck
+from core.research import AppIdea
+
+
+# Project stages, in the order generate_app reaches them
+GENERATING = 'generating'   # AI tool running; the project is untouched
+SYNCING = 'syncing'         # files are being moved into projects/<app>
+SYNCED = 'synced'           # every file is in place
+COMMITTED = 'committed'     # git commit written
+DONE = 'done'               # publish queued (or not wanted)
+FAILED = 'failed'
+ROLLED_BACK = 'rolled_back'
+
+SETTLED = (DONE, FAILED, ROLLED_BACK)
+
+# Written from the event loop and from generation threads
+_JOURNAL_LOCK = threading.Lock()
+
+
+class CycleJournal:
+    """Stage checkpoints of the current (or last interrupted) cycle."""
+
+    def __init__(self, journal_file: str = None, max_age_hours: float = 24):
+        self.journal_file = journal_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'cycle.json')
+        self.max_age_hours = max_age_hours
+        self.worker_id = None
+        self.data = {}
+
+    @classmethod
+    def from_config(cls, config: dict, state_dir: str = None) -> 'CycleJournal':
+        return cls(
+            journal_file=os.path.join(state_dir, 'cycle.json') if state_dir else None,
+            max_age_hours=(config or {}).get('pipeline', {}).get('resume_max_age_hours', 24)
+        )
+
+    def begin(self, worker_id: str = None) -> bool:
+        """Resume an unfinished cycle if there is a recent one, else start a new one.
+
+        worker_id (this process's idea queue identity) is recorded so a
+        resumed cycle can take over what earlier runs claimed. Returns True
+        when resuming.
+        """
+        self.worker_id = worker_id
+        with _JOURNAL_LOCK:
+            previous = self._read()
+            if previous.get('status') == 'running' and self._resumable(previous):
+                previous['resumes'] = previous.get('resumes', 0) + 1
+                workers = previous.setdefault('workers', [])
+                if worker_id and worker_id not in workers:
+                    workers.append(worker_id)
+                self.data = previous
+                self._write()
+                return True
+
+            self.data = {
+                'cycle_id': f"cycle-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+                'status': 'running',
+                'started_at': datetime.utcnow().isoformat(),
+                'started_ts': time.time(),
+                'resumes': 0,
+                'workers': [worker_id] if worker_id else [],
+                'research': None,
+                'verdicts': {},
+                'projects': {}
+            }
+            self._write()
+            return False
+
+    def finish(self):
+        """Mark the cycle complete; the next start begins a new one."""
+        with _JOURNAL_LOCK:
+            self.data['status'] = 'complete'
+            self.data['finished_at'] = datetime.utcnow().isoformat()
+            self._write()
+
+    @property
+    def cycle_id(self) -> Optional[str]:
+        return self.data.get('cycle_id')
+
+    def previous_workers(self) -> List[str]:
+        """Idea queue worker ids of the earlier runs of this cycle."""
+        with _JOURNAL_LOCK:
+            return [w for w in self.data.get('workers', []) if w != self.worker_id]
+
+    def research_ideas(self) -> Optional[List[AppIdea]]:
+        """Ideas from a completed research stage, or None if research hasn't finished."""
+        with _JOURNAL_LOCK:
+            research = self.data.get('research')
+        if research is None:
+            return None
+        return [AppIdea(**idea) for idea in research]
+
+    def record_research(self, ideas: List[AppIdea]):
+        with _JOURNAL_LOCK:
+            self.data['research'] = [asdict(idea) for idea in ideas]
+            self._write()
+
+    def verdict(self, idea_id: str) -> Optional[DuplicateCheck]:
+        with _JOURNAL_LOCK:
+            check = self.data.get('verdicts', {}).get(idea_id)
+        return DuplicateCheck(**check) if check else None
+
+    def record_verdict(self, check: DuplicateCheck):
+        with _JOURNAL_LOCK:
+            self.data.setdefault('verdicts', {})[check.idea_id] = asdict(check)
+            self._write()
+
+    def record_project(self, app_name: str, **fields):
+        """Merge fields (stage, idea_id, ...) into the project's checkpoint."""
+        with _JOURNAL_LOCK:
+            project = self.data.setdefault('projects', {}).setdefault(app_name, {})
+            project.update(fields, updated_at=datetime.utcnow().isoformat())
+            self._write()
+
+    def unsettled_projects(self) -> dict:
+        """Projects a killed or cancelled generation left part-way."""
+        with _JOURNAL_LOCK:
+            projects = self.data.get('projects', {})
+            return {name: dict(p) for name, p in projects.items() if p.get('stage') not in SETTLED}
+
+    def built_projects(self) -> dict:
+        """Projects this cycle already finished."""
+        with _JOURNAL_LOCK:
+            projects = self.data.get('projects', {})
+            return {name: dict(p) for name, p in projects.items() if p.get('stage') == DONE}
+
+    def built_ideas(self) -> Set[str]:
+        """Ideas this cycle already turned into apps."""
+        return {p.get('idea_id') for p in self.built_projects().values()}
+
+    def rolled_back_ideas(self) -> Set[str]:
+        """Ideas whose projects were rolled back, leaving nothing of the attempt."""
+        with _JOURNAL_LOCK:
+            projects = self.data.get('projects', {})
+            return {p.get('idea_id') for p in projects.values() if p.get('stage') == ROLLED_BACK}
+
+    def _resumable(self, data: dict) -> bool:
+        if not self.max_age_hours:
+            return False
+        return time.time() - data.get('started_ts', 0) <= self.max_age_hours * 3600
+
+    def _read(self) -> dict:
+        if os.path.exists(self.journal_file):
+            try:
+                with open(self.journal_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.journal_file), exist_ok=True)
+        tmp_file = self.journal_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_file, self.journal_file)
+
+
+def load_journal(journal_file: Optional[str] = None) -> dict:
+    """The last journal written, for status output."""
+    return CycleJournal(journal_file)._read()
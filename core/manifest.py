@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Generated File Manifest
+
+Fast os.scandir walk of a generated project that honours .gitignore plus
+a built-in ignore list, recording each file's size and content hash, and
+the content-hash sync that lets regeneration touch only changed files.
+"""
+
+import fnmatch
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Never part of a generated app, whatever its .gitignore says
+BUILTIN_IGNORES = [
+    '.git/',
+    'node_modules/',
+    '__pycache__/',
+    '*.pyc',
+    '.DS_Store',
+]
+
+MANIFEST_HEADER = '# vibe-manifest v1: path<TAB>size<TAB>git blob id'
+
+
+class IgnoreRules:
+    """Compiled .gitignore-style patterns (dir/, *.ext, anchored, !negation)."""
+
+    def __init__(self, patterns: List[str]):
+        self.rules = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            negate = pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            self.rules.append((pattern.lstrip('/'), negate, dir_only, anchored))
+
+    @classmethod
+    def for_project(cls, root: str, builtin: bool = True) -> 'IgnoreRules':
+        """Built-in ignores plus the project's top-level .gitignore."""
+        patterns = list(BUILTIN_IGNORES) if builtin else []
+        path = os.path.join(root, '.gitignore')
+        if os.path.exists(path):
+            with open(path, 'r', errors='replace') as f:
+                patterns.extend(f.read().splitlines())
+        return cls(patterns)
+
+    def match(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether rel_path itself is ignored (parents are the caller's job)."""
+        ignored = False
+        name = rel_path.rsplit('/', 1)[-1]
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if fnmatch.fnmatchcase(rel_path if anchored else name, pattern):
+                ignored = not negate
+        return ignored
+
+    def is_ignored(self, rel_path: str) -> bool:
+        """Whether a file path is ignored, directly or through a parent."""
+        parts = rel_path.split('/')
+        for i in range(1, len(parts)):
+            if self.match('/'.join(parts[:i]), is_dir=True):
+                return True
+        return self.match(rel_path)
+
+
+@dataclass
+class ManifestEntry:
+    """One tracked file."""
+    path: str
+    size: int
+    hash: str
+
+
+def blob_hash(data: bytes) -> str:
+    """Git blob id of data, so git and the manifest share one hash."""
+    return hashlib.sha1(f"blob {len(data)}\0".encode('ascii') + data).hexdigest()
+
+
+class IncrementalHasher:
+    """Hashes files as they appear so the final manifest only stats them."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, rel_path: str) -> Optional[str]:
+        """Hash rel_path unless it is unchanged since the last call."""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._hashes.get(rel_path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+
+        try:
+            with open(full_path, 'rb') as f:
+                digest = blob_hash(f.read())
+        except OSError:
+            return None
+        with self._lock:
+            self._hashes[rel_path] = (st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+    def remember(self, rel_path: str, digest: str):
+        """Record a known hash for rel_path as it is on disk now."""
+        st = os.stat(os.path.join(self.root, rel_path))
+        with self._lock:
+            self._hashes[rel_path] = (st.st_size, st.st_mtime_ns, digest)
+
+
+class ManifestBuilder:
+    """Builds the manifest of a generated project."""
+
+    def __init__(self, root: str, rules: IgnoreRules = None):
+        self.root = root
+        self.rules = rules or IgnoreRules.for_project(root)
+
+    def build(self, hasher: IncrementalHasher = None) -> List[ManifestEntry]:
+        """Walk root with os.scandir, pruning ignored directories."""
+        hasher = hasher or IncrementalHasher(self.root)
+        entries = []
+        stack = ['']
+
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                scanned = list(os.scandir(os.path.join(self.root, rel_dir)))
+            except OSError:
+                continue
+            for entry in scanned:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.rules.match(rel_path, is_dir=True):
+                        stack.append(rel_path)
+                elif entry.is_file(follow_symlinks=False) and not self.rules.match(rel_path):
+                    digest = hasher.update(rel_path)
+                    if digest is not None:
+                        entries.append(ManifestEntry(rel_path, entry.stat(follow_symlinks=False).st_size, digest))
+
+        entries.sort(key=lambda e: e.path)
+        return entries
+
+
+def write_manifest(path: str, entries: List[ManifestEntry]):
+    """Write a compact tab-separated manifest."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(MANIFEST_HEADER + '\n')
+        for entry in entries:
+            f.write(f"{entry.path}\t{entry.size}\t{entry.hash}\n")
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str) -> List[ManifestEntry]:
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            rel_path, size, digest = line.rstrip('\n').split('\t')
+            entries.append(ManifestEntry(rel_path, int(size), digest))
+    return entries
+
+
+@dataclass
+class TreeDiff:
+    """What syncing a regenerated tree changed on disk."""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def summary(self) -> str:
+        return f"+{len(self.added)} ~{len(self.modified)} -{len(self.removed)} ({self.unchanged} unchanged)"
+
+    def to_dict(self) -> dict:
+        return {
+            'added': self.added,
+            'modified': self.modified,
+            'removed': self.removed,
+            'unchanged': self.unchanged,
+        }
+
+
+def sync_tree(staging_dir: str, dest_dir: str, planned: List[ManifestEntry],
+              previous: List[ManifestEntry] = None, hasher: IncrementalHasher = None) -> TreeDiff:
+    """Move planned files whose content differs from dest_dir into place.
+
+    Each changed file is renamed over its destination, so readers never see
+    a partial write and unchanged files keep their mtime. Files from the
+    previous manifest that are no longer planned are deleted; anything else
+    already in dest_dir is left alone. hasher (rooted at dest_dir) ends up
+    holding every planned file's hash.
+    """
+    hasher = hasher or IncrementalHasher(dest_dir)
+    diff = TreeDiff()
+    planned_paths = set()
+
+    for entry in planned:
+        planned_paths.add(entry.path)
+        dest = os.path.join(dest_dir, entry.path)
+        current = hasher.update(entry.path) if os.path.isfile(dest) else None
+        if current == entry.hash:
+            diff.unchanged += 1
+            continue
+
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(os.path.join(staging_dir, entry.path), dest)
+        hasher.remember(entry.path, entry.hash)
+        (diff.modified if current is not None else diff.added).append(entry.path)
+
+    for entry in previous or []:
+        if entry.path in planned_paths:
+            continue
+        dest = os.path.join(dest_dir, entry.path)
+        if os.path.isfile(dest):
+            os.unlink(dest)
+            diff.removed.append(entry.path)
+            _prune_empty_dirs(os.path.dirname(dest), dest_dir)
+
+    return diff
+
+
+def _prune_empty_dirs(path: str, root: str):
+    root = os.path.abspath(root)
+    path = os.path.abspath(path)
+    while path != root and path.startswith(root + os.sep):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
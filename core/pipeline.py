@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Cycle Pipeline
+
+Research, duplicate checking and generation as overlapped stages joined by
+bounded queues. Checks run ahead of generation on the next few ideas, and
+verified ideas the cycle did not get to are kept in a backlog for later
+cycles instead of being thrown away. Backlogged ideas are checked again
+when their turn comes, since new repos and projects may have appeared in
+the meantime; warm-ups re-rank them and drop those that became
+duplicates. With a shared idea queue, ideas go through it so workers
+never build the same idea.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from typing import Callable, Iterable, List, Tuple
+
+from core.events import DUPLICATE_CHECKED, IDEA_RANKED, emit
+from core.idea_queue import DUPLICATE, DONE, IdeaQueue
+from core.journal import CycleJournal
+from core.planner import Deadline, StageLatencies
+from core.research import AppIdea
+from core.shutdown import Shutdown
+
+
+# state/backlog.json is rewritten from worker threads
+_BACKLOG_LOCK = threading.Lock()
+
+
+class IdeaBacklog:
+    """Verified-unique ideas left over from earlier cycles, in state/backlog.json."""
+
+    def __init__(self, backlog_file: str = None, max_items: int = 50, max_age_hours: float = 168):
+        self.backlog_file = backlog_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'backlog.json')
+        self.max_items = max_items
+        self.max_age_hours = max_age_hours
+
+    @classmethod
+    def from_config(cls, config: dict, state_dir: str = None) -> 'IdeaBacklog':
+        pipeline_config = (config or {}).get('pipeline', {})
+        return cls(
+            backlog_file=os.path.join(state_dir, 'backlog.json') if state_dir else None,
+            max_items=pipeline_config.get('backlog_max', 50),
+            max_age_hours=pipeline_config.get('backlog_max_age_hours', 168)
+        )
+
+    def load(self) -> List[AppIdea]:
+        """Backlogged ideas young enough to retry, best-ranked (else oldest) first."""
+        with _BACKLOG_LOCK:
+            return [AppIdea(**entry['idea']) for entry in self._fresh(self._read())]
+
+    def update(self, add: Iterable[tuple] = (), remove: Iterable[str] = ()):
+        """Add (idea, check) pairs and drop ideas by id.
+
+        Re-adding an idea that is already backlogged keeps its backlogged_at,
+        so ideas re-checked every cycle still age out; the re-check time goes
+        to rechecked_at.
+        """
+        remove = set(remove)
+        now = time.time()
+        with _BACKLOG_LOCK:
+            entries = {e['idea']['id']: e for e in self._fresh(self._read()) if e['idea']['id'] not in remove}
+            for idea, check in add:
+                previous = entries.pop(idea.id, None)
+                entries[idea.id] = {
+                    'idea': asdict(idea),
+                    'similarity_score': check.similarity_score,
+                    'checked_at': check.checked_at,
+                    'backlogged_at': previous.get('backlogged_at', now) if previous else now,
+                    'rechecked_at': now
+                }
+            self._write(self._newest(list(entries.values())))
+
+    def rank(self, screen: Callable) -> Tuple[int, int]:
+        """Re-screen ideas with screen(title, description) -> (is_duplicate, score).
+
+        Ideas that have become duplicates are dropped and the rest ordered by
+        priority, least similar first. Returns (kept, dropped).
+        """
+        with _BACKLOG_LOCK:
+            entries = self._fresh(self._read())
+            kept = []
+            for entry in entries:
+                is_duplicate, score = screen(entry['idea']['title'], entry['idea']['description'])
+                if not is_duplicate:
+                    entry['similarity_score'] = score
+                    kept.append(entry)
+            kept.sort(key=lambda e: (-e['idea'].get('priority', 0.0), e['similarity_score']))
+            self._write(kept)
+        if len(kept) < len(entries):
+            print(f"📥 Dropped {len(entries) - len(kept)} backlogged idea(s) that are now duplicates")
+        return len(kept), len(entries) - len(kept)
+
+    def _newest(self, entries: List[dict]) -> List[dict]:
+        """At most max_items entries, dropping the oldest but keeping the order."""
+        if len(entries) <= self.max_items:
+            return entries
+        cutoff = sorted(e.get('backlogged_at', 0) for e in entries)[-self.max_items]
+        return [e for e in entries if e.get('backlogged_at', 0) >= cutoff][-self.max_items:]
+
+    def _fresh(self, entries: List[dict]) -> List[dict]:
+        cutoff = time.time() - self.max_age_hours * 3600
+        return [e for e in entries if e.get('backlogged_at', 0) >= cutoff]
+
+    def _read(self) -> List[dict]:
+        if os.path.exists(self.backlog_file):
+            try:
+                with open(self.backlog_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return []
+
+    def _write(self, entries: List[dict]):
+        os.makedirs(os.path.dirname(self.backlog_file), exist_ok=True)
+        tmp_file = self.backlog_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_file, self.backlog_file)
+
+
+class CyclePipeline:
+    """research -> duplicate check -> generation, overlapped.
+
+    At most `lookahead` ideas are checked but not yet taken by generation;
+    a slot frees up when a worker takes an idea or a check finds a duplicate.
+    Every stage stops at deadline, and stage durations go to latencies.
+    Research results and verdicts are checkpointed to journal, and reused
+    from it when the cycle is a resumed one. With idea_queue, researched
+    ideas are added to the shared queue and candidates are claimed from it
+    one at a time (up to run's max_ideas), so other workers' ideas are
+    picked up too. When shutdown
+    starts a drain, no further ideas are researched, checked or started and
+    running generations are cancelled once its grace period is up.
+    """
+
+    def __init__(self, research_agent, duplicate_checker, scheduler,
+                 backlog: IdeaBacklog = None, lookahead: int = 2,
+                 deadline: Deadline = None, latencies: StageLatencies = None,
+                 journal: CycleJournal = None, idea_queue: IdeaQueue = None,
+                 shutdown: Shutdown = None):
+        self.research_agent = research_agent
+        self.duplicate_checker = duplicate_checker
+        self.scheduler = scheduler
+        self.backlog = backlog
+        self.lookahead = max(1, lookahead)
+        self.deadline = deadline or Deadline()
+        self.latencies = latencies
+        self.journal = journal
+        self.idea_queue = idea_queue
+        self.shutdown = shutdown
+        self.stats = {'ideas_found': 0, 'ideas_processed': 0, 'duplicates_skipped': 0, 'backlogged': 0}
+        self._checks = {}
+        self._taken = {}
+
+    async def run(self, max_ideas: int) -> list:
+        """Run the stages until the scheduler's target is met or ideas run out."""
+        candidates = asyncio.Queue(maxsize=self.lookahead)
+        verified = asyncio.Queue()
+        slots = asyncio.Semaphore(self.lookahead)
+        speculative = deque()
+        taken = []
+
+        stages = [
+            asyncio.ensure_future(self._research_stage(candidates, max_ideas)),
+            asyncio.ensure_future(self._check_stage(candidates, verified, slots, speculative)),
+        ]
+
+        async def verified_ideas():
+            while True:
+                idea = await verified.get()
+                if idea is None or self._draining():
+                    return
+                slots.release()
+                # Past this point no other worker may build the idea
+                if self.idea_queue is not None and not await asyncio.to_thread(self.idea_queue.start, idea.id):
+                    print(f"⚠️  Lost the lease on {idea.title[:50]} to another worker, skipping")
+                    continue
+                taken.append(idea.id)
+                self._taken[idea.id] = idea
+                yield idea
+
+        async def stop_intake():
+            # Research and checks are cheap to redo; generations get the grace period
+            await self.shutdown.drained()
+            for stage in stages:
+                stage.cancel()
+            verified.put_nowait(None)
+
+        generation = asyncio.ensure_future(self.scheduler.run(verified_ideas(), deadline=self.deadline))
+        watchers = []
+        if self.shutdown is not None:
+            watchers = [asyncio.ensure_future(stop_intake()), asyncio.ensure_future(self.shutdown.grace_expired())]
+        try:
+            await asyncio.wait([generation, *watchers[1:]], timeout=self.deadline.remaining(),
+                               return_when=asyncio.FIRST_COMPLETED)
+            if generation.done():
+                results = generation.result()
+            else:
+                if self._draining():
+                    print("🛑 Grace period over, cancelled the generations still running")
+                else:
+                    print("⏰ Cycle budget used up, cancelled the generations still running")
+                generation.cancel()
+                await asyncio.gather(generation, return_exceptions=True)
+                results = self.scheduler.results
+        finally:
+            generation.cancel()
+            for task in stages + watchers:
+                task.cancel()
+            await asyncio.gather(generation, *stages, *watchers, return_exceptions=True)
+
+        # Keep the checks generation never got to
+        leftover = []
+        while not verified.empty():
+            idea = verified.get_nowait()
+            if idea is not None:
+                leftover.append(idea)
+        for idea, task in speculative:
+            if task.done() and not task.cancelled() and task.exception() is None and task.result():
+                leftover.append(idea)
+            else:
+                task.cancel()
+
+        # Everything checked this cycle is either built, a duplicate or re-added
+        if self.backlog is not None:
+            await asyncio.to_thread(
+                self.backlog.update,
+                [(idea, self._checks[idea.id]) for idea in leftover],
+                taken + list(self._checks)
+            )
+        self.stats['backlogged'] = len(leftover)
+        if leftover:
+            print(f"📥 Backlogged {len(leftover)} verified idea(s) for a later cycle")
+
+        if self.latencies is not None:
+            for result in results:
+                self.latencies.record('generate', result.duration_seconds)
+
+        return results
+
+    async def hand_back(self, idea_ids: Iterable[str]) -> int:
+        """Return ideas whose generation was cut off (and rolled back) for another try.
+
+        They go back to the shared queue and the backlog, so the next cycle
+        here or any other worker can build them. That includes ideas an
+        earlier, killed run of a resumed cycle took (the journal has them).
+        """
+        known = {idea.id: idea for idea in (self.journal.research_ideas() or [])} if self.journal is not None else {}
+        known.update(self._taken)
+        # Ideas claimed from the queue may have been researched by another worker
+        idea_ids = [i for i in idea_ids if i and (i in known or self.idea_queue is not None)]
+        if not idea_ids:
+            return 0
+        if self.idea_queue is not None:
+            for idea_id in idea_ids:
+                await asyncio.to_thread(self.idea_queue.release, idea_id)
+        if self.backlog is not None:
+            checks = [(known[i], self._checks.get(i) or (self.journal.verdict(i) if self.journal else None))
+                      for i in idea_ids if i in known]
+            await asyncio.to_thread(self.backlog.update, [(idea, check) for idea, check in checks if check])
+        print(f"↩️  Handed {len(idea_ids)} interrupted idea(s) back for a later cycle")
+        return len(idea_ids)
+
+    async def _research_stage(self, candidates: asyncio.Queue, max_ideas: int):
+        print("\n" + "="*60)
+        print("  Phase 1: Research")
+        print("="*60)
+        ideas = []
+        built = set()
+        try:
+            resumed = self.journal.research_ideas() if self.journal is not None else None
+            if resumed is not None:
+                print(f"♻️  Reusing {len(resumed)} idea(s) researched before the interruption")
+                ideas = resumed
+            else:
+                start = time.monotonic()
+                try:
+                    await asyncio.wait_for(self.research_agent.run_full_research(max_ideas), self.deadline.remaining())
+                    self._record('research', time.monotonic() - start)
+                except asyncio.TimeoutError:
+                    print("⏰ Research hit the cycle deadline")
+                ideas = self.research_agent.ideas[:max_ideas]
+                if self.journal is not None:
+                    await asyncio.to_thread(self.journal.record_research, ideas)
+            self.stats['ideas_found'] = len(ideas)
+            if not ideas:
+                print("⚠️  No ideas generated from research")
+
+            # Ideas verified in earlier cycles follow this cycle's fresh ones
+            if self.backlog is not None:
+                fresh_ids = {idea.id for idea in ideas}
+                backlogged = [idea for idea in await asyncio.to_thread(self.backlog.load) if idea.id not in fresh_ids]
+                if backlogged:
+                    print(f"📥 {len(backlogged)} backlogged idea(s) queued after this cycle's ideas")
+                ideas += backlogged
+
+            # A resumed cycle doesn't rebuild what it already built
+            built = self.journal.built_ideas() if self.journal is not None else set()
+            ideas = [idea for idea in ideas if idea.id not in built]
+            for rank, idea in enumerate(ideas, 1):
+                emit(IDEA_RANKED, rank=rank, idea_id=idea.id, title=idea.title, priority=idea.priority)
+            
+            if self.idea_queue is not None:
+                added = await asyncio.to_thread(self.idea_queue.enqueue, ideas)
+                print(f"📬 Added {added} new idea(s) to the shared idea queue")
+
+            print("\n" + "="*60)
+            print("  Phase 2: Duplicate Check & Generation")
+            print("="*60)
+            print(f"  Workers: {self.scheduler.workers}, target: {self.scheduler.apps_per_cycle} app(s), "
+                  f"checking up to {self.lookahead} idea(s) ahead")
+        except Exception as e:
+            print(f"⚠️  Research failed: {e}")
+
+        if self.idea_queue is None:
+            for idea in ideas:
+                await candidates.put(idea)
+        else:
+            await self._claim_ideas(candidates, built, max_ideas)
+        await candidates.put(None)
+
+    async def _claim_ideas(self, candidates: asyncio.Queue, built: set, max_ideas: int):
+        """Feed up to max_ideas candidates from the shared queue; at most one claimed idea waits for room."""
+        claimed = 0
+        while claimed < max_ideas:
+            try:
+                idea = await asyncio.to_thread(self.idea_queue.claim)
+            except Exception as e:
+                print(f"⚠️  Idea queue claim failed: {e}")
+                return
+            if idea is None:
+                return
+            if idea.id in built:
+                await asyncio.to_thread(self.idea_queue.finish, idea.id, DONE)
+                continue
+            claimed += 1
+            await candidates.put(idea)
+
+    async def _check_stage(self, candidates: asyncio.Queue, verified: asyncio.Queue,
+                           slots: asyncio.Semaphore, speculative: deque):
+        """Start checks as slots allow; pass unique ideas on in priority order."""
+        launched = asyncio.Event()
+        exhausted = False
+
+        async def launch():
+            nonlocal exhausted
+            while True:
+                idea = await candidates.get()
+                if idea is None:
+                    break
+                await slots.acquire()
+                speculative.append((idea, asyncio.ensure_future(self._check(idea))))
+                launched.set()
+            exhausted = True
+            launched.set()
+
+        launcher = asyncio.ensure_future(launch())
+        try:
+            while True:
+                if not speculative:
+                    if exhausted:
+                        break
+                    launched.clear()
+                    await launched.wait()
+                    continue
+                idea, task = speculative[0]
+                unique = await task
+                speculative.popleft()
+                if unique:
+                    verified.put_nowait(idea)
+                else:
+                    slots.release()
+            verified.put_nowait(None)
+        finally:
+            launcher.cancel()
+
+    async def _check(self, idea) -> bool:
+        """Duplicate-check one idea; True when it may be built."""
+        if self.deadline.expired():
+            return False
+        self.stats['ideas_processed'] += 1
+        print(f"\n📋 Processing idea: {idea.title[:50]}...")
+        check = self.journal.verdict(idea.id) if self.journal is not None else None
+        if check is not None:
+            print(f"♻️  Reusing duplicate-check verdict from before the interruption")
+            return await self._settle_verdict(idea, check)
+
+        start = time.monotonic()
+        try:
+            check = await asyncio.wait_for(
+                self.duplicate_checker.check_duplicate(
+                    idea_id=idea.id,
+                    idea_title=idea.title,
+                    idea_description=idea.description
+                ),
+                self.deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            print(f"⏰ Duplicate check hit the cycle deadline")
+            return False
+        except Exception as e:
+            print(f"⚠️  Duplicate check failed, skipping idea: {e}")
+            return False
+
+        self._record('check', time.monotonic() - start)
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.record_verdict, check)
+        return await self._settle_verdict(idea, check)
+
+    async def _settle_verdict(self, idea, check) -> bool:
+        unique = self._verdict(idea, check)
+        # Duplicates are settled for every worker; unique ideas stay leased until built.
+        # A duplicate of an idea another worker is still generating stays leased
+        # too: settle() queues it again when the cycle ends, and the next check
+        # sees whether that generation was built or failed.
+        if not unique and self.idea_queue is not None and not check.pending:
+            await asyncio.to_thread(self.idea_queue.finish, idea.id, DUPLICATE)
+        return unique
+
+    def _verdict(self, idea, check) -> bool:
+        self._checks[idea.id] = check
+        emit(DUPLICATE_CHECKED, idea_id=idea.id, title=idea.title, is_duplicate=check.is_duplicate,
+             similarity=check.similarity_score, matches=len(check.matching_projects))
+        if check.is_duplicate:
+            print(f"⚠️  Skipping duplicate idea")
+            self.stats['duplicates_skipped'] += 1
+            return False
+        return True
+
+    def _draining(self) -> bool:
+        return self.shutdown is not None and self.shutdown.requested
+
+    def _record(self, stage: str, seconds: float):
+        if self.latencies is not None:
+            self.latencies.record(stage, seconds)
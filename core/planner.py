@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Cycle Planner
+
+Sizes each cycle to a time budget using past stage latencies, and hands
+every stage a shared deadline so work is cancelled when the budget runs out.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Estimates used until a stage has history
+DEFAULT_ESTIMATES = {
+    'research': 120.0,
+    'check': 30.0,
+}
+
+# state/latencies.json is shared by every cycle in the process
+_LATENCY_LOCK = threading.Lock()
+
+
+class Deadline:
+    """A point on the monotonic clock every stage of a cycle works towards."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when there is no deadline."""
+        if self.at is None:
+            return None
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+    def clamp(self, seconds: Optional[float]) -> Optional[float]:
+        """The smaller of seconds and the time left (None means unbounded)."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        if seconds is None:
+            return remaining
+        return min(seconds, remaining)
+
+
+class StageLatencies:
+    """Recent per-stage durations, kept in state/latencies.json."""
+
+    def __init__(self, latency_file: str = None, max_samples: int = 50):
+        self.latency_file = latency_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'latencies.json')
+        self.max_samples = max_samples
+        self._pending: Dict[str, List[float]] = {}
+        self.samples = self._load()
+
+    def record(self, stage: str, seconds: float):
+        """Note a duration; save() persists everything recorded since the last save."""
+        with _LATENCY_LOCK:
+            self._pending.setdefault(stage, []).append(round(seconds, 3))
+            self.samples.setdefault(stage, []).append(round(seconds, 3))
+            self.samples[stage] = self.samples[stage][-self.max_samples:]
+
+    def estimate(self, stage: str, default: float, percentile: float = 90) -> float:
+        """Duration at the given percentile of recent samples."""
+        with _LATENCY_LOCK:
+            samples = sorted(self.samples.get(stage, []))
+        if not samples:
+            return default
+        index = min(len(samples) - 1, math.ceil(percentile / 100 * len(samples)) - 1)
+        return samples[max(0, index)]
+
+    def save(self):
+        """Merge this process's new samples into the file (other runs may have written it)."""
+        with _LATENCY_LOCK:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            samples = self._load()
+            for stage, values in pending.items():
+                samples[stage] = (samples.get(stage, []) + values)[-self.max_samples:]
+            os.makedirs(os.path.dirname(self.latency_file), exist_ok=True)
+            tmp_file = self.latency_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(samples, f, indent=2)
+            os.replace(tmp_file, self.latency_file)
+            self.samples = samples
+
+    def _load(self) -> Dict[str, List[float]]:
+        if os.path.exists(self.latency_file):
+            try:
+                with open(self.latency_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+
+@dataclass
+class CyclePlan:
+    """How much work a cycle takes on, and by when it must be done."""
+    budget_seconds: Optional[float]
+    reserve_seconds: float
+    ideas: int
+    apps: int
+    estimates: Dict[str, float] = field(default_factory=dict)
+
+    def deadlines(self):
+        """(work deadline, cycle deadline); the reserve is left for publishing and archiving."""
+        if not self.budget_seconds:
+            return Deadline(), Deadline()
+        return Deadline(max(1.0, self.budget_seconds - self.reserve_seconds)), Deadline(self.budget_seconds)
+
+    def summary(self) -> str:
+        if not self.budget_seconds:
+            budget = "no budget"
+        elif self.budget_seconds >= 120:
+            budget = f"{self.budget_seconds / 60:.0f} min budget"
+        else:
+            budget = f"{self.budget_seconds:.0f}s budget"
+        estimates = ', '.join(f"{stage} {seconds:.0f}s" for stage, seconds in self.estimates.items())
+        return f"{budget}: up to {self.ideas} idea(s), {self.apps} app(s) (estimates: {estimates})"
+
+    def to_dict(self) -> dict:
+        return {
+            'budget_seconds': self.budget_seconds,
+            'reserve_seconds': self.reserve_seconds,
+            'ideas': self.ideas,
+            'apps': self.apps,
+            'estimates': self.estimates,
+        }
+
+
+class CyclePlanner:
+    """Chooses how many ideas to research, check and generate within a budget."""
+
+    def __init__(self, latencies: StageLatencies, budget_seconds: Optional[float] = None,
+                 reserve_seconds: float = 600, percentile: float = 90, generate_default: float = 660):
+        self.latencies = latencies
+        self.budget_seconds = budget_seconds or None
+        self.reserve_seconds = reserve_seconds
+        self.percentile = percentile
+        self.generate_default = generate_default
+
+    @classmethod
+    def from_config(cls, config: dict, latencies: StageLatencies,
+                    budget_seconds: Optional[float] = None) -> 'CyclePlanner':
+        planner_config = config.get('planner', {})
+        wall_seconds = config.get('generator', {}).get('limits', {}).get('wall_seconds', 600)
+        return cls(
+            latencies,
+            budget_seconds=budget_seconds if budget_seconds is not None else planner_config.get('cycle_budget_seconds', 0),
+            reserve_seconds=planner_config.get('reserve_seconds', 600),
+            percentile=planner_config.get('percentile', 90),
+            # Before any history, assume a generation uses its whole wall-clock limit
+            generate_default=wall_seconds + 60
+        )
+
+    def plan(self, max_ideas: int, apps_per_cycle: int, workers: int = 1,
+             lookahead: int = 2, duplicate_rate: float = 0.0) -> CyclePlan:
+        estimates = {
+            'research': self.latencies.estimate('research', DEFAULT_ESTIMATES['research'], self.percentile),
+            'check': self.latencies.estimate('check', DEFAULT_ESTIMATES['check'], self.percentile),
+            'generate': self.latencies.estimate('generate', self.generate_default, self.percentile),
+        }
+
+        apps = apps_per_cycle
+        if self.budget_seconds:
+            # Research and the first check are on the critical path; later
+            # checks overlap generation, which runs in rounds of `workers`
+            available = self.budget_seconds - self.reserve_seconds - estimates['research'] - estimates['check']
+            rounds = int(available // max(1.0, estimates['generate'])) if available > 0 else 0
+            apps = min(apps_per_cycle, rounds * max(1, workers))
+
+        # Enough candidates to survive the usual share of duplicates, plus the look-ahead
+        hit_rate = max(0.1, 1.0 - duplicate_rate)
+        ideas = min(max_ideas, math.ceil(apps / hit_rate) + lookahead) if apps > 0 else 0
+
+        return CyclePlan(
+            budget_seconds=self.budget_seconds,
+            reserve_seconds=self.reserve_seconds if self.budget_seconds else 0,
+            ideas=ideas,
+            apps=apps,
+            estimates=estimates
+        )
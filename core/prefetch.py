@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Idle-Time Prefetch
+
+Research results, the GitHub repo catalog and the local project index are
+kept in a small cache (state/prefetch.json). Between scheduled cycles a
+warm-up refreshes it and re-ranks the idea backlog, so the next cycle
+starts hot and its critical path is mostly generation.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+# One cache per process, shared by warm-ups and cycles
+_cache: Optional['PrefetchCache'] = None
+_CACHE_LOCK = threading.Lock()
+
+
+class PrefetchCache:
+    """Values fetched ahead of time, with their age and hit rates."""
+
+    def __init__(self, cache_file: str = None, max_age_minutes: float = 30):
+        self.cache_file = cache_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'prefetch.json')
+        self.max_age_seconds = max_age_minutes * 60
+        self._lock = threading.Lock()
+        self._entries = None
+        # Not yet saved
+        self._dirty = set()
+        self._counts: Dict[str, list] = {}
+        self._warmups = []
+
+    def get(self, key: str, signature: str = None, newer_than: float = None):
+        """The cached value, or None when missing, too old or built for another signature.
+
+        newer_than (a time.time()) also rejects values fetched before it.
+        """
+        if not self.max_age_seconds:
+            return None
+        with self._lock:
+            entry = self._load_entries().get(key)
+            fresh = (
+                entry is not None
+                and entry.get('signature') == signature
+                and time.time() - entry.get('fetched_at', 0) <= self.max_age_seconds
+                and entry.get('fetched_at', 0) >= (newer_than or 0)
+            )
+            self._counts.setdefault(key, [0, 0])[0 if fresh else 1] += 1
+        return entry['value'] if fresh else None
+
+    def put(self, key: str, value, signature: str = None):
+        if not self.max_age_seconds:
+            return
+        with self._lock:
+            self._load_entries()[key] = {'value': value, 'signature': signature, 'fetched_at': time.time()}
+            self._dirty.add(key)
+
+    def record_warmup(self, seconds: float, steps: Dict[str, float]):
+        with self._lock:
+            self._warmups.append({
+                'at': datetime.utcnow().isoformat(),
+                'seconds': round(seconds, 3),
+                'steps': steps
+            })
+
+    def save(self):
+        """Merge new values, hit counts and warm-ups into the file (other runs may have written it)."""
+        with self._lock:
+            if not (self._dirty or self._counts or self._warmups):
+                return
+            data = load_prefetch(self.cache_file)
+            entries = data.setdefault('entries', {})
+            for key in self._dirty:
+                entries[key] = self._entries[key]
+            stats = data.setdefault('stats', {})
+            for key, (hits, misses) in self._counts.items():
+                counts = stats.setdefault(key, {'hits': 0, 'misses': 0})
+                counts['hits'] += hits
+                counts['misses'] += misses
+            data['warmups'] = (data.get('warmups', []) + self._warmups)[-20:]
+            self._dirty, self._counts, self._warmups = set(), {}, []
+
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+
+    def _load_entries(self) -> dict:
+        if self._entries is None:
+            self._entries = load_prefetch(self.cache_file).get('entries', {})
+        return self._entries
+
+
+def get_cache(config: dict = None) -> PrefetchCache:
+    """Process-wide prefetch cache; prefetch.max_age_minutes of 0 disables it."""
+    global _cache
+    prefetch_config = (config or {}).get('prefetch', {})
+    with _CACHE_LOCK:
+        if _cache is None:
+            _cache = PrefetchCache()
+        _cache.max_age_seconds = prefetch_config.get('max_age_minutes', 30) * 60
+        return _cache
+
+
+def load_prefetch(cache_file: Optional[str] = None) -> dict:
+    """The saved cache, stats and recent warm-ups."""
+    cache_file = cache_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'prefetch.json')
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+async def warm_up(research_agent, duplicate_checker, backlog=None, dependencies=None) -> Dict[str, float]:
+    """Refresh research, the repo catalog and the local index, then re-rank the backlog.
+
+    dependencies, when given, is a blocking callable that resolves template
+    dependencies; it runs in a worker thread alongside the rest. Returns
+    each step's duration in seconds.
+    """
+    print("\n🔥 Warming caches for the next cycle...")
+    start = time.monotonic()
+    steps = dict.fromkeys(('research', 'repo_catalog', 'local_index'), 0.0)
+
+    async def timed(name, awaitable):
+        step_start = time.monotonic()
+        try:
+            await awaitable
+        except Exception as e:
+            print(f"⚠️  Warm-up step {name} failed: {e}")
+        steps[name] = round(time.monotonic() - step_start, 3)
+
+    steps_run = [
+        timed('research', research_agent.research_sources(refresh=True)),
+        timed('repo_catalog', duplicate_checker.fetch_repo_catalog(refresh=True)),
+        timed('local_index', asyncio.to_thread(duplicate_checker.local_index, True))
+    ]
+    if dependencies is not None:
+        steps_run.append(timed('dependencies', asyncio.to_thread(dependencies)))
+    await asyncio.gather(*steps_run)
+    # Ranking screens against the catalog and index just fetched
+    if backlog is not None:
+        await timed('backlog', asyncio.to_thread(backlog.rank, duplicate_checker.screen))
+
+    seconds = time.monotonic() - start
+    cache = duplicate_checker.cache
+    if cache is not None:
+        cache.record_warmup(seconds, steps)
+        await asyncio.to_thread(cache.save)
+    print(f"🔥 Warm-up done in {seconds:.1f}s ({', '.join(f'{k} {v:.1f}s' for k, v in steps.items())})")
+    return steps
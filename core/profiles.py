@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Profiles
+
+One process can generate for several profiles: GitHub accounts or
+configs, each being config.yaml with its own overrides merged in. Every
+profile has its own projects/, state/ and logs/, so duplicate checks,
+journals, queues and publishing stay separate. Research, the AI output
+cache, template bundles and the dependency store live in the default
+profile's projects/ and are shared.
+"""
+
+import copy
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.config import get_config
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+DEFAULT_PROFILE = 'default'
+
+_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+@dataclass
+class Profile:
+    """Settings and directories of one profile."""
+    name: str
+    config: dict
+    projects_dir: str
+    state_dir: str
+    logs_dir: str
+    # Caches and stores every profile shares
+    shared_dir: str
+
+    def state_path(self, *parts: str) -> str:
+        return os.path.join(self.state_dir, *parts)
+
+    @property
+    def github_user(self) -> str:
+        return self.config.get('duplicate_check', {}).get('github_user', 'vkumar-dev')
+
+
+def load_profiles(config: dict) -> List[Profile]:
+    """The default profile (config.yaml as is), then each one under `profiles:`."""
+    base = {k: v for k, v in (config or {}).items() if k != 'profiles'}
+    default = _profile(DEFAULT_PROFILE, base, base.get('storage', {}))
+    profiles = [default]
+
+    for entry in (config or {}).get('profiles') or []:
+        name = str(entry.get('name', ''))
+        if not _NAME_PATTERN.match(name) or name == DEFAULT_PROFILE:
+            raise ValueError(f"Invalid profile name: {name!r}")
+        if any(p.name == name for p in profiles):
+            raise ValueError(f"Duplicate profile name: {name!r}")
+
+        overrides = {}
+        if entry.get('config'):
+            path = _resolve(entry['config'])
+            if not os.path.exists(path):
+                raise ValueError(f"Profile {name}: {entry['config']} not found")
+            overrides = get_config(path).get()
+        overrides = merge_config(overrides, entry.get('settings') or {})
+
+        # Unless overridden, a profile keeps its files under profiles/<name>/
+        storage = {
+            'projects_dir': os.path.join('profiles', name, 'projects'),
+            'state_dir': os.path.join('profiles', name, 'state'),
+            'logs_dir': os.path.join('profiles', name, 'logs'),
+        }
+        storage.update(overrides.get('storage', {}))
+        profile_config = merge_config(base, overrides)
+        profile_config['storage'] = {**profile_config.get('storage', {}), **storage}
+        profiles.append(_profile(name, profile_config, storage, shared_dir=default.shared_dir))
+
+    return profiles
+
+
+def get_profile(config: dict, name: Optional[str] = None) -> Profile:
+    """A profile by name (the default profile when name is None)."""
+    name = name or DEFAULT_PROFILE
+    for profile in load_profiles(config):
+        if profile.name == name:
+            return profile
+    raise ValueError(f"Unknown profile: {name!r}")
+
+
+def merge_config(base: dict, overrides: dict) -> dict:
+    """base with overrides merged in, section by section (lists are replaced)."""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def gh_env(config: dict) -> Optional[dict]:
+    """Environment for `gh` and git pushes as the profile's account.
+
+    publish.gh_token_env names the variable holding its token; without one
+    the account `gh` is logged in as is used.
+    """
+    token_env = (config or {}).get('publish', {}).get('gh_token_env')
+    if not token_env:
+        return None
+    token = os.environ.get(token_env)
+    if not token:
+        raise ValueError(f"publish.gh_token_env is {token_env}, but {token_env} is not set")
+    return {**os.environ, 'GH_TOKEN': token}
+
+
+def _profile(name: str, config: dict, storage: dict, shared_dir: str = None) -> Profile:
+    projects_dir = _resolve(storage.get('projects_dir', 'projects'))
+    return Profile(
+        name=name,
+        config=config,
+        projects_dir=projects_dir,
+        state_dir=_resolve(storage.get('state_dir', 'state')),
+        logs_dir=_resolve(storage.get('logs_dir', 'logs')),
+        shared_dir=shared_dir or projects_dir
+    )
+
+
+def _resolve(path: str) -> str:
+    """Relative paths are from the repo root."""
+    return os.path.normpath(os.path.join(ROOT_DIR, path))
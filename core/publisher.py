@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - GitHub Publisher
+
+Durable on-disk outbox of publish jobs, drained by a background asyncio
+task that retries with exponential backoff and records confirmed repo URLs.
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.aio import run_command
+from core.events import APP_PUBLISHED, emit
+from core.profiles import gh_env
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Shared by every outbox in the process so job claims never race
+_OUTBOX_LOCK = threading.Lock()
+# One wakeup per outbox directory: an enqueue through any PublishOutbox for
+# it wakes that outbox's worker, and no other profile's
+_OUTBOX_WAKEUPS: Dict[str, threading.Event] = {}
+
+
+@dataclass
+class PublishJob:
+    """One repository to create, push and tag on GitHub."""
+    job_id: str
+    app_name: str
+    app_path: str
+    repo_name: str
+    visibility: str = 'public'
+    topics: List[str] = field(default_factory=list)
+    description: str = ''
+    status: str = QUEUED
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    pushed: bool = False
+    repo_url: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    finished_at: Optional[str] = None
+
+
+class PublishOutbox:
+    """Publish jobs stored one JSON file each under state/outbox/."""
+
+    def __init__(self, outbox_dir: str = None, published_file: str = None):
+        state_dir = os.path.join(os.path.dirname(__file__), '..', 'state')
+        self.outbox_dir = outbox_dir or os.path.join(state_dir, 'outbox')
+        self.published_file = published_file or os.path.join(state_dir, 'published.json')
+        self._lock = _OUTBOX_LOCK
+        with _OUTBOX_LOCK:
+            self.wakeup = _OUTBOX_WAKEUPS.setdefault(os.path.realpath(self.outbox_dir), threading.Event())
+        os.makedirs(self.outbox_dir, exist_ok=True)
+
+    def enqueue(self, app_name: str, app_path: str, repo_name: str, visibility: str = 'public',
+                topics: List[str] = None, description: str = '') -> PublishJob:
+        """Add a publish job, coalescing with a pending job for the same repo."""
+        with self._lock:
+            for job in self._load_all():
+                if job.repo_name == repo_name and job.status in (QUEUED, RUNNING):
+                    # Later metadata wins; topics accumulate
+                    job.app_path = app_path
+                    job.visibility = visibility
+                    job.topics = sorted(set(job.topics) | set(topics or []))
+                    job.description = description or job.description
+                    self._save(job)
+                    self.wakeup.set()
+                    return job
+
+            job = PublishJob(
+                job_id=f"pub-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{random.randrange(16 ** 6):06x}",
+                app_name=app_name,
+                app_path=app_path,
+                repo_name=repo_name,
+                visibility=visibility,
+                topics=sorted(set(topics or [])),
+                description=description
+            )
+            self._save(job)
+
+        self.wakeup.set()
+        return job
+
+    def jobs(self, status: str = None) -> List[PublishJob]:
+        with self._lock:
+            jobs = self._load_all()
+        return [j for j in jobs if status is None or j.status == status]
+
+    def claim_due(self, now: float = None) -> Optional[PublishJob]:
+        """Mark the next due queued job as running and return it."""
+        now = now or time.time()
+        with self._lock:
+            due = [j for j in self._load_all() if j.status == QUEUED and j.next_attempt_at <= now]
+            if not due:
+                return None
+            job = min(due, key=lambda j: j.next_attempt_at)
+            job.status = RUNNING
+            self._save(job)
+            return job
+
+    def next_due_in(self, now: float = None) -> Optional[float]:
+        """Seconds until the next queued job is due, or None if there is none."""
+        now = now or time.time()
+        queued = self.jobs(QUEUED)
+        if not queued:
+            return None
+        return max(0.0, min(j.next_attempt_at for j in queued) - now)
+
+    def update(self, job: PublishJob):
+        with self._lock:
+            self._save(job)
+
+    def remove(self, job: PublishJob):
+        with self._lock:
+            path = os.path.join(self.outbox_dir, f"{job.job_id}.json")
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def recover(self):
+        """Requeue jobs left running by a process that died mid-publish."""
+        with self._lock:
+            for job in self._load_all():
+                if job.status == RUNNING:
+                    job.status = QUEUED
+                    self._save(job)
+
+    def record_published(self, job: PublishJob):
+        """Record a confirmed repo URL in state/published.json."""
+        with self._lock:
+            published = load_published(self.published_file)
+            published[job.app_name] = {
+                'repo': job.repo_name,
+                'url': job.repo_url,
+                'published_at': job.finished_at,
+            }
+            tmp_file = self.published_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(published, f, indent=2)
+            os.replace(tmp_file, self.published_file)
+
+    def _load_all(self) -> List[PublishJob]:
+        jobs = []
+        for name in sorted(os.listdir(self.outbox_dir)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.outbox_dir, name), 'r') as f:
+                    jobs.append(PublishJob(**json.load(f)))
+            except Exception:
+                continue
+        return jobs
+
+    def _save(self, job: PublishJob):
+        path = os.path.join(self.outbox_dir, f"{job.job_id}.json")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(job), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class PublishWorker:
+    """Background task that drains the outbox with `gh`.
+
+    Outbox reads and writes (locked, fsynced) run in worker threads; `gh`
+    and git run as asyncio subprocesses.
+    """
+
+    def __init__(self, outbox: PublishOutbox, config: dict = None):
+        self.outbox = outbox
+        self.configure(config)
+        self._stop = threading.Event()
+        self._drain_on_stop = False
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, config: dict = None):
+        """Apply publish.* settings (again, when config.yaml changes)."""
+        publish_config = (config or {}).get('publish', {})
+        self.gh = os.environ.get('VIBE_GH') or publish_config.get('gh_path', 'gh')
+        self.max_attempts = publish_config.get('max_attempts', 6)
+        self.backoff_base = publish_config.get('backoff_seconds', 30)
+        self.backoff_max = publish_config.get('backoff_max_seconds', 3600)
+        self.timeout = publish_config.get('timeout_seconds', 120)
+        # The profile's own account, when it has a token of its own
+        self.env = gh_env(config)
+
+    def start(self):
+        """Start draining as a task on the running event loop."""
+        if self._task and not self._task.done():
+            return
+        self.outbox.recover()
+        self._stop.clear()
+        self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self, timeout: float = None, drain: bool = False):
+        """Stop the worker; with drain, publish every due job first.
+
+        A job still running at timeout is cancelled; it stays in the outbox
+        and the next start() requeues it.
+        """
+        self._drain_on_stop = drain
+        self._stop.set()
+        self.outbox.wakeup.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, timeout: float) -> int:
+        """Publish due jobs in the foreground until none are due or timeout; returns jobs run."""
+        await asyncio.to_thread(self.outbox.recover)
+        deadline = time.time() + timeout
+        ran = 0
+        while time.time() < deadline:
+            job = await asyncio.to_thread(self.outbox.claim_due)
+            if job is None:
+                break
+            await self.process(job)
+            ran += 1
+        return ran
+
+    async def process(self, job: PublishJob):
+        """Run one publish attempt and reschedule it on failure."""
+        job.attempts += 1
+        print(f"🚀 Publishing {job.repo_name} (attempt {job.attempts})...")
+
+        try:
+            if not job.pushed:
+                await self._create_and_push(job)
+                job.pushed = True
+                # Persist progress so a retry doesn't recreate the repo
+                await asyncio.to_thread(self.outbox.update, job)
+            await self._apply_metadata(job)
+            job.repo_url = job.repo_url or await self._repo_url(job)
+
+            job.status = DONE
+            job.last_error = None
+            job.finished_at = datetime.utcnow().isoformat()
+            await asyncio.to_thread(self.outbox.record_published, job)
+            # published.json is the record from here on
+            await asyncio.to_thread(self.outbox.remove, job)
+            print(f"✅ Published {job.repo_url}")
+            emit(APP_PUBLISHED, app_name=job.app_name, repo_name=job.repo_name, repo_url=job.repo_url,
+                 attempts=job.attempts)
+        except Exception as e:
+            job.last_error = str(e)
+            if job.attempts >= self.max_attempts:
+                job.status = FAILED
+                job.finished_at = datetime.utcnow().isoformat()
+                print(f"❌ Giving up on {job.repo_name}: {e}")
+            else:
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (job.attempts - 1)))
+                delay *= random.uniform(0.8, 1.2)
+                job.status = QUEUED
+                job.next_attempt_at = time.time() + delay
+                print(f"⚠️  Publish of {job.repo_name} failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.to_thread(self.outbox.update, job)
+
+    async def _loop(self):
+        while True:
+            if self._stop.is_set() and not self._drain_on_stop:
+                break
+            job = await asyncio.to_thread(self.outbox.claim_due)
+            if job is not None:
+                await self.process(job)
+                continue
+            if self._stop.is_set():
+                break
+            wait = await asyncio.to_thread(self.outbox.next_due_in)
+            self.outbox.wakeup.clear()
+            # Enqueues come from worker threads, so wait on the outbox's event in one
+            try:
+                await asyncio.to_thread(self.outbox.wakeup.wait, 60 if wait is None else min(wait, 60))
+            except asyncio.CancelledError:
+                # Release the waiting thread so loop shutdown isn't held up
+                self.outbox.wakeup.set()
+                raise
+
+    async def _create_and_push(self, job: PublishJob):
+        args = ["repo", "create", job.repo_name, f"--{job.visibility}", "--source", job.app_path, "--push"]
+        if job.description:
+            args += ["--description", job.description]
+        result = await self._gh(args, cwd=job.app_path)
+        if result.returncode == 0:
+            job.repo_url = _find_url(result.stdout)
+            return
+
+        # A previous attempt may have created the repo before the push failed
+        if 'already exists' not in (result.stderr + result.stdout):
+            raise RuntimeError(f"gh repo create failed: {result.stderr.strip() or result.stdout.strip()}")
+
+        job.repo_url = await self._repo_url(job)
+        remote_url = job.repo_url + ".git"
+        # gh may have added origin before the push failed
+        existing = await run_command(["git", "remote", "get-url", "origin"], cwd=job.app_path)
+        action = "set-url" if existing.returncode == 0 else "add"
+        remote = await run_command(["git", "remote", action, "origin", remote_url], cwd=job.app_path)
+        if remote.returncode != 0:
+            raise RuntimeError(f"git remote {action} failed: {remote.stderr.strip()}")
+        push = await run_command(["git", "push", "-u", "origin", "HEAD"], cwd=job.app_path,
+                                 env=self.env, timeout=self.timeout)
+        if push.returncode != 0:
+            raise RuntimeError(f"git push failed: {push.stderr.strip()}")
+
+    async def _apply_metadata(self, job: PublishJob):
+        """One coalesced `gh repo edit` for all pending topics."""
+        if not job.topics:
+            return
+        args = ["repo", "edit", job.repo_name]
+        for topic in job.topics:
+            args += ["--add-topic", topic]
+        result = await self._gh(args)
+        if result.returncode != 0:
+            raise RuntimeError(f"gh repo edit failed: {result.stderr.strip()}")
+
+    async def _repo_url(self, job: PublishJob) -> str:
+        result = await self._gh(["repo", "view", job.repo_name, "--json", "url", "-q", ".url"])
+        url = _find_url(result.stdout)
+        if result.returncode != 0 or not url:
+            raise RuntimeError(f"gh repo view failed: {result.stderr.strip()}")
+        return url
+
+    async def _gh(self, args: List[str], cwd: str = None) -> subprocess.CompletedProcess:
+        return await run_command([self.gh] + args, cwd=cwd, env=self.env, timeout=self.timeout)
+
+
+def _find_url(output: str) -> Optional[str]:
+    for line in reversed(output.strip().splitlines()):
+        line = line.strip()
+        if line.startswith('https://'):
+            return line
+    return None
+
+
+def load_published(published_file: str = None) -> Dict[str, dict]:
+    """Confirmed publishes keyed by app name."""
+    published_file = published_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'published.json')
+    if os.path.exists(published_file):
+        try:
+            with open(published_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
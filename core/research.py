@@ -5,14 +5,37 @@ Vibe Coder - Research Agent
 Researches trending topics and generates app ideas.
 """
 
+import asyncio
 import json
 import os
-import subprocess
 import sys
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import List, Optional
-import yaml
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from core.aio import fetch_json, http_session, run_command
+from core.config import load_config
+from core.events import TREND_FOUND, emit
+from core.prefetch import PrefetchCache
+
+HN_API = "https://hacker-news.firebaseio.com/v0"
+
+# Where trends were saved before storage.state_dir was honoured; still read
+# until the first research run writes the state directory's copy
+LEGACY_TRENDS_FILE = os.path.join(os.path.dirname(__file__), 'state', 'trends.json')
+
+# Per source, so agents of several profiles fetch it once between them
+_SOURCE_LOCKS: Dict[str, tuple] = {}
+
+
+def _source_lock(source: str) -> asyncio.Lock:
+    """The running loop's lock for a research source."""
+    loop = asyncio.get_running_loop()
+    entry = _SOURCE_LOCKS.get(source)
+    if entry is None or entry[0] is not loop:
+        entry = _SOURCE_LOCKS[source] = (loop, asyncio.Lock())
+    return entry[1]
 
 
 @dataclass
@@ -46,34 +69,40 @@ class AppIdea:
 class ResearchAgent:
     """Researches trends and generates app ideas."""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = "config.yaml", cache: Optional[PrefetchCache] = None,
+                 config: Optional[dict] = None):
+        # config_path is relative to the repo root
+        self.config = config if config is not None else load_config(config_path)
+        self.state_dir = self.config.get('storage', {}).get('state_dir', 'state')
+        if not os.path.isabs(self.state_dir):
+            self.state_dir = os.path.join(os.path.dirname(__file__), '..', self.state_dir)
+        self.trends_file = os.path.join(self.state_dir, self.config.get('storage', {}).get('trends_file', 'trends.json'))
         self.trends: List[Trend] = []
         self.ideas: List[AppIdea] = []
-        
-    def _load_config(self, config_path: str) -> dict:
-        """Load configuration from YAML file."""
-        config_file = os.path.join(os.path.dirname(__file__), config_path)
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
-        return {}
+        # Source results fetched ahead of the cycle by the idle-time warm-up
+        self.cache = cache
+    
+    @property
+    def sources(self) -> List[str]:
+        """Sources to research, from research.sources."""
+        return self.config.get('research', {}).get('sources', ['github_trending', 'hacker_news'])
+    
+    async def research_github_trending(self, refresh: bool = False) -> List[Trend]:
+        """Fetch trending repositories from GitHub (refresh skips the prefetch cache)."""
+        return await self._research('github_trending', self._fetch_github_trending, refresh)
     
-    def research_github_trending(self) -> List[Trend]:
-        """Fetch trending repositories from GitHub."""
+    async def _fetch_github_trending(self) -> List[Trend]:
         print("🔍 Researching GitHub trending...")
         trends = []
         
         try:
             # Use gh CLI to get trending repos
-            result = subprocess.run(
+            result = await run_command(
                 ["gh", "search", "repos", 
                  "--sort", "stars", 
                  "--order", "desc",
                  "--limit", "20",
                  "--json", "name,description,url,createdAt,primaryLanguage,nameWithOwner"],
-                capture_output=True,
-                text=True,
                 timeout=30
             )
             
@@ -90,13 +119,13 @@ class ResearchAgent:
                         tags=[repo.get('primaryLanguage', {}).get('name', 'unknown')] if repo.get('primaryLanguage') else []
                     )
                     trends.append(trend)
+                self._cache_trends('github_trending', trends)
         except Exception as e:
             print(f"⚠️  GitHub trending error: {e}")
         
-        self.trends.extend(trends)
         return trends
     
-    def research_product_hunt(self) -> List[Trend]:
+    async def research_product_hunt(self) -> List[Trend]:
         """Research Product Hunt for trending products."""
         print("🔍 Researching Product Hunt...")
         trends = []
@@ -104,12 +133,10 @@ class ResearchAgent:
         try:
             # Use web search via gh or direct API if available
             # For now, use a placeholder pattern
-            result = subprocess.run(
+            result = await run_command(
                 ["gh", "api", "/search/issues",
                  "-q", "product hunt launch",
                  "--limit", "10"],
-                capture_output=True,
-                text=True,
                 timeout=30
             )
             
@@ -121,47 +148,86 @@ class ResearchAgent:
         
         return trends
     
-    def research_hacker_news(self) -> List[Trend]:
-        """Research Hacker News for trending topics."""
+    async def research_hacker_news(self, refresh: bool = False) -> List[Trend]:
+        """Research Hacker News for trending topics (refresh skips the prefetch cache)."""
+        return await self._research('hacker_news', self._fetch_hacker_news, refresh)
+    
+    async def _fetch_hacker_news(self) -> List[Trend]:
         print("🔍 Researching Hacker News...")
         trends = []
         
         try:
-            # Fetch HN stories via API
-            import urllib.request
-            import json as json_lib
-            
-            # Get top stories
-            url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-            with urllib.request.urlopen(url, timeout=10) as response:
-                top_ids = json_lib.loads(response.read())[:20]
+            async with http_session() as session:
+                # Get top stories
+                top_ids = (await fetch_json(f"{HN_API}/topstories.json", timeout=10, session=session))[:20]
+                
+                # Fetch story details concurrently
+                story_ids = top_ids[:10]
+                stories = await asyncio.gather(
+                    *(fetch_json(f"{HN_API}/item/{story_id}.json", timeout=10, session=session)
+                      for story_id in story_ids),
+                    return_exceptions=True
+                )
             
-            # Fetch story details
-            for story_id in top_ids[:10]:
-                try:
-                    story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                    with urllib.request.urlopen(story_url, timeout=10) as response:
-                        story = json_lib.loads(response.read())
-                    
-                    if story and story.get('title'):
-                        trend = Trend(
-                            id=f"hn-{story_id}",
-                            source="hacker_news",
-                            title=story['title'],
-                            description=story.get('text', '')[:200] if story.get('text') else '',
-                            url=story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                            score=min(10.0, story.get('score', 0) / 100),
-                            tags=["hacker_news"]
-                        )
-                        trends.append(trend)
-                except Exception:
+            for story_id, story in zip(story_ids, stories):
+                if isinstance(story, Exception):
                     continue
+                if story and story.get('title'):
+                    trend = Trend(
+                        id=f"hn-{story_id}",
+                        source="hacker_news",
+                        title=story['title'],
+                        description=story.get('text', '')[:200] if story.get('text') else '',
+                        url=story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
+                        score=min(10.0, story.get('score', 0) / 100),
+                        tags=["hacker_news"]
+                    )
+                    trends.append(trend)
+            if trends:
+                self._cache_trends('hacker_news', trends)
         except Exception as e:
             print(f"⚠️  Hacker News research error: {e}")
         
+        return trends
+    
+    async def research_sources(self, refresh: bool = False) -> List[Trend]:
+        """Research every source in research.sources concurrently."""
+        research = {
+            'github_trending': self.research_github_trending,
+            'hacker_news': self.research_hacker_news,
+        }
+        found = await asyncio.gather(*(research[s](refresh) for s in self.sources if s in research))
+        return [trend for trends in found for trend in trends]
+    
+    async def _research(self, source: str, fetch: Callable[[], Awaitable[List[Trend]]],
+                        refresh: bool) -> List[Trend]:
+        """Trends of a source, fetched at most once at a time per process.
+        
+        An agent waiting on another's fetch (another profile's cycle or
+        warm-up) uses its result, even when refreshing.
+        """
+        requested_at = time.time()
+        async with _source_lock(source):
+            trends = self._cached_trends(source, requested_at if refresh else None)
+            if trends is None:
+                trends = await fetch()
         self.trends.extend(trends)
         return trends
     
+    def _cached_trends(self, source: str, newer_than: Optional[float] = None) -> Optional[List[Trend]]:
+        """Prefetched trends for a source (only ones fetched after newer_than, if given)."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(f"research:{source}", newer_than=newer_than)
+        if cached is None:
+            return None
+        print(f"🔍 {source}: using {len(cached)} prefetched trend(s)")
+        return [Trend(**t) for t in cached]
+    
+    def _cache_trends(self, source: str, trends: List[Trend]):
+        if self.cache is not None:
+            self.cache.put(f"research:{source}", [asdict(t) for t in trends])
+    
     def generate_app_ideas(self, max_ideas: int = 5) -> List[AppIdea]:
         """Generate app ideas from researched trends."""
         print(f"💡 Generating app ideas from {len(self.trends)} trends...")
@@ -249,21 +315,23 @@ class ResearchAgent:
             ai_capabilities=[]
         )
     
-    def run_full_research(self) -> dict:
+    async def run_full_research(self, max_ideas: int = 5) -> dict:
         """Run complete research cycle."""
         print("\n" + "="*60)
         print("  🔬 VIBE CODER - Research Phase")
         print("="*60)
         
-        # Run all research sources
-        self.research_github_trending()
-        self.research_hacker_news()
+        # Run the configured sources at once, keeping their trends in a fixed order
+        before = len(self.trends)
+        self.trends[before:] = await self.research_sources()
+        for trend in self.trends[before:]:
+            emit(TREND_FOUND, id=trend.id, source=trend.source, title=trend.title, score=trend.score)
         
         # Generate ideas
-        ideas = self.generate_app_ideas()
+        ideas = self.generate_app_ideas(max_ideas)
         
         # Save trends to file
-        self._save_trends()
+        await asyncio.to_thread(self._save_trends)
         
         print(f"\n✅ Research complete:")
         print(f"   Trends found: {len(self.trends)}")
@@ -277,10 +345,9 @@ class ResearchAgent:
     
     def _save_trends(self):
         """Save trends to state file."""
-        state_dir = os.path.join(os.path.dirname(__file__), 'state')
-        os.makedirs(state_dir, exist_ok=True)
+        os.makedirs(self.state_dir, exist_ok=True)
         
-        trends_file = os.path.join(state_dir, 'trends.json')
+        trends_file = self.trends_file
         data = {
             'updated_at': datetime.utcnow().isoformat(),
             'trends': [
@@ -298,19 +365,18 @@ class ResearchAgent:
             json.dump(data, f, indent=2)
     
     def load_trends(self) -> List[Trend]:
-        """Load trends from state file."""
-        state_dir = os.path.join(os.path.dirname(__file__), 'state')
-        trends_file = os.path.join(state_dir, 'trends.json')
-        
-        if os.path.exists(trends_file):
-            with open(trends_file, 'r') as f:
-                data = json.load(f)
-                return [Trend(**t) for t in data.get('trends', [])]
+        """Load trends from state file (or core/state/trends.json, where earlier versions kept them)."""
+        for trends_file in (self.trends_file, LEGACY_TRENDS_FILE):
+            if os.path.exists(trends_file):
+                with open(trends_file, 'r') as f:
+                    data = json.load(f)
+                    # Only id, source, title and score are saved
+                    return [Trend(**{'description': '', 'url': '', **t}) for t in data.get('trends', [])]
         
         return []
 
 
 if __name__ == "__main__":
     agent = ResearchAgent()
-    result = agent.run_full_research()
+    result = asyncio.run(agent.run_full_research())
     print(f"\nResult: {result}")
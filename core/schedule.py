@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Cycle Schedule
+
+When cycles run: cron expressions or fixed-rate intervals anchored to the
+wall clock in the configured timezone, so a cycle's duration never pushes
+later runs back. Missed runs are caught up per policy, starts get random
+jitter, and a lock keeps two cycles from running at once.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from datetime import time as day_time
+from datetime import timezone as fixed_timezone
+from typing import Awaitable, Callable, List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9: schedule in UTC
+    ZoneInfo = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock only guards cycles within one process
+    fcntl = None
+
+from core.shutdown import Shutdown
+
+
+CATCH_UP_POLICIES = ('once', 'all', 'skip')
+
+CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+
+# (low, high) of minute, hour, day of month, month, day of week
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Sleep in short steps so clock changes and suspends don't throw the schedule off
+_SLEEP_STEP_SECONDS = 60
+
+# One in-process lock per lock file, so each profile's cycles exclude only each other
+_LOCAL_LOCKS = {}
+_LOCAL_LOCKS_GUARD = threading.Lock()
+
+
+class CronExpression:
+    """A five-field cron expression (minute hour day month weekday)."""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = CRON_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(text, low, high) for text, (low, high) in zip(fields, _CRON_FIELDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        # Cron matches either day field when both are restricted
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+
+    def next_after(self, ts: float, tz) -> float:
+        """First matching minute strictly after ts."""
+        t = datetime.fromtimestamp(ts, tz).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                slot = t.replace(tzinfo=tz).timestamp()
+                if slot > ts:
+                    return slot
+                t += timedelta(minutes=1)
+        raise ValueError(f"cron expression never matches: {self.expression!r}")
+
+    def _day_matches(self, t: datetime) -> bool:
+        day = t.day in self.days
+        weekday = (t.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day or weekday
+        return day and weekday
+
+
+def _parse_cron_field(text: str, low: int, high: int) -> set:
+    values = set()
+    for part in text.split(','):
+        expr, has_step, step = part.partition('/')
+        step = int(step) if has_step else 1
+        if expr == '*':
+            start, end = low, high
+        elif '-' in expr:
+            start, end = (int(v) for v in expr.split('-', 1))
+        else:
+            start = int(expr)
+            end = high if has_step else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"cron field out of range: {part!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class Schedule:
+    """Wall-clock run times: a cron expression, or every interval_hours from anchor each day."""
+
+    def __init__(self, cron: Optional[str] = None, interval_hours: float = 4.0, anchor: str = "00:00",
+                 timezone: str = "UTC", catch_up: str = "once", max_catch_up: int = 3,
+                 jitter_seconds: float = 0):
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {', '.join(CATCH_UP_POLICIES)}")
+        self.cron = CronExpression(cron) if cron else None
+        self.interval_seconds = max(60.0, interval_hours * 3600)
+        hour, _, minute = anchor.partition(':')
+        self.anchor = day_time(int(hour), int(minute or 0))
+        self.timezone = timezone
+        self.tz = ZoneInfo(timezone) if ZoneInfo else fixed_timezone.utc
+        self.catch_up = catch_up
+        self.max_catch_up = max(1, max_catch_up)
+        self.jitter_seconds = jitter_seconds
+
+    @classmethod
+    def from_config(cls, config: dict, interval_hours: Optional[float] = None) -> 'Schedule':
+        """Schedule from loop.*; an explicit interval_hours overrides loop.schedule."""
+        loop_config = (config or {}).get('loop', {})
+        return cls(
+            cron=None if interval_hours else loop_config.get('schedule'),
+            interval_hours=interval_hours or loop_config.get('interval_hours', 4),
+            anchor=str(loop_config.get('anchor', '00:00')),
+            timezone=loop_config.get('timezone', 'UTC'),
+            catch_up=loop_config.get('catch_up', 'once'),
+            max_catch_up=loop_config.get('max_catch_up', 3),
+            jitter_seconds=loop_config.get('jitter_seconds', 0)
+        )
+
+    def next_after(self, ts: float) -> float:
+        """First scheduled run strictly after ts (a time.time())."""
+        if self.cron is not None:
+            return self.cron.next_after(ts, self.tz)
+
+        # Intervals that fit in a day restart from the anchor every day (so
+        # 4h from 00:00 always means 00:00, 04:00, ... local time); longer
+        # ones count from the anchor on 2000-01-01
+        if self.interval_seconds >= 86400:
+            base = datetime.combine(datetime(2000, 1, 1).date(), self.anchor, self.tz).timestamp()
+            return base + ((ts - base) // self.interval_seconds + 1) * self.interval_seconds
+
+        # Stepped in local time, so the times stay put across DST changes
+        day = datetime.fromtimestamp(ts, self.tz).date()
+        step = timedelta(seconds=self.interval_seconds)
+        for offset in (-1, 0, 1):
+            local = datetime.combine(day + timedelta(days=offset), self.anchor)
+            end = local + timedelta(days=1)
+            while local < end:
+                slot = local.replace(tzinfo=self.tz).timestamp()
+                if slot > ts:
+                    return slot
+                local += step
+        return datetime.combine(day + timedelta(days=2), self.anchor, self.tz).timestamp()
+
+    def missed(self, last_slot: float, now: float) -> List[float]:
+        """Runs due in (last_slot, now], at most the latest max_catch_up of them."""
+        slots = []
+        slot = self.next_after(max(last_slot, now - 7 * 86400))
+        while slot <= now:
+            slots = (slots + [slot])[-self.max_catch_up:]
+            slot = self.next_after(slot)
+        return slots
+
+    def jitter(self) -> float:
+        return random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+
+    def describe(self) -> str:
+        if self.cron is not None:
+            when = f"cron '{self.cron.expression}'"
+        else:
+            when = f"every {self.interval_seconds / 3600:g}h from {self.anchor.strftime('%H:%M')}"
+        jitter = f", jitter {self.jitter_seconds:g}s" if self.jitter_seconds else ""
+        return f"{when} {self.timezone}, catch-up {self.catch_up}{jitter}"
+
+
+class CycleLock:
+    """Keeps cycles from overlapping, within a process and across processes."""
+
+    def __init__(self, lock_file: str = None):
+        self.lock_file = lock_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'cycle.lock')
+        with _LOCAL_LOCKS_GUARD:
+            self._local = _LOCAL_LOCKS.setdefault(os.path.abspath(self.lock_file), threading.Lock())
+        self._fd = None
+        self._held = False
+
+    def acquire(self) -> bool:
+        """Take the lock without waiting; False if another cycle holds it."""
+        if not self._local.acquire(blocking=False):
+            return False
+        if fcntl is not None:
+            os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+            fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                self._local.release()
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            self._fd = fd
+        self._held = True
+        return True
+
+    def release(self):
+        if not self._held:
+            return
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._held = False
+        self._local.release()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ScheduledRunner:
+    """Runs cycles on a Schedule, recording each slot in state/schedule.json.
+
+    run_cycle(slot) runs one cycle; idle(until) waits for the next start
+    (the default just sleeps); heartbeat() is called while waiting.
+    Once shutdown starts a drain, waiting stops and no further cycle starts;
+    reschedule() swaps the schedule, waking a wait for the old one.
+    """
+
+    def __init__(self, schedule: Schedule, run_cycle: Callable[[float], Awaitable],
+                 idle: Callable[[float], Awaitable] = None, heartbeat: Callable[[], None] = None,
+                 state_file: str = None, lock: CycleLock = None, shutdown: Shutdown = None):
+        self.schedule = schedule
+        self.run_cycle = run_cycle
+        self.idle = idle or self._sleep_until
+        self.heartbeat = heartbeat
+        self.state_file = state_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'schedule.json')
+        self.lock = lock or CycleLock()
+        self.shutdown = shutdown
+        self._rescheduled: Optional[asyncio.Event] = None
+
+    def reschedule(self, schedule: Schedule):
+        """Use a new schedule from the next start on (call on the runner's loop)."""
+        self.schedule = schedule
+        if self._rescheduled is not None:
+            self._rescheduled.set()
+
+    async def run_forever(self):
+        while not self._stopping():
+            await self.run_next()
+
+    async def run_next(self):
+        """Wait for the next due run and run it; returns the cycle's result (None if skipped)."""
+        while True:
+            slot = self._due(load_schedule_state(self.state_file), time.time())
+            if slot is not None:
+                break
+            slot = self.schedule.next_after(time.time())
+            start_at = slot + self.schedule.jitter()
+            self._save_state(next_slot=slot)
+            print(f"\n💤 Next cycle at {datetime.fromtimestamp(start_at, self.schedule.tz).isoformat()}")
+            print(f"   ({self.schedule.describe()})")
+            woke = await self._wait(start_at)
+            if woke == 'start':
+                break
+            if woke == 'stop':
+                return None
+            print(f"🔁 Schedule changed to {self.schedule.describe()}")
+        if self._stopping():
+            return None
+
+        if not self.lock.acquire():
+            print(f"⏭️  Another cycle is still running, skipping the {self._format(slot)} run")
+            self._save_state(last_slot=slot)
+            return None
+
+        try:
+            self._save_state(running_slot=slot, started_at=time.time())
+            if self.heartbeat is not None:
+                self.heartbeat()
+            try:
+                with self.shutdown.working() if self.shutdown is not None else nullcontext():
+                    result = await self.run_cycle(slot)
+            except Exception as e:
+                print(f"\n❌ Error in cycle: {e}")
+                result = None
+            # A cycle killed or cancelled before this point is resumed as soon as we restart
+            self._save_state(last_slot=slot, running_slot=None, finished_at=time.time())
+            return result
+        finally:
+            self.lock.release()
+
+    async def _wait(self, start_at: float) -> str:
+        """Idle until start_at: 'start', or 'stop' (drain) / 'rescheduled' if those come first."""
+        self._rescheduled = asyncio.Event()
+        idle = asyncio.ensure_future(self.idle(start_at))
+        wakeups = {asyncio.ensure_future(self._rescheduled.wait()): 'rescheduled'}
+        if self.shutdown is not None:
+            wakeups[asyncio.ensure_future(self.shutdown.drained())] = 'stop'
+        try:
+            await asyncio.wait({idle, *wakeups}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (idle, *wakeups):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(idle, *wakeups, return_exceptions=True)
+            self._rescheduled = None
+        if self._stopping():
+            return 'stop'
+        if not idle.cancelled():
+            idle.result()
+            return 'start'
+        return next(reason for task, reason in wakeups.items() if task.done() and not task.cancelled())
+
+    def _stopping(self) -> bool:
+        return self.shutdown is not None and self.shutdown.requested
+
+    def _due(self, state: dict, now: float) -> Optional[float]:
+        """A slot to run right away, if any, per the catch-up policy."""
+        if state.get('running_slot') is not None:
+            return state['running_slot']
+        if state.get('last_slot') is None:
+            # First start: run now unless missed runs are being skipped
+            return None if self.schedule.catch_up == 'skip' else now
+        missed = self.schedule.missed(state['last_slot'], now)
+        if not missed or self.schedule.catch_up == 'skip':
+            return None
+        if self.schedule.catch_up == 'once':
+            return missed[-1]
+        print(f"⏩ Catching up {len(missed)} missed run(s)")
+        return missed[0]
+
+    async def _sleep_until(self, until: float):
+        await sleep_until(until, self.heartbeat)
+
+    def _format(self, slot: float) -> str:
+        return datetime.fromtimestamp(slot, self.schedule.tz).strftime('%Y-%m-%d %H:%M')
+
+    def _save_state(self, **changes):
+        state = load_schedule_state(self.state_file)
+        state.update(changes, updated_at=time.time())
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+
+async def sleep_until(until: float, heartbeat: Callable[[], None] = None):
+    """Sleep until a wall-clock time (time.time()), re-reading the clock every minute."""
+    while True:
+        if heartbeat is not None:
+            heartbeat()
+        remaining = until - time.time()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, _SLEEP_STEP_SECONDS))
+
+
+def load_schedule_state(state_file: Optional[str] = None) -> dict:
+    """Last and next scheduled runs, for status output."""
+    state_file = state_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'schedule.json')
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
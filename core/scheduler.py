@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Generation Scheduler
+
+Runs several generate_app jobs concurrently as asyncio tasks, each in its
+own working directory, until the cycle's apps-per-cycle target is reached.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from core.generator import AppGenerationResult, AppGenerator
+from core.planner import Deadline
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+
+@dataclass
+class GenerationJob:
+    """A queued generate_app call."""
+    job_id: str
+    idea_id: str
+    title: str
+    status: str = PENDING
+    app_name: Optional[str] = None
+    error: Optional[str] = None
+    queued_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class GenerationScheduler:
+    """Concurrent generation pool with a visible job queue."""
+
+    def __init__(self, generator: AppGenerator, workers: int = 1, apps_per_cycle: int = 1,
+                 queue_file: Optional[str] = None):
+        self.generator = generator
+        self.workers = max(1, workers)
+        self.apps_per_cycle = max(1, apps_per_cycle)
+        self.queue_file = queue_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'queue.json')
+        self.work_root = os.path.join(generator.projects_dir, '.work')
+        self.jobs: List[GenerationJob] = []
+        self.results: List[AppGenerationResult] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, generator: AppGenerator, config: dict, state_dir: str = None) -> 'GenerationScheduler':
+        gen_config = config.get('generator', {})
+        return cls(
+            generator,
+            workers=gen_config.get('workers', 1),
+            apps_per_cycle=gen_config.get('apps_per_cycle', 1),
+            queue_file=os.path.join(state_dir, 'queue.json') if state_dir else None
+        )
+
+    async def run(self, ideas, accept: Callable = None, deadline: Deadline = None) -> List[AppGenerationResult]:
+        """Generate apps from ideas until apps_per_cycle succeed.
+
+        ideas may be a plain or an async iterable; the next idea is only
+        taken once a worker is free. accept(idea) (a plain function or a
+        coroutine function) is called lazily, just before an idea would be
+        queued, so duplicate checks only run for ideas that may actually be built.
+        No job starts after deadline, and each job's AI tool run is cut off at it.
+        """
+        deadline = deadline or Deadline()
+        successes = 0
+        running = {}
+        source = _as_async_iterator(ideas)
+
+        try:
+            while True:
+                # Never run more jobs than successes still needed
+                while running and len(running) >= min(self.workers, self.apps_per_cycle - successes):
+                    successes += await self._reap(running)
+                if successes >= self.apps_per_cycle or deadline.expired():
+                    break
+
+                try:
+                    idea = await source.__anext__()
+                except StopAsyncIteration:
+                    break
+
+                if accept is not None:
+                    accepted = accept(idea)
+                    if inspect.isawaitable(accepted):
+                        accepted = await accepted
+                    if not accepted:
+                        continue
+
+                job = self._enqueue(idea)
+                if job is None:
+                    continue
+                running[asyncio.ensure_future(self._run_job(job, idea, deadline))] = job
+
+            while running:
+                successes += await self._reap(running)
+        finally:
+            # A cancelled cycle takes its generations (and their AI tools) with it
+            for task, job in running.items():
+                task.cancel()
+                self._update(job, status=FAILED, error='cancelled', finished_at=datetime.utcnow().isoformat())
+            # Let them clean up (kill the tool, remove work dirs) before returning
+            await asyncio.gather(*running, return_exceptions=True)
+            await source.aclose()
+
+        return self.results
+
+    def snapshot(self) -> dict:
+        """Current queue state grouped by status."""
+        with self._lock:
+            jobs = [asdict(job) for job in self.jobs]
+        return {
+            'updated_at': datetime.utcnow().isoformat(),
+            'workers': self.workers,
+            'apps_per_cycle': self.apps_per_cycle,
+            'pending': [j for j in jobs if j['status'] == PENDING],
+            'running': [j for j in jobs if j['status'] == RUNNING],
+            'finished': [j for j in jobs if j['status'] in (FINISHED, FAILED)],
+        }
+
+    def _enqueue(self, idea) -> Optional[GenerationJob]:
+        app_name = self.generator._sanitize_name(idea.title)
+        with self._lock:
+            # Two jobs writing the same projects/<app> would clobber each other
+            if any(j.app_name == app_name and j.status in (PENDING, RUNNING) for j in self.jobs):
+                print(f"⚠️  Skipping {app_name}: already queued this cycle")
+                return None
+            job = GenerationJob(
+                job_id=f"job-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{len(self.jobs) + 1}",
+                idea_id=idea.id,
+                title=idea.title,
+                app_name=app_name
+            )
+            self.jobs.append(job)
+        self._save_queue()
+        return job
+
+    async def _run_job(self, job: GenerationJob, idea, deadline: Deadline = None) -> AppGenerationResult:
+        work_dir = os.path.join(self.work_root, job.job_id)
+        os.makedirs(work_dir, exist_ok=True)
+        self._update(job, status=RUNNING, started_at=datetime.utcnow().isoformat())
+
+        try:
+            return await self.generator.generate_app(
+                idea_title=idea.title,
+                idea_description=idea.description,
+                idea_features=idea.features,
+                idea_id=idea.id,
+                is_ai_infused=idea.is_ai_infused,
+                ai_capabilities=idea.ai_capabilities,
+                work_dir=work_dir,
+                deadline=deadline
+            )
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
+
+    async def _reap(self, running: dict) -> int:
+        """Wait for at least one job to finish; returns how many succeeded."""
+        done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+        successes = 0
+        for task in done:
+            job = running.pop(task)
+            try:
+                result = task.result()
+            except Exception as e:
+                self._update(job, status=FAILED, error=str(e), finished_at=datetime.utcnow().isoformat())
+                continue
+
+            with self._lock:
+                self.results.append(result)
+            self._update(
+                job,
+                status=FINISHED if result.success else FAILED,
+                error=result.error,
+                finished_at=datetime.utcnow().isoformat()
+            )
+            if result.success:
+                successes += 1
+        return successes
+
+    def _update(self, job: GenerationJob, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                setattr(job, key, value)
+        self._save_queue()
+
+    def _save_queue(self):
+        """Persist the queue so `status` can show it from another process."""
+        os.makedirs(os.path.dirname(self.queue_file), exist_ok=True)
+        snapshot = self.snapshot()
+        tmp_file = f"{self.queue_file}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, self.queue_file)
+
+
+async def _as_async_iterator(ideas):
+    if hasattr(ideas, '__aiter__'):
+        async for idea in ideas:
+            yield idea
+    else:
+        for idea in ideas:
+            yield idea
+
+
+def load_queue(queue_file: Optional[str] = None) -> dict:
+    """Load the last persisted queue snapshot."""
+    queue_file = queue_file or os.path.join(os.path.dirname(__file__), '..', 'state', 'queue.json')
+    if os.path.exists(queue_file):
+        try:
+            with open(queue_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
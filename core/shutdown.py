@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Graceful Shutdown
+
+SIGTERM (sent by container platforms on deploy or restart) and Ctrl+C
+start a drain instead of killing the process: no new work is taken,
+running generations get shutdown.grace_seconds to finish, and whatever is
+still running after that is cancelled, rolled back and handed back to
+the idea queue or backlog. A second signal stops right away.
+"""
+
+import asyncio
+import signal
+from contextlib import contextmanager
+from typing import Optional
+
+from core.planner import Deadline
+
+# One per process; every cycle and runner in it drains together
+_shutdown: Optional['Shutdown'] = None
+
+
+class Shutdown:
+    """A drain requested by a signal, and the grace period running work gets."""
+
+    def __init__(self, grace_seconds: float = 600):
+        self.grace_seconds = grace_seconds
+        self.requested = False
+        self.reason = None
+        # Running out once the drain starts
+        self.grace = Deadline()
+        self._busy = 0
+        self._task = None
+        self._draining = None
+        self._expired = None
+
+    def install(self):
+        """Handle SIGTERM and SIGINT on the running loop (main thread only)."""
+        loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request, sig.name)
+            except (NotImplementedError, RuntimeError, ValueError):
+                return
+
+    def request(self, reason: str = 'stop requested'):
+        """Start draining; a second request cancels everything at once."""
+        if self.requested:
+            print(f"\n🛑 {reason} again, stopping now")
+            if self._task is not None:
+                self._task.cancel()
+            return
+
+        self.requested = True
+        self.reason = reason
+        if self._busy:
+            print(f"\n🛑 {reason}: taking no new work, giving running generations "
+                  f"{self.grace_seconds:.0f}s to finish")
+            self.grace = Deadline(self.grace_seconds)
+            asyncio.get_running_loop().call_later(self.grace_seconds, self._event('_expired').set)
+        else:
+            print(f"\n🛑 {reason}: nothing running, stopping")
+            self._event('_expired').set()
+        self._event('_draining').set()
+
+    @contextmanager
+    def working(self):
+        """Mark a cycle as running, so a stop drains it instead of stopping at once."""
+        self._busy += 1
+        try:
+            yield
+        finally:
+            self._busy -= 1
+
+    async def drained(self):
+        """Wait until a drain starts."""
+        await self._event('_draining').wait()
+
+    async def grace_expired(self):
+        """Wait until running work has had its grace period."""
+        await self._event('_expired').wait()
+
+    async def interruptible(self, awaitable) -> bool:
+        """Await awaitable unless a drain starts first; False if it was interrupted."""
+        task = asyncio.ensure_future(awaitable)
+        stop = asyncio.ensure_future(self.drained())
+        try:
+            await asyncio.wait({task, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if not task.done():
+                task.cancel()
+            await asyncio.gather(task, stop, return_exceptions=True)
+        if task.cancelled():
+            return False
+        task.result()
+        return True
+
+    def _event(self, name: str) -> asyncio.Event:
+        if getattr(self, name) is None:
+            setattr(self, name, asyncio.Event())
+        return getattr(self, name)
+
+
+def get_shutdown(config: dict = None) -> Shutdown:
+    """Process-wide shutdown state; shutdown.grace_seconds comes from config."""
+    global _shutdown
+    if _shutdown is None:
+        _shutdown = Shutdown()
+    if config is not None:
+        _shutdown.grace_seconds = config.get('shutdown', {}).get('grace_seconds', 600)
+    return _shutdown
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - Template Bundles
+
+Prebuilt app skeletons that are materialized into projects/ by reflink or
+bulk copy instead of being rewritten file by file.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+# Source layers live in the repo; a bundle is an ordered stack of layers
+# and its version is bumped whenever the generated skeleton changes.
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', 'templates')
+
+TEMPLATE_BUNDLES = {
+    'standard': {'version': '4', 'layers': ['base']},
+    'ai': {'version': '4', 'layers': ['base', 'ai']},
+}
+
+# Files stored under a different name so they don't affect this repo
+RENAMES = {
+    'gitignore': '.gitignore',
+}
+
+# Linux FICLONE ioctl (copy-on-write clone on btrfs, xfs, bcachefs, ...)
+FICLONE = 0x40049409
+
+CLONE_METHODS = ['reflink', 'hardlink', 'copy']
+
+
+class FileCloner:
+    """Clones files by reflink, then hardlink, then plain copy.
+
+    With editable=True the clones are files the AI tool or the user will
+    write to, so they're never hardlinked to the shared original and always
+    come out 0644.
+    """
+
+    def __init__(self, method: str = 'auto', editable: bool = False):
+        # Downgraded as the filesystem refuses faster methods
+        self._methods = CLONE_METHODS[CLONE_METHODS.index(method):] if method in CLONE_METHODS else list(CLONE_METHODS)
+        self.editable = editable
+        if editable:
+            self._methods = [m for m in self._methods if m != 'hardlink'] or ['copy']
+
+    @property
+    def active_method(self) -> str:
+        """Fastest clone method the filesystem has accepted so far."""
+        return self._methods[0]
+
+    def clone(self, src: str, dst: str):
+        """Clone one file with the fastest method the filesystem supports."""
+        while True:
+            method = self._methods[0]
+            try:
+                if method == 'reflink':
+                    self._reflink(src, dst)
+                    if self.editable:
+                        os.chmod(dst, 0o644)
+                elif method == 'hardlink':
+                    os.link(src, dst)
+                else:
+                    shutil.copyfile(src, dst)
+                    os.chmod(dst, 0o644)
+                return
+            except OSError as e:
+                if method == 'copy' or not self._is_unsupported(e):
+                    raise
+                self._methods.pop(0)
+
+    def _reflink(self, src: str, dst: str):
+        """Copy-on-write clone via FICLONE."""
+        try:
+            import fcntl
+        except ImportError:
+            raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+
+        with open(src, 'rb') as fsrc:
+            fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+            except OSError:
+                os.close(fd)
+                os.unlink(dst)
+                raise
+            os.close(fd)
+
+    def _is_unsupported(self, error: OSError) -> bool:
+        """Whether an error means 'try the next clone method'."""
+        return error.errno in (
+            errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL,
+            errno.ENOTTY, errno.EPERM, errno.EMLINK, errno.ENOSYS,
+        )
+
+
+@dataclass
+class TemplateBundle:
+    """A template bundle resolved to its installed, read-only layers."""
+    name: str
+    version: str
+    digest: str
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+class TemplateStore:
+    """Installs template layers once and materializes bundles into projects."""
+
+    def __init__(self, store_dir: str, method: str = 'auto', templates_dir: str = TEMPLATES_DIR):
+        self.store_dir = store_dir
+        self.templates_dir = templates_dir
+        # Generated apps are edited in place, so never share inodes with the store
+        self.cloner = FileCloner(method, editable=True)
+        self._bundles: Dict[str, TemplateBundle] = {}
+
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def get_bundle(self, name: str) -> TemplateBundle:
+        """Return the bundle, installing its layers on first use."""
+        if name in self._bundles:
+            return self._bundles[name]
+
+        if name not in TEMPLATE_BUNDLES:
+            raise ValueError(f"Unknown template bundle: {name}")
+
+        spec = TEMPLATE_BUNDLES[name]
+        files = {}
+        digest = hashlib.sha256(spec['version'].encode('utf-8'))
+
+        for layer in spec['layers']:
+            layer_path, layer_digest = self._install_layer(layer)
+            digest.update(layer_digest.encode('utf-8'))
+            for rel_path in self._layer_files(layer_path):
+                # Later layers win
+                files[rel_path] = os.path.join(layer_path, rel_path)
+
+        bundle = TemplateBundle(
+            name=name,
+            version=spec['version'],
+            digest=digest.hexdigest(),
+            files=files
+        )
+        self._bundles[name] = bundle
+        return bundle
+
+    def materialize(self, name: str, output_dir: str) -> List[str]:
+        """Materialize a bundle into output_dir and return the files placed."""
+        bundle = self.get_bundle(name)
+        files_created = []
+
+        for rel_path in sorted(bundle.files):
+            dst = os.path.join(output_dir, rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            self.cloner.clone(bundle.files[rel_path], dst)
+            files_created.append(rel_path)
+
+        return files_created
+
+    def shared_files(self) -> List[str]:
+        """Installed layer files of every bundle loaded so far."""
+        paths = set()
+        for bundle in self._bundles.values():
+            paths.update(bundle.files.values())
+        return sorted(paths)
+
+    def _install_layer(self, layer: str):
+        """Install a source layer into the store; returns (path, digest)."""
+        sources = self._collect_sources(layer)
+        digest = self._digest_sources(sources)
+        layer_path = os.path.join(self.store_dir, f"{layer}-{digest[:12]}")
+
+        if not os.path.isdir(layer_path):
+            self._install(sources, layer_path)
+
+        return layer_path, digest
+
+    def _collect_sources(self, layer: str) -> Dict[str, str]:
+        """Map layer-relative paths to source files."""
+        sources = {}
+        layer_dir = os.path.join(self.templates_dir, layer)
+        for root, dirs, files in os.walk(layer_dir):
+            for file in files:
+                src = os.path.join(root, file)
+                rel_path = os.path.relpath(src, layer_dir)
+                head, tail = os.path.split(rel_path)
+                rel_path = os.path.join(head, RENAMES.get(tail, tail))
+                sources[rel_path.replace(os.sep, '/')] = src
+        return sources
+
+    def _layer_files(self, layer_path: str) -> List[str]:
+        """Files recorded in an installed layer."""
+        with open(os.path.join(layer_path, '.layer.json'), 'r') as f:
+            return json.load(f)['files']
+
+    def _digest_sources(self, sources: Dict[str, str]) -> str:
+        """Hash layer contents so edited templates get a fresh install."""
+        digest = hashlib.sha256()
+        for rel_path in sorted(sources):
+            digest.update(rel_path.encode('utf-8') + b'\0')
+            with open(sources[rel_path], 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+
+    def _install(self, sources: Dict[str, str], layer_path: str):
+        """Copy sources into the store as a read-only layer."""
+        print(f"📦 Installing template layer {os.path.basename(layer_path)}...")
+        tmp_dir = tempfile.mkdtemp(prefix='.install-', dir=self.store_dir)
+
+        try:
+            for rel_path, src in sources.items():
+                dst = os.path.join(tmp_dir, rel_path)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copyfile(src, dst)
+                # Every project gets its own clone; the store copy never changes
+                os.chmod(dst, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+            with open(os.path.join(tmp_dir, '.layer.json'), 'w') as f:
+                json.dump({'files': sorted(sources.keys())}, f, indent=2)
+            os.chmod(tmp_dir, 0o755)
+
+            try:
+                os.rename(tmp_dir, layer_path)
+            except OSError:
+                # Another generator installed the same layer first
+                if not os.path.isdir(layer_path):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+
+def get_store(projects_dir: str, method: str = 'auto') -> TemplateStore:
+    """Template store kept inside projects/ so reflinks stay on one filesystem."""
+    return TemplateStore(os.path.join(projects_dir, '.templates'), method=method)
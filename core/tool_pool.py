@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - AI Tool Pool
+
+Resolves AI tool binaries once per process and keeps a small pool of warm,
+long-lived tool sessions for tools that can serve several generations.
+Tools without a session mode keep running one-shot per app.
+"""
+
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.tool_runner import _kill
+
+
+_RESOLVED: Dict[str, Optional[str]] = {}
+_RESOLVE_LOCK = threading.Lock()
+
+# Pools live for the whole process so sessions survive across cycles
+_POOLS: Dict[Tuple, 'ToolPool'] = {}
+_POOLS_LOCK = threading.Lock()
+
+_EOF = object()
+
+
+def resolve_tool(name: str) -> Optional[str]:
+    """Absolute path of an AI tool on PATH, looked up once per process."""
+    with _RESOLVE_LOCK:
+        if name not in _RESOLVED:
+            _RESOLVED[name] = shutil.which(name)
+        return _RESOLVED[name]
+
+
+class SessionError(Exception):
+    """A tool session exited or could not be written to."""
+
+
+class ToolSession:
+    """A resident tool process speaking JSON lines on stdin/stdout.
+
+    Requests are {"type": "generate", "id", "prompt", "output_dir", "cwd",
+    "tmpdir"}; the tool replies with {"type": "log", "text"} lines and ends
+    with {"type": "done", "id", "returncode"}. A {"type": "ping", "id"}
+    must be answered with {"type": "pong", "id"}.
+    """
+
+    def __init__(self, cmd: List[str], env: dict = None):
+        self.cmd = cmd
+        self.requests = 0
+        self.last_used = time.monotonic()
+        self.messages: queue.Queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            text=True,
+            errors='replace',
+            bufsize=1,
+            start_new_session=(os.name == 'posix')
+        )
+        threading.Thread(target=self._pump, args=(self.process.stdout, False), daemon=True).start()
+        threading.Thread(target=self._pump, args=(self.process.stderr, True), daemon=True).start()
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, message: dict) -> str:
+        """Write one request and return its id."""
+        message = dict(message, id=f"{self.process.pid}-{next(self._ids)}")
+        # Replies to an abandoned request must not be read as this one's
+        self._discard_pending()
+        try:
+            with self._write_lock:
+                self.process.stdin.write(json.dumps(message) + '\n')
+                self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise SessionError(f"tool session is gone: {e}")
+        return message['id']
+
+    def next_message(self, timeout: float) -> Optional[dict]:
+        """Next message from the tool, or None if none arrived within timeout."""
+        try:
+            message = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if message is _EOF:
+            # Keep reporting EOF to later readers
+            self.messages.put(_EOF)
+            raise SessionError(f"tool session exited ({self.process.poll()})")
+        return message
+
+    def ping(self, timeout: float = 10) -> bool:
+        """Round-trip a ping; False if the session is dead or unresponsive."""
+        try:
+            ping_id = self.send({'type': 'ping'})
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                message = self.next_message(max(0.0, deadline - time.monotonic()))
+                if message and message.get('type') == 'pong' and message.get('id') == ping_id:
+                    return True
+        except SessionError:
+            pass
+        return False
+
+    def close(self):
+        """Ask the tool to exit by closing stdin, then kill its process group."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            _kill(self.process)
+
+    def _discard_pending(self):
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                return
+            if message is _EOF:
+                self.messages.put(_EOF)
+                return
+
+    def _pump(self, stream, is_stderr: bool):
+        for line in stream:
+            if is_stderr:
+                self.messages.put({'type': 'log', 'text': '[stderr] ' + line})
+                continue
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError(line)
+            except ValueError:
+                message = {'type': 'log', 'text': line}
+            self.messages.put(message)
+        stream.close()
+        if not is_stderr:
+            self.messages.put(_EOF)
+
+
+class ToolPool:
+    """A bounded set of warm tool sessions handed out to generation jobs."""
+
+    def __init__(self, tool: str, session_args: List[str] = None, size: int = 2,
+                 health_check_seconds: float = 60, max_requests: int = 50,
+                 wrap: Callable = None):
+        self.tool = tool
+        self.path = resolve_tool(tool)
+        self.session_args = list(session_args or [])
+        self.size = max(0, size)
+        self.health_check_seconds = health_check_seconds
+        self.max_requests = max_requests
+        self.wrap = wrap or (lambda cmd: cmd)
+        # Tools without a session mode run one-shot per app
+        self.enabled = bool(self.session_args) and self.path is not None and self.size > 0
+        self._idle: List[ToolSession] = []
+        self._count = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def session(self):
+        """Yield a healthy warm session, or None when the tool must run one-shot.
+
+        A session whose job raised or was cancelled is closed rather than
+        reused: its request may still be running.
+        """
+        session = self._acquire() if self.enabled else None
+        finished = False
+        try:
+            yield session
+            finished = True
+        finally:
+            if session is not None:
+                self._release(session, retire=not finished)
+
+    @asynccontextmanager
+    async def session_async(self):
+        """session() for coroutines; waiting for and starting a session happen in a worker thread.
+
+        When the job is cancelled, run_session may still be reading the
+        session in its worker thread; closing the tool ends that thread too.
+        """
+        session = await asyncio.to_thread(self._acquire) if self.enabled else None
+        finished = False
+        try:
+            yield session
+            finished = True
+        finally:
+            if session is not None:
+                await asyncio.to_thread(self._release, session, retire=not finished)
+
+    def warm(self, count: int = None):
+        """Start sessions ahead of the first job."""
+        count = self.size if count is None else min(count, self.size)
+        started = []
+        for _ in range(count):
+            session = self._acquire()
+            if session is None:
+                break
+            started.append(session)
+        for session in started:
+            self._release(session, used=False)
+
+    def shutdown(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self.enabled = False
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {'enabled': self.enabled, 'sessions': self._count, 'idle': len(self._idle)}
+
+    def _acquire(self) -> Optional[ToolSession]:
+        with self._cond:
+            while not self._idle and self._count >= self.size and self.enabled:
+                self._cond.wait()
+            if not self.enabled:
+                return None
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                self._count += 1
+
+        if session is not None:
+            stale = time.monotonic() - session.last_used > self.health_check_seconds
+            if session.alive() and (not stale or session.ping()):
+                return session
+            print(f"♻️  Replacing unhealthy {self.tool} session")
+            session.close()
+
+        try:
+            session = ToolSession(self.wrap([self.path] + self.session_args))
+            if session.ping(timeout=30):
+                return session
+            session.close()
+            print(f"⚠️  {self.tool} did not answer in session mode, running it one-shot")
+        except OSError as e:
+            print(f"⚠️  Could not start {self.tool} session ({e}), running it one-shot")
+
+        with self._cond:
+            self._count -= 1
+            self.enabled = False
+            self._cond.notify_all()
+        return None
+
+    def _release(self, session: ToolSession, used: bool = True, retire: bool = False):
+        """Return a session to the idle pool, or close it when retire is set or it is spent."""
+        if used:
+            session.requests += 1
+        session.last_used = time.monotonic()
+        retire = retire or not session.alive() or not self.enabled or session.requests >= self.max_requests
+        with self._cond:
+            if retire:
+                self._count -= 1
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+        if retire:
+            session.close()
+
+
+def get_pool(config: dict, wrap: Callable = None) -> ToolPool:
+    """Process-wide pool for the configured AI tool."""
+    gen_config = (config or {}).get('generator', {})
+    pool_config = gen_config.get('tool_pool', {})
+    key = (
+        gen_config.get('ai_tool', 'qwen-code'),
+        tuple(pool_config.get('session_args') or []),
+        pool_config.get('size', gen_config.get('workers', 1)),
+    )
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ToolPool(
+                key[0],
+                session_args=list(key[1]),
+                size=key[2],
+                health_check_seconds=pool_config.get('health_check_seconds', 60),
+                max_requests=pool_config.get('max_requests', 50),
+                wrap=wrap
+            )
+            _POOLS[key] = pool
+        return pool
+
+
+def shutdown_pools():
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pools)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Vibe Coder - AI Tool Runner
+
+Runs the AI tool, one-shot on the event loop or on a warm session, with
+its output streamed to a size-capped log, reports files as they appear in
+the output directory, and kills the tool early when it stalls.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+
+# Directories never worth watching while the tool runs
+WATCH_SKIP_DIRS = {'.git', 'node_modules'}
+
+# Longest single output line kept in the log
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class ToolStalled(subprocess.TimeoutExpired):
+    """The tool produced no output and no new files within the stall window."""
+
+
+class ToolFailed(Exception):
+    """The tool exited with a nonzero code."""
+
+
+@dataclass
+class ToolRunResult:
+    """Outcome of a streamed tool run."""
+    returncode: int
+    duration_seconds: float
+    log_bytes: int = 0
+    log_truncated: bool = False
+    files_seen: List[str] = field(default_factory=list)
+
+
+class CappedLog:
+    """Thread-safe append-only log that stops writing at max_bytes."""
+
+    def __init__(self, log, max_bytes: int):
+        self.log = log
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.truncated = False
+        self._lock = threading.Lock()
+
+    def write(self, text: str):
+        with self._lock:
+            if self.truncated:
+                return
+            data = text.encode('utf-8', errors='replace')
+            if self.written + len(data) > self.max_bytes:
+                data = data[:max(0, self.max_bytes - self.written)]
+                self.truncated = True
+            self.log.write(data.decode('utf-8', errors='ignore'))
+            self.written += len(data)
+            if self.truncated:
+                self.log.write(f"\n[log truncated at {self.max_bytes} bytes]\n")
+            self.log.flush()
+
+
+def scan_tree(root: str) -> Dict[str, Tuple[int, float]]:
+    """Map relative file paths under root to (size, mtime)."""
+    found = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in WATCH_SKIP_DIRS:
+                    stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                found[os.path.relpath(entry.path, root).replace(os.sep, '/')] = (st.st_size, st.st_mtime)
+    return found
+
+
+class TreeWatcher:
+    """Reports new or changed files under output_dir between polls."""
+
+    def __init__(self, output_dir: str, on_progress: Callable = None):
+        self.output_dir = output_dir
+        self.on_progress = on_progress
+        self.seen = scan_tree(output_dir) if os.path.isdir(output_dir) else {}
+
+    def poll(self) -> bool:
+        """Rescan; returns whether anything changed."""
+        current = scan_tree(self.output_dir) if os.path.isdir(self.output_dir) else {}
+        changed = False
+        for path, stat in current.items():
+            if self.seen.get(path) != stat:
+                changed = True
+                if self.on_progress:
+                    self.on_progress(path, stat[0])
+        self.seen = current
+        return changed
+
+
+async def run_streaming(cmd: List[str], output_dir: str, log, cwd: str = None, env: dict = None,
+                        wall_seconds: float = 600, stall_seconds: float = 0, max_log_bytes: int = 5 * 1024 * 1024,
+                        poll_interval: float = 2.0, on_progress: Callable = None) -> ToolRunResult:
+    """Run cmd on the event loop, streaming stdout/stderr into log and watching output_dir.
+
+    on_progress(path, size) is called for every new or changed file (from a
+    worker thread, since watching scans the tree).
+    Raises subprocess.TimeoutExpired after wall_seconds and ToolStalled
+    after stall_seconds without output or file activity (0 disables).
+    """
+    start = time.monotonic()
+    capped = CappedLog(log, max_log_bytes)
+    last_activity = start
+    watcher = TreeWatcher(output_dir, on_progress)
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        cwd=cwd,
+        env=env,
+        limit=MAX_LINE_BYTES,
+        # Own process group so the whole tool tree can be killed
+        start_new_session=(os.name == 'posix')
+    )
+
+    async def pump(stream, prefix: str):
+        nonlocal last_activity
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                capped.write(f"{prefix}[line over {MAX_LINE_BYTES} bytes dropped]\n")
+                continue
+            if not line:
+                break
+            last_activity = time.monotonic()
+            capped.write(prefix + line.decode('utf-8', errors='replace'))
+
+    readers = [
+        asyncio.ensure_future(pump(process.stdout, '')),
+        asyncio.ensure_future(pump(process.stderr, '[stderr] ')),
+    ]
+
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(process.wait(), poll_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            if await asyncio.to_thread(watcher.poll):
+                last_activity = time.monotonic()
+
+            now = time.monotonic()
+            if now - start > wall_seconds:
+                await _kill_async(process)
+                raise subprocess.TimeoutExpired(cmd, wall_seconds)
+            if stall_seconds and now - last_activity > stall_seconds:
+                await _kill_async(process)
+                raise ToolStalled(cmd, stall_seconds)
+    except BaseException:
+        # Never leave the tool running behind an interrupted generation
+        await _kill_async(process)
+        raise
+    finally:
+        _, pending = await asyncio.wait(readers, timeout=5)
+        for reader in pending:
+            reader.cancel()
+
+    return ToolRunResult(
+        returncode=process.returncode,
+        duration_seconds=time.monotonic() - start,
+        log_bytes=capped.written,
+        log_truncated=capped.truncated,
+        files_seen=sorted(watcher.seen)
+    )
+
+
+def run_session(session, request: dict, output_dir: str, log,
+                wall_seconds: float = 600, stall_seconds: float = 0, max_log_bytes: int = 5 * 1024 * 1024,
+                poll_interval: float = 2.0, on_progress: Callable = None) -> ToolRunResult:
+    """Run one request on a warm tool session with the same watchdogs as run_streaming.
+
+    The session is closed (and so replaced by its pool) on timeout, stall
+    or any other interruption, since its state is then unknown.
+    """
+    start = time.monotonic()
+    capped = CappedLog(log, max_log_bytes)
+    last_activity = start
+    last_scan = start
+    watcher = TreeWatcher(output_dir, on_progress)
+    returncode = None
+
+    try:
+        request_id = session.send(request)
+        while returncode is None:
+            message = session.next_message(timeout=poll_interval)
+            now = time.monotonic()
+            if message is not None:
+                last_activity = now
+                if message.get('type') == 'log':
+                    capped.write(message.get('text', '').rstrip('\n') + '\n')
+                elif message.get('type') == 'done' and message.get('id') == request_id:
+                    returncode = int(message.get('returncode', 1))
+                    break
+
+            if now - last_scan >= poll_interval:
+                last_scan = now
+                if watcher.poll():
+                    last_activity = time.monotonic()
+
+            if now - start > wall_seconds:
+                raise subprocess.TimeoutExpired(session.cmd, wall_seconds)
+            if stall_seconds and now - last_activity > stall_seconds:
+                raise ToolStalled(session.cmd, stall_seconds)
+    except BaseException:
+        session.close()
+        raise
+
+    # Files written just before the reply
+    watcher.poll()
+    return ToolRunResult(
+        returncode=returncode,
+        duration_seconds=time.monotonic() - start,
+        log_bytes=capped.written,
+        log_truncated=capped.truncated,
+        files_seen=sorted(watcher.seen)
+    )
+
+
+def _kill(process: subprocess.Popen, grace_seconds: float = 5.0):
+    """Terminate the tool's process group, escalating to SIGKILL."""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+        process.wait(timeout=grace_seconds)
+    except subprocess.TimeoutExpired:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+async def _kill_async(process: asyncio.subprocess.Process, grace_seconds: float = 5.0):
+    """_kill for a process started with asyncio.create_subprocess_exec."""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+        await asyncio.wait_for(process.wait(), grace_seconds)
+    except asyncio.TimeoutError:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        await process.wait()
+    except ProcessLookupError:
+        pass
@@ -14,9 +14,15 @@ import os
 import sys
 import signal
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from core.config import load_config
+from core.events import APP_PUBLISHED, CYCLE_DONE, GENERATION_PROGRESS, stream_events
+
 
 class VibeCoderGUI:
     """Main GUI Application"""
@@ -50,8 +56,8 @@ class VibeCoderGUI:
         self.create_widgets()
         self.load_status()
         
-        # Start status update loop
-        self.update_status()
+        # Follow pipeline events (of this GUI's run or any daemon already going)
+        threading.Thread(target=self.read_events, daemon=True).start()
     
     def setup_styles(self):
         """Setup custom styles"""
@@ -289,10 +295,8 @@ class VibeCoderGUI:
                     # Schedule GUI update
                     self.root.after(0, self.append_log, line.strip())
                 
-                # Check for specific patterns
-                if "App generated successfully" in line:
-                    self.root.after(0, lambda: self.log("✨ App generated!", 'success'))
-                elif "ERROR" in line or "failed" in line.lower():
+                # Highlight problems (progress comes from pipeline events)
+                if "ERROR" in line or "failed" in line.lower():
                     self.root.after(0, lambda: self.log(line.strip(), 'error'))
                 elif "⚠" in line or "Warning" in line:
                     self.root.after(0, lambda: self.log(line.strip(), 'warning'))
@@ -359,10 +363,31 @@ class VibeCoderGUI:
         except Exception as e:
             self.log(f"Error loading status: {e}", 'error')
     
-    def update_status(self):
-        """Periodically update status"""
-        self.load_status()
-        self.root.after(5000, self.update_status)  # Update every 5 seconds
+    def read_events(self):
+        """Follow the event stream in a background thread, reconnecting while nothing serves it"""
+        types = (GENERATION_PROGRESS, APP_PUBLISHED, CYCLE_DONE)
+        while True:
+            try:
+                for event in stream_events(load_config(), types):
+                    self.root.after(0, self.handle_event, event)
+            except OSError:
+                pass
+            except Exception as e:
+                self.root.after(0, self.log, f"Event stream error: {e}", 'error')
+            time.sleep(2)
+    
+    def handle_event(self, event):
+        """Show a pipeline event (called from main thread)"""
+        data = event.data
+        if event.type == GENERATION_PROGRESS:
+            if data.get('stage') == 'done':
+                self.log(f"✨ App generated: {data['app_name']}", 'success')
+            elif data.get('stage') == 'failed':
+                self.log(f"App generation failed: {data['app_name']}: {data.get('error', '')}", 'error')
+        elif event.type == APP_PUBLISHED:
+            self.log(f"🚀 Published {data.get('repo_url') or data['repo_name']}", 'success')
+        elif event.type == CYCLE_DONE:
+            self.load_status()
     
     def open_projects_folder(self):
         """Open projects folder in file manager"""
@@ -19,39 +19,47 @@ from datetime import datetime
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from vibe_coder import run_vibe_cycle
+from vibe_coder import load_config, make_runner, profile_publisher, serve_events, until_stopped, watch_config
+from core.shutdown import get_shutdown
+from core.profiles import load_profiles
 
 
 async def main():
     """Run vibe coder worker."""
+    config = load_config()
+    
+    # VIBE_INTERVAL (hours, may be fractional) overrides the schedule in config.yaml
+    interval = os.environ.get('VIBE_INTERVAL')
+    interval_hours = float(interval) if interval else None
+    
+    # Every profile publishes in the background for the worker's lifetime
+    profiles = load_profiles(config)
+    publishers = [profile_publisher(profile) for profile in profiles]
+    runners = [make_runner(config, interval_hours, publisher=publisher, profile=profile)
+               for profile, publisher in zip(profiles, publishers)]
+    
     print("="*60)
     print("  🎨 Vibe Coder - Cloud Worker")
     print("="*60)
     print(f"  Started at: {datetime.utcnow().isoformat()}")
-    print(f"  Interval: 4 hours")
+    for profile, runner in zip(profiles, runners):
+        print(f"  Schedule ({profile.name}): {runner.schedule.describe()}")
     print("="*60)
     
-    # Run initial cycle
-    print("\n🚀 Running initial cycle...")
-    await run_vibe_cycle(max_iterations=5)
+    for publisher in publishers:
+        publisher.start()
+    watcher = watch_config()
     
-    # Continue running cycles
-    interval_hours = int(os.environ.get('VIBE_INTERVAL', '4'))
+    # The first start runs right away; after a restart, missed runs are
+    # caught up per loop.catch_up and an interrupted cycle resumes.
+    # SIGTERM on deploy or restart drains the running cycle first.
+    await until_stopped(serve_events(asyncio.gather(*(runner.run_forever() for runner in runners))))
+    watcher.cancel()
     
-    while True:
-        next_run = datetime.utcnow().timestamp() + (interval_hours * 3600)
-        print(f"\n💤 Sleeping until {datetime.fromtimestamp(next_run).isoformat()}")
-        print(f"   (Next cycle in {interval_hours} hours)")
-        
-        await asyncio.sleep(interval_hours * 3600)
-        
-        # Run next cycle
-        print("\n🚀 Running next cycle...")
-        try:
-            await run_vibe_cycle(max_iterations=5)
-        except Exception as e:
-            print(f"❌ Cycle failed: {e}")
-            print("   Continuing to next cycle...")
+    # Unpublished jobs stay in the outbox for the next start
+    timeout = get_shutdown().grace.clamp(30)
+    await asyncio.gather(*(publisher.stop(timeout=timeout) for publisher in publishers))
+    print("\n🛑 Worker stopped")
 
 
 if __name__ == "__main__":
@@ -26,6 +26,9 @@ CHECK_INTERVAL=3600       # Check every 1 hour
 HEARTBEAT_TIMEOUT=16200   # 4.5 hours (worker should heartbeat every 4 hours)
 MAX_RESTARTS=3
 
+# AI tool for failure diagnosis, resolved once at startup
+AI_TOOL="$(command -v qwen-code 2>/dev/null || true)"
+
 # Create directories if needed
 mkdir -p "$LOG_DIR"
 
@@ -144,10 +147,10 @@ diagnose_failure() {
   fi
   
   # Try to diagnose with AI if qwen-code is available
-  if command -v qwen-code &> /dev/null; then
+  if [ -n "$AI_TOOL" ]; then
     log "Asking AI to diagnose..."
     
-    local diagnosis=$(qwen-code -p "
+    local diagnosis=$("$AI_TOOL" -p "
 Here's the last output from a failed vibe-coder worker:
 $(tail -50 "$OUTPUT_FILE" 2>/dev/null || echo 'No output')
 
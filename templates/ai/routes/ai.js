@@ -0,0 +1,37 @@
+const express = require('express');
+const aiService = require('../services/ai-service');
+
+const router = express.Router();
+
+function readPrompt(req, res) {
+  const { prompt, context } = { ...req.query, ...(req.body || {}) };
+  if (typeof prompt !== 'string' || !prompt.trim()) {
+    res.status(400).json({ error: 'prompt is required' });
+    return null;
+  }
+  return { prompt, context: typeof context === 'object' && context ? context : {} };
+}
+
+// Whole response as JSON (cached and coalesced)
+router.post('/generate', async (req, res) => {
+  const input = readPrompt(req, res);
+  if (!input) return;
+  try {
+    res.json(await aiService.generate(input.prompt, input.context));
+  } catch (error) {
+    res.status(error.status || 500).json({ error: error.message });
+  }
+});
+
+// Server-sent events, so the client can render text as it arrives
+router.all('/stream', async (req, res) => {
+  const input = readPrompt(req, res);
+  if (!input) return;
+  await aiService.streamTo(res, input.prompt, input.context);
+});
+
+router.get('/stats', (req, res) => {
+  res.json(aiService.getStats());
+});
+
+module.exports = router;
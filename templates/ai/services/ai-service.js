@@ -0,0 +1,315 @@
+const crypto = require('crypto');
+const { LangChain } = require('langchain');
+
+// Least-recently-used cache whose entries also expire after ttlMs
+class LRUCache {
+  constructor(maxEntries, ttlMs) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.entries = new Map();
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    // Map keeps insertion order, so re-inserting marks it most recent
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+}
+
+// Token bucket: `burst` calls at once, refilled at `ratePerSecond`
+class TokenBucket {
+  constructor(ratePerSecond, burst) {
+    this.rate = ratePerSecond;
+    this.capacity = burst;
+    this.tokens = burst;
+    this.updatedAt = Date.now();
+  }
+
+  refill() {
+    const now = Date.now();
+    this.tokens = Math.min(this.capacity, this.tokens + ((now - this.updatedAt) / 1000) * this.rate);
+    this.updatedAt = now;
+  }
+
+  // Resolves once a token is available, or rejects after maxWaitMs
+  async take(maxWaitMs) {
+    const deadline = Date.now() + maxWaitMs;
+    for (;;) {
+      this.refill();
+      if (this.tokens >= 1) {
+        this.tokens -= 1;
+        return;
+      }
+      const waitMs = Math.ceil(((1 - this.tokens) / this.rate) * 1000);
+      if (Date.now() + waitMs > deadline) {
+        const error = new Error('AI rate limit exceeded');
+        error.status = 429;
+        throw error;
+      }
+      await new Promise((resolve) => setTimeout(resolve, waitMs));
+    }
+  }
+}
+
+// Same prompt modulo case and whitespace, same context regardless of key order
+function stableStringify(value) {
+  if (Array.isArray(value)) return `[${value.map(stableStringify).join(',')}]`;
+  if (value && typeof value === 'object') {
+    return `{${Object.keys(value).sort().map((k) => `${JSON.stringify(k)}:${stableStringify(value[k])}`).join(',')}}`;
+  }
+  return JSON.stringify(value);
+}
+
+function cacheKey(prompt, context) {
+  const normalized = String(prompt).trim().replace(/\s+/g, ' ').toLowerCase();
+  return crypto.createHash('sha256').update(normalized).update('\0').update(stableStringify(context || {})).digest('hex');
+}
+
+class AIService {
+  constructor() {
+    this.apiKey = process.env.AI_API_KEY;
+    this.enabled = !!this.apiKey;
+
+    this.cache = new LRUCache(
+      parseInt(process.env.AI_CACHE_MAX_ENTRIES, 10) || 500,
+      parseInt(process.env.AI_CACHE_TTL_MS, 10) || 10 * 60 * 1000
+    );
+    this.limiter = new TokenBucket(
+      parseFloat(process.env.AI_RATE_LIMIT_PER_SECOND) || 2,
+      parseInt(process.env.AI_RATE_LIMIT_BURST, 10) || 5
+    );
+    this.maxQueueMs = parseInt(process.env.AI_RATE_LIMIT_MAX_WAIT_MS, 10) || 15000;
+    this.inFlight = new Map();
+    this.stats = { hits: 0, misses: 0, coalesced: 0, limited: 0 };
+
+    if (!this.enabled) {
+      console.log('ℹ️  AI service running in demo mode');
+    }
+  }
+
+  async generate(prompt, context = {}) {
+    if (!this.enabled) {
+      return this.getDemoResponse(prompt, context);
+    }
+
+    const key = cacheKey(prompt, context);
+    const cached = this.cache.get(key);
+    if (cached) {
+      this.stats.hits += 1;
+      return { ...cached, cached: true };
+    }
+
+    // Identical prompts already on their way to the model share one call
+    if (this.inFlight.has(key)) {
+      this.stats.coalesced += 1;
+      return this.inFlight.get(key);
+    }
+
+    this.stats.misses += 1;
+    const call = this.generateUncached(prompt, context, key);
+    this.inFlight.set(key, call);
+    try {
+      return await call;
+    } finally {
+      this.inFlight.delete(key);
+    }
+  }
+
+  async generateUncached(prompt, context, key) {
+    try {
+      await this.limiter.take(this.maxQueueMs);
+    } catch (error) {
+      this.stats.limited += 1;
+      throw error;
+    }
+
+    try {
+      // Using LangChain for orchestration
+      const response = await this.callAI(prompt, context);
+      const result = {
+        success: true,
+        data: response,
+        timestamp: new Date().toISOString()
+      };
+      this.cache.set(key, result);
+      return result;
+    } catch (error) {
+      console.error('AI service error:', error);
+      return this.getDemoResponse(prompt, context);
+    }
+  }
+
+  // Yields response text chunks as the model produces them; cached answers
+  // and coalesced calls arrive as a single chunk
+  async *stream(prompt, context = {}) {
+    if (!this.enabled) {
+      yield this.getDemoResponse(prompt, context).data.message;
+      return;
+    }
+
+    const key = cacheKey(prompt, context);
+    const cached = this.cache.get(key);
+    if (cached) {
+      this.stats.hits += 1;
+      yield cached.data.message;
+      return;
+    }
+    if (this.inFlight.has(key)) {
+      this.stats.coalesced += 1;
+      yield (await this.inFlight.get(key)).data.message;
+      return;
+    }
+
+    this.stats.misses += 1;
+    let finish;
+    let fail;
+    let settled = false;
+    const call = new Promise((resolve, reject) => {
+      finish = (result) => { settled = true; resolve(result); };
+      fail = (error) => { settled = true; reject(error); };
+    });
+    // Concurrent identical callers wait for the full text
+    call.catch(() => {});
+    this.inFlight.set(key, call);
+
+    try {
+      try {
+        await this.limiter.take(this.maxQueueMs);
+      } catch (error) {
+        this.stats.limited += 1;
+        throw error;
+      }
+
+      let text = '';
+      for await (const chunk of this.streamAI(prompt, context)) {
+        text += chunk;
+        yield chunk;
+      }
+      const result = {
+        success: true,
+        data: { message: text },
+        timestamp: new Date().toISOString()
+      };
+      this.cache.set(key, result);
+      finish(result);
+    } catch (error) {
+      fail(error);
+      throw error;
+    } finally {
+      // The consumer stopped reading (e.g. the client disconnected)
+      if (!settled) fail(new Error('AI stream abandoned'));
+      this.inFlight.delete(key);
+    }
+  }
+
+  // Server-sent events: one `data:` line per chunk, then `event: done`
+  async streamTo(res, prompt, context = {}) {
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.setHeader('Connection', 'keep-alive');
+    res.flushHeaders();
+
+    try {
+      for await (const chunk of this.stream(prompt, context)) {
+        if (res.destroyed || res.writableEnded) break;
+        res.write(`data: ${JSON.stringify(chunk)}\n\n`);
+        // Push through the compression middleware straight away
+        if (typeof res.flush === 'function') res.flush();
+      }
+      res.write('event: done\ndata: {}\n\n');
+    } catch (error) {
+      res.write(`event: error\ndata: ${JSON.stringify({ message: error.message, status: error.status || 500 })}\n\n`);
+    }
+    res.end();
+  }
+
+  async callAI(prompt, context) {
+    // Implement actual AI call here
+    // This is a placeholder for the AI integration
+    return {
+      message: 'AI response placeholder',
+      suggestions: ['Suggestion 1', 'Suggestion 2', 'Suggestion 3']
+    };
+  }
+
+  async *streamAI(prompt, context) {
+    // Implement the provider's streaming call here (e.g. messages.stream
+    // or chat.completions.create({ stream: true })) and yield text deltas.
+    // This placeholder streams the non-streaming response word by word.
+    const response = await this.callAI(prompt, context);
+    for (const word of response.message.split(/(\s+)/)) {
+      yield word;
+    }
+  }
+
+  getDemoResponse(prompt, context) {
+    // Demo mode response
+    return {
+      success: true,
+      data: {
+        message: 'Demo mode: AI features available with API key',
+        suggestions: this.generateSimpleSuggestions(prompt)
+      },
+      demo: true
+    };
+  }
+
+  generateSimpleSuggestions(input) {
+    // Simple rule-based suggestions as fallback
+    const keywords = input.toLowerCase().split(' ');
+    const suggestions = [];
+
+    if (keywords.includes('create') || keywords.includes('build')) {
+      suggestions.push('Start with a template');
+      suggestions.push('Break down into smaller tasks');
+    }
+    if (keywords.includes('help') || keywords.includes('how')) {
+      suggestions.push('Check the documentation');
+      suggestions.push('Try our interactive tutorial');
+    }
+
+    return suggestions.length > 0 ? suggestions : ['Get started now', 'Explore features', 'View examples'];
+  }
+
+  getStats() {
+    return { ...this.stats, cacheEntries: this.cache.size, inFlight: this.inFlight.size };
+  }
+
+  async analyze(text) {
+    // Sentiment analysis, categorization, etc.
+    return {
+      sentiment: 'neutral',
+      categories: ['general'],
+      confidence: 0.8
+    };
+  }
+
+  async summarize(text) {
+    // Text summarization
+    return text.substring(0, 200) + '...';
+  }
+}
+
+module.exports = new AIService();
+module.exports.AIService = AIService;
+module.exports.LRUCache = LRUCache;
+module.exports.TokenBucket = TokenBucket;
@@ -0,0 +1,59 @@
+import React, { lazy, Suspense, useState } from 'react';
+import useItems from './hooks/useItems';
+
+// The list and its virtualizer load in their own chunk after first paint
+const ItemList = lazy(() => import('./components/ItemList'));
+
+function App() {
+  const items = useItems();
+  const [name, setName] = useState('');
+  const [description, setDescription] = useState('');
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    if (!name.trim()) return;
+    const draft = { name, description };
+    setName('');
+    setDescription('');
+    // Restore the form if the server rejects the item
+    if (!(await items.addItem(draft))) {
+      setName(draft.name);
+      setDescription(draft.description);
+    }
+  };
+
+  return (
+    <div style={{ padding: '20px', maxWidth: '800px', margin: '0 auto' }}>
+      <h1>Vibe App</h1>
+      <form onSubmit={handleSubmit} style={{ marginBottom: '20px' }}>
+        <input
+          type="text"
+          placeholder="Name"
+          value={name}
+          onChange={(e) => setName(e.target.value)}
+          style={{ display: 'block', width: '100%', marginBottom: '10px', padding: '8px' }}
+        />
+        <textarea
+          placeholder="Description"
+          value={description}
+          onChange={(e) => setDescription(e.target.value)}
+          style={{ display: 'block', width: '100%', marginBottom: '10px', padding: '8px' }}
+        />
+        <button type="submit" style={{ padding: '10px 20px' }}>Add Item</button>
+      </form>
+      <h2>Items</h2>
+      {items.error && <p style={{ color: '#c00' }}>{items.error}</p>}
+      <Suspense fallback={<p>Loading…</p>}>
+        <ItemList
+          count={items.count}
+          getItem={items.getItem}
+          loadMore={items.loadMore}
+          hasMore={items.hasMore}
+          loading={items.loading}
+        />
+      </Suspense>
+    </div>
+  );
+}
+
+export default App;
@@ -0,0 +1,25 @@
+const PAGE_SIZE = 100;
+
+async function request(url, options) {
+  const res = await fetch(url, options);
+  const body = await res.json().catch(() => ({}));
+  if (!res.ok) {
+    throw new Error(body.error || `Request failed (${res.status})`);
+  }
+  return body;
+}
+
+// One keyset page, newest first: { items, nextCursor }
+export function fetchItems(cursor, signal) {
+  const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+  if (cursor) params.set('cursor', cursor);
+  return request(`/api/items?${params}`, { signal });
+}
+
+export function createItem(item) {
+  return request('/api/items', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(item)
+  });
+}
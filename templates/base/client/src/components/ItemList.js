@@ -0,0 +1,48 @@
+import React, { memo, useCallback } from 'react';
+import VirtualList from './VirtualList';
+
+const ROW_HEIGHT = 56;
+const LIST_HEIGHT = 560;
+
+const rowStyle = {
+  boxSizing: 'border-box',
+  padding: '8px 12px',
+  borderBottom: '1px solid #eee',
+  overflow: 'hidden',
+  whiteSpace: 'nowrap',
+  textOverflow: 'ellipsis'
+};
+
+const Row = memo(function Row({ item, style }) {
+  return (
+    <div style={{ ...rowStyle, ...style, opacity: item.pending ? 0.5 : 1 }}>
+      <strong>{item.name}</strong>
+      <div style={{ color: '#666', overflow: 'hidden', textOverflow: 'ellipsis' }}>{item.description}</div>
+    </div>
+  );
+});
+
+export default function ItemList({ count, getItem, loadMore, hasMore, loading }) {
+  const renderItem = useCallback((index, style) => {
+    const item = getItem(index);
+    if (!item) {
+      return <div key={`loading-${index}`} style={{ ...rowStyle, ...style }}>Loading…</div>;
+    }
+    return <Row key={item.id} item={item} style={style} />;
+  }, [getItem]);
+
+  if (!count && !loading && !hasMore) {
+    return <p>No items yet.</p>;
+  }
+
+  // One placeholder row while more pages remain
+  return (
+    <VirtualList
+      itemCount={count + (hasMore ? 1 : 0)}
+      itemHeight={ROW_HEIGHT}
+      height={LIST_HEIGHT}
+      renderItem={renderItem}
+      onEndReached={hasMore ? loadMore : undefined}
+    />
+  );
+}
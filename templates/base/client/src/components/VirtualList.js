@@ -0,0 +1,55 @@
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+
+// Renders only the rows in view (plus overscan) inside a fixed-height
+// scroller, and calls onEndReached as the user nears the bottom
+export default function VirtualList({
+  itemCount,
+  itemHeight,
+  height,
+  renderItem,
+  onEndReached,
+  overscan = 8,
+  endThreshold = 10
+}) {
+  const scrollerRef = useRef(null);
+  const frameRef = useRef(0);
+  const [scrollTop, setScrollTop] = useState(0);
+
+  const onScroll = useCallback(() => {
+    if (frameRef.current) return;
+    frameRef.current = requestAnimationFrame(() => {
+      frameRef.current = 0;
+      if (scrollerRef.current) setScrollTop(scrollerRef.current.scrollTop);
+    });
+  }, []);
+
+  useEffect(() => () => cancelAnimationFrame(frameRef.current), []);
+
+  const first = Math.max(0, Math.floor(scrollTop / itemHeight) - overscan);
+  const last = Math.min(itemCount - 1, Math.ceil((scrollTop + height) / itemHeight) + overscan);
+
+  useEffect(() => {
+    if (onEndReached && last >= itemCount - endThreshold) {
+      onEndReached();
+    }
+  }, [last, itemCount, endThreshold, onEndReached]);
+
+  const rows = [];
+  for (let index = first; index <= last; index++) {
+    rows.push(renderItem(index, {
+      position: 'absolute',
+      top: index * itemHeight,
+      left: 0,
+      right: 0,
+      height: itemHeight
+    }));
+  }
+
+  return (
+    <div ref={scrollerRef} onScroll={onScroll} style={{ height, overflowY: 'auto', position: 'relative' }}>
+      <div style={{ height: itemCount * itemHeight, position: 'relative' }}>
+        {rows}
+      </div>
+    </div>
+  );
+}
@@ -0,0 +1,125 @@
+import { useCallback, useEffect, useMemo, useReducer, useRef } from 'react';
+import { createItem, fetchItems } from '../api';
+
+// Items live in immutable chunks: fetched pages are appended and new
+// items go into a small head chunk, so an insert never copies the list
+const initialState = {
+  head: [],
+  pages: [],
+  cursor: null,
+  hasMore: true,
+  loading: false,
+  error: null
+};
+
+function reducer(state, action) {
+  switch (action.type) {
+    case 'load':
+      return { ...state, loading: true, error: null };
+    case 'loaded':
+      return {
+        ...state,
+        pages: action.items.length ? [...state.pages, action.items] : state.pages,
+        cursor: action.nextCursor,
+        hasMore: action.nextCursor !== null,
+        loading: false
+      };
+    case 'failed':
+      return { ...state, loading: false, error: action.error };
+    case 'error':
+      return { ...state, error: action.error };
+    case 'add':
+      return { ...state, head: [action.item, ...state.head] };
+    case 'replace':
+      return { ...state, head: state.head.map((item) => (item.id === action.id ? action.item : item)) };
+    case 'remove':
+      return { ...state, head: state.head.filter((item) => item.id !== action.id) };
+    default:
+      return state;
+  }
+}
+
+let tempId = 0;
+
+export default function useItems() {
+  const [state, dispatch] = useReducer(reducer, initialState);
+  const loadingRef = useRef(false);
+  const abortRef = useRef(null);
+
+  const loadMore = useCallback(() => {
+    if (loadingRef.current || !state.hasMore) return;
+    loadingRef.current = true;
+    const controller = new AbortController();
+    abortRef.current = controller;
+    dispatch({ type: 'load' });
+
+    fetchItems(state.cursor, controller.signal)
+      .then((page) => dispatch({ type: 'loaded', items: page.items, nextCursor: page.nextCursor }))
+      .catch((error) => {
+        if (error.name !== 'AbortError') dispatch({ type: 'failed', error: error.message });
+      })
+      .finally(() => {
+        loadingRef.current = false;
+      });
+  }, [state.cursor, state.hasMore]);
+
+  // First page on mount; abort any page still loading on unmount
+  useEffect(() => {
+    loadMore();
+    return () => abortRef.current && abortRef.current.abort();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  // Show the item immediately, then swap in the saved row (or roll back)
+  const addItem = useCallback(async ({ name, description }) => {
+    const id = `temp-${++tempId}`;
+    dispatch({ type: 'add', item: { id, name, description, pending: true } });
+    try {
+      const saved = await createItem({ name, description });
+      dispatch({ type: 'replace', id, item: saved });
+      return true;
+    } catch (error) {
+      dispatch({ type: 'remove', id });
+      dispatch({ type: 'error', error: error.message });
+      return false;
+    }
+  }, []);
+
+  // Start offset of every page, for O(log pages) index lookups
+  const offsets = useMemo(() => {
+    const result = [];
+    let total = 0;
+    for (const page of state.pages) {
+      result.push(total);
+      total += page.length;
+    }
+    result.push(total);
+    return result;
+  }, [state.pages]);
+
+  const count = state.head.length + offsets[offsets.length - 1];
+
+  const getItem = useCallback((index) => {
+    if (index < state.head.length) return state.head[index];
+    const target = index - state.head.length;
+    let lo = 0;
+    let hi = state.pages.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (offsets[mid] <= target) lo = mid;
+      else hi = mid - 1;
+    }
+    const page = state.pages[lo];
+    return page ? page[target - offsets[lo]] : undefined;
+  }, [state.head, state.pages, offsets]);
+
+  return {
+    count,
+    getItem,
+    loadMore,
+    addItem,
+    hasMore: state.hasMore,
+    loading: state.loading,
+    error: state.error
+  };
+}
@@ -0,0 +1,49 @@
+#!/usr/bin/env node
+// Quick load test against a running server: `npm start` then `npm run loadtest`.
+// Env: TARGET (default http://localhost:3000), DURATION seconds, CONNECTIONS, SEED rows.
+const autocannon = require('autocannon');
+
+const TARGET = process.env.TARGET || 'http://localhost:3000';
+const DURATION = parseInt(process.env.DURATION, 10) || 10;
+const CONNECTIONS = parseInt(process.env.CONNECTIONS, 10) || 50;
+const SEED = parseInt(process.env.SEED, 10) || 1000;
+
+async function seed() {
+  const { total } = await (await fetch(`${TARGET}/api/items/count`)).json();
+  for (let i = total; i < SEED; i++) {
+    await fetch(`${TARGET}/api/items`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ name: `Load test item ${i}`, description: 'Seeded by scripts/load-test.js' })
+    });
+  }
+}
+
+function run(title, opts) {
+  return new Promise((resolve, reject) => {
+    const instance = autocannon({ url: TARGET, connections: CONNECTIONS, duration: DURATION, ...opts }, (err, result) => {
+      if (err) return reject(err);
+      console.log(`\n${title}`);
+      console.log(`  req/s  avg ${result.requests.average}  p99 latency ${result.latency.p99} ms`);
+      console.log(`  2xx ${result['2xx']}  non-2xx ${result.non2xx}  errors ${result.errors}`);
+      resolve(result);
+    });
+    autocannon.track(instance, { renderProgressBar: false, renderResultsTable: false });
+  });
+}
+
+(async () => {
+  await seed();
+  await run('GET /api/items (first page)', { requests: [{ method: 'GET', path: '/api/items?limit=50' }] });
+  await run('POST /api/items', {
+    requests: [{
+      method: 'POST',
+      path: '/api/items',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ name: 'load', description: 'load test write' })
+    }]
+  });
+})().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,153 @@
+const express = require('express');
+const cors = require('cors');
+const compression = require('compression');
+const Database = require('better-sqlite3');
+const fs = require('fs');
+const path = require('path');
+
+const app = express();
+const PORT = process.env.PORT || 3000;
+const DB_PATH = process.env.DB_PATH || path.join(__dirname, 'database', 'app.db');
+const BUILD_DIR = path.join(__dirname, 'client/build');
+
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+
+// Middleware
+app.disable('x-powered-by');
+app.use(compression());
+app.use(cors());
+app.use(express.json({ limit: '100kb' }));
+
+// Hashed build assets never change; index.html must always be revalidated
+app.use(express.static(BUILD_DIR, {
+  index: false,
+  setHeaders: (res, filePath) => {
+    if (filePath.includes(`${path.sep}static${path.sep}`)) {
+      res.setHeader('Cache-Control', 'public, max-age=31536000, immutable');
+    } else {
+      res.setHeader('Cache-Control', 'no-cache');
+    }
+  }
+}));
+
+// Initialize database
+fs.mkdirSync(path.dirname(DB_PATH), { recursive: true });
+const db = new Database(DB_PATH);
+
+// WAL lets reads run alongside the single writer; NORMAL is durable in WAL mode
+db.pragma('journal_mode = WAL');
+db.pragma('synchronous = NORMAL');
+db.pragma('busy_timeout = 5000');
+db.pragma('foreign_keys = ON');
+db.pragma('temp_store = MEMORY');
+db.pragma('cache_size = -16000');
+db.pragma('mmap_size = 134217728');
+
+// Create tables
+db.exec(`
+  CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  );
+  CREATE INDEX IF NOT EXISTS idx_items_created_at ON items (created_at, id);
+`);
+
+// Prepared once, reused by every request
+const statements = {
+  firstPage: db.prepare(`
+    SELECT id, name, description, created_at FROM items
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+  `),
+  nextPage: db.prepare(`
+    SELECT id, name, description, created_at FROM items
+    WHERE (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+  `),
+  insert: db.prepare(`
+    INSERT INTO items (name, description) VALUES (?, ?)
+    RETURNING id, name, description, created_at
+  `),
+  count: db.prepare('SELECT COUNT(*) AS total FROM items'),
+};
+
+// Opaque keyset cursor: the (created_at, id) of the last row served
+function encodeCursor(row) {
+  return Buffer.from(JSON.stringify([row.created_at, row.id])).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString());
+    return typeof createdAt === 'string' && Number.isInteger(id) ? [createdAt, id] : null;
+  } catch (e) {
+    return null;
+  }
+}
+
+// API Routes
+app.get('/api/items', (req, res) => {
+  const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+
+  let rows;
+  if (req.query.cursor) {
+    const cursor = decodeCursor(req.query.cursor);
+    if (!cursor) {
+      return res.status(400).json({ error: 'Invalid cursor' });
+    }
+    rows = statements.nextPage.all(cursor[0], cursor[1], limit + 1);
+  } else {
+    rows = statements.firstPage.all(limit + 1);
+  }
+
+  // One extra row tells us whether another page exists without a COUNT
+  const hasMore = rows.length > limit;
+  const items = hasMore ? rows.slice(0, limit) : rows;
+  res.json({
+    items,
+    nextCursor: hasMore ? encodeCursor(items[items.length - 1]) : null
+  });
+});
+
+app.get('/api/items/count', (req, res) => {
+  res.json(statements.count.get());
+});
+
+app.post('/api/items', (req, res) => {
+  const { name, description } = req.body || {};
+  if (typeof name !== 'string' || !name.trim()) {
+    return res.status(400).json({ error: 'name is required' });
+  }
+  const item = statements.insert.get(name.trim(), description || null);
+  res.status(201).json(item);
+});
+
+// AI-infused apps get their routes from the ai template layer
+const aiRoutes = path.join(__dirname, 'routes', 'ai.js');
+if (fs.existsSync(aiRoutes)) {
+  app.use('/api/ai', require(aiRoutes));
+}
+
+// Serve React app
+app.get('*', (req, res) => {
+  res.setHeader('Cache-Control', 'no-cache');
+  res.sendFile(path.join(BUILD_DIR, 'index.html'));
+});
+
+const server = app.listen(PORT, () => {
+  console.log(`Server running on http://localhost:${PORT}`);
+});
+
+// Checkpoint the WAL and release the database on shutdown
+function shutdown() {
+  server.close(() => {
+    db.close();
+    process.exit(0);
+  });
+}
+process.on('SIGTERM', shutdown);
+process.on('SIGINT', shutdown);
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app's modules the way vibe_coder.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
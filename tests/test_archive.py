@@ -0,0 +1,67 @@
+"""Packing projects into the archive and extracting them back."""
+
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from core.archive import ProjectArchive
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ProjectArchive(str(tmp_path / 'projects'))
+
+
+def test_round_trip_keeps_links_inside_the_project(archive, tmp_path):
+    app = tmp_path / 'projects' / 'vibe-app'
+    (app / 'src').mkdir(parents=True)
+    (app / 'src' / 'index.js').write_text('hello')
+    (app / 'index.js').symlink_to('src/index.js')
+    (app / 'README.md').write_text('readme')
+    (app / 'README.md').chmod(0o444)
+
+    archive.archive_project('vibe-app')
+    assert not app.exists()
+    archive.ensure_extracted('vibe-app')
+
+    assert (app / 'index.js').is_symlink()
+    assert (app / 'index.js').read_text() == 'hello'
+    assert os.access(app / 'README.md', os.W_OK)
+    assert not archive.is_archived('vibe-app')
+
+
+def test_links_out_of_the_project_are_not_extracted(archive, tmp_path):
+    projects = tmp_path / 'projects'
+    (projects / '.archive').mkdir(parents=True)
+    (projects / 'secret.txt').write_text('secret')
+
+    def member(name, **attrs):
+        info = tarfile.TarInfo(name)
+        for key, value in attrs.items():
+            setattr(info, key, value)
+        return info
+
+    with tarfile.open(projects / '.archive' / 'vibe-evil.tar.gz', 'w:gz') as tar:
+        tar.addfile(member('vibe-evil', type=tarfile.DIRTYPE, mode=0o755))
+        tar.addfile(member('vibe-evil/escape', type=tarfile.SYMTYPE, linkname='../..'))
+        tar.addfile(member('vibe-evil/absolute', type=tarfile.SYMTYPE, linkname=str(tmp_path)))
+        tar.addfile(member('vibe-evil/secret', type=tarfile.LNKTYPE, linkname='secret.txt'))
+        data = b'pwned'
+        tar.addfile(member('vibe-evil/escape/pwned.txt', size=len(data)), io.BytesIO(data))
+        tar.addfile(member('vibe-evil/ok.txt', size=len(data)), io.BytesIO(data))
+    with open(projects / '.archive' / 'manifest.json', 'w') as f:
+        json.dump({'vibe-evil': {'archive': 'vibe-evil.tar.gz'}}, f)
+
+    archive.ensure_extracted('vibe-evil')
+
+    app = projects / 'vibe-evil'
+    assert (app / 'ok.txt').read_text() == 'pwned'
+    # escape/ is only a plain directory, made for escape/pwned.txt
+    assert not (app / 'escape').is_symlink()
+    assert not os.path.lexists(app / 'absolute')
+    assert not os.path.lexists(app / 'secret')
+    assert not (tmp_path / 'pwned.txt').exists()
+    assert (projects / 'secret.txt').read_text() == 'secret'
@@ -0,0 +1,292 @@
+"""Dependency store: lockfile resolution against a local stub npm registry."""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import tarfile
+import textwrap
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.deps import DependencyError, DependencyStore
+from core.generator import AppGenerator
+from core.profiles import Profile
+from core.templates import TEMPLATE_BUNDLES
+
+needs_npm = pytest.mark.skipif(shutil.which('npm') is None, reason="npm is not installed")
+
+
+def make_tarball(manifest: dict, files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, content in {'package.json': json.dumps(manifest), **files}.items():
+            data = content.encode('utf-8')
+            info = tarfile.TarInfo(f"package/{name}")
+            info.size = len(data)
+            info.mode = 0o755 if name.startswith('bin/') else 0o644
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class StubRegistry:
+    """Serves packuments and tarballs for a few packages over HTTP on localhost."""
+
+    def __init__(self, packages: dict):
+        self.requests = []
+        self.tarballs = {}
+        self.packuments = {}
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                registry.requests.append(self.path)
+                name = self.path.lstrip('/').replace('%2f', '/').replace('%2F', '/')
+                if name in registry.packuments:
+                    body = json.dumps(registry.packuments[name]).encode('utf-8')
+                elif name in registry.tarballs:
+                    body = registry.tarballs[name]
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        for name, (version, dependencies, files, extra) in packages.items():
+            manifest = {'name': name, 'version': version, 'dependencies': dependencies, **extra}
+            data = make_tarball(manifest, files)
+            path = f"{name}/-/{name}-{version}.tgz"
+            self.tarballs[path] = data
+            self.packuments[name] = {
+                'name': name,
+                'dist-tags': {'latest': version},
+                'versions': {version: {**manifest, 'dist': {
+                    'tarball': self.url + path,
+                    'shasum': hashlib.sha1(data).hexdigest(),
+                    'integrity': 'sha512-' + base64.b64encode(hashlib.sha512(data).digest()).decode('ascii'),
+                }}},
+            }
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tarball_requests(self):
+        return [r for r in self.requests if r.endswith('.tgz')]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def registry():
+    registry = StubRegistry({
+        'vibe-stub-a': ('1.2.0', {'vibe-stub-b': '^2.0.0'},
+                        {'index.js': 'module.exports = "a";\n', 'bin/stub-a.js': '#!/usr/bin/env node\n'},
+                        {'bin': {'stub-a': 'bin/stub-a.js'}}),
+        'vibe-stub-b': ('2.0.1', {}, {'index.js': 'module.exports = "b";\n'}, {}),
+    })
+    yield registry
+    registry.close()
+
+
+def fake_npm(tmp_path, exit_code=1):
+    """An `npm` that logs each call and fails."""
+    npm = tmp_path / 'npm'
+    npm.write_text(textwrap.dedent(f"""\
+        #!/bin/sh
+        echo "$*" >> "{tmp_path}/npm.log"
+        echo "npm ERR! network unreachable" >&2
+        exit {exit_code}
+    """))
+    npm.chmod(npm.stat().st_mode | stat.S_IXUSR)
+    return str(npm)
+
+
+def npm_calls(tmp_path):
+    log = tmp_path / 'npm.log'
+    return log.read_text().splitlines() if log.exists() else []
+
+
+PACKAGE = {'name': 'app', 'version': '1.0.0', 'dependencies': {'vibe-stub-a': '^1.0.0'}}
+
+
+@needs_npm
+def test_lockfile_is_resolved_once_and_installs_offline(tmp_path, registry, monkeypatch):
+    monkeypatch.delenv('VIBE_NPM_REGISTRY', raising=False)
+    store = DependencyStore(str(tmp_path / '.deps'), registry=registry.url, timeout=60)
+
+    lock = store.lockfile_for('standard', '4', PACKAGE)
+
+    packages = lock['packages']
+    assert packages['node_modules/vibe-stub-a']['version'] == '1.2.0'
+    assert packages['node_modules/vibe-stub-b']['version'] == '2.0.1'
+    assert sorted(registry.tarball_requests()) == [
+        '/vibe-stub-a/-/vibe-stub-a-1.2.0.tgz', '/vibe-stub-b/-/vibe-stub-b-2.0.1.tgz'
+    ]
+    assert store.stats() == {'lockfiles': 1, 'packages': 2, 'failed': 0}
+    assert store.stored_lockfile('standard', '4', PACKAGE) == lock
+
+    # A second store on the same directory reuses the lockfile without npm
+    registry.close()
+    again = DependencyStore(str(tmp_path / '.deps'), registry=registry.url, npm=fake_npm(tmp_path))
+    assert again.lockfile_for('standard', '4', PACKAGE) == lock
+    assert npm_calls(tmp_path) == []
+
+    project = tmp_path / 'app'
+    project.mkdir()
+    (project / 'package.json').write_text(json.dumps(PACKAGE))
+    again.write_lockfile(str(project), lock, 'app')
+    result = again.install(str(project))
+
+    assert (result.packages, result.fetched) == (2, 0)
+    assert (project / 'node_modules' / 'vibe-stub-b' / 'index.js').read_text() == 'module.exports = "b";\n'
+    assert os.readlink(project / 'node_modules' / '.bin' / 'stub-a') == '../vibe-stub-a/bin/stub-a.js'
+    with open(project / 'package-lock.json') as f:
+        assert json.load(f)['name'] == 'app'
+
+
+def test_install_fetches_missing_packages_into_the_store(tmp_path, registry):
+    store = DependencyStore(str(tmp_path / '.deps'), registry=registry.url)
+    packument = registry.packuments['vibe-stub-b']['versions']['2.0.1']
+    lock = {'lockfileVersion': 3, 'packages': {
+        '': {'dependencies': {'vibe-stub-b': '^2.0.0'}},
+        'node_modules/vibe-stub-b': {
+            'version': '2.0.1',
+            'resolved': packument['dist']['tarball'],
+            'integrity': packument['dist']['integrity'],
+        },
+    }}
+    project = tmp_path / 'app'
+    project.mkdir()
+    store.write_lockfile(str(project), lock, 'app')
+
+    result = store.install(str(project))
+
+    assert (result.packages, result.fetched) == (1, 1)
+    assert os.path.isdir(store.package_dir(lock['packages']['node_modules/vibe-stub-b']))
+    assert store.prefetch(lock) == 0
+
+
+def test_packages_the_install_writes_to_are_copied_out_of_the_store(tmp_path, registry):
+    """Bin chmods and npm rebuild must never reach the store's shared files."""
+    store = DependencyStore(str(tmp_path / '.deps'), registry=registry.url, npm=fake_npm(tmp_path, exit_code=0))
+    lock = {'lockfileVersion': 3, 'packages': {'': {'dependencies': {'vibe-stub-a': '^1.0.0'}}}}
+    for name, version in (('vibe-stub-a', '1.2.0'), ('vibe-stub-b', '2.0.1')):
+        dist = registry.packuments[name]['versions'][version]['dist']
+        lock['packages'][f'node_modules/{name}'] = {
+            'version': version, 'resolved': dist['tarball'], 'integrity': dist['integrity'],
+        }
+    lock['packages']['node_modules/vibe-stub-b']['hasInstallScript'] = True
+    project = tmp_path / 'app'
+    project.mkdir()
+    store.write_lockfile(str(project), lock, 'app')
+
+    result = store.install(str(project))
+
+    assert result.rebuilt == ['vibe-stub-b']
+    assert npm_calls(tmp_path)[0].startswith('rebuild --offline')
+    for location, name in (('vibe-stub-a', 'bin/stub-a.js'), ('vibe-stub-a', 'index.js'),
+                           ('vibe-stub-b', 'index.js')):
+        stored = os.path.join(store.package_dir(lock['packages'][f'node_modules/{location}']), name)
+        copied = project / 'node_modules' / location / name
+        assert not os.path.samefile(stored, copied)
+        assert os.stat(stored).st_mode & 0o222 == 0
+        assert os.access(copied, os.W_OK)
+    assert os.access(project / 'node_modules' / '.bin' / 'stub-a', os.X_OK)
+
+
+def test_corrupt_tarball_is_rejected(tmp_path, registry):
+    store = DependencyStore(str(tmp_path / '.deps'), registry=registry.url)
+    entry = dict(registry.packuments['vibe-stub-b']['versions']['2.0.1']['dist'])
+    entry = {'resolved': entry['tarball'],
+             'integrity': 'sha512-' + base64.b64encode(hashlib.sha512(b'other').digest()).decode('ascii')}
+
+    with pytest.raises(DependencyError, match='integrity mismatch'):
+        store.prefetch({'packages': {'node_modules/vibe-stub-b': entry}})
+    assert store.stats()['packages'] == 0
+
+
+def test_failed_resolution_is_not_retried_by_later_stores(tmp_path):
+    npm = fake_npm(tmp_path)
+    store_dir = str(tmp_path / '.deps')
+
+    with pytest.raises(DependencyError, match='network unreachable'):
+        DependencyStore(store_dir, npm=npm).lockfile_for('standard', '4', PACKAGE)
+    assert len(npm_calls(tmp_path)) == 1
+
+    # A new store (a later cycle, or another process) remembers the failure
+    later = DependencyStore(store_dir, npm=npm)
+    with pytest.raises(DependencyError, match='not retried'):
+        later.lockfile_for('standard', '4', PACKAGE)
+    assert len(npm_calls(tmp_path)) == 1
+    assert later.stats()['failed'] == 1
+
+    # Forced (`vibe_coder.py deps`), or once retry_seconds pass, it runs again
+    with pytest.raises(DependencyError):
+        later.lockfile_for('standard', '4', PACKAGE, force=True)
+    with pytest.raises(DependencyError):
+        DependencyStore(store_dir, npm=npm, retry_seconds=0).lockfile_for('standard', '4', PACKAGE)
+    assert len(npm_calls(tmp_path)) == 3
+
+
+def make_generator(tmp_path, npm):
+    config = {'deps': {'npm_path': npm, 'registry': 'http://127.0.0.1:9/'}}
+    profile = Profile('default', config, str(tmp_path / 'projects'), str(tmp_path / 'state'),
+                      str(tmp_path / 'logs'), str(tmp_path / 'projects'))
+    return AppGenerator(config, profile)
+
+
+def test_generation_only_copies_stored_lockfiles(tmp_path, monkeypatch):
+    monkeypatch.delenv('VIBE_NPM_REGISTRY', raising=False)
+    generator = make_generator(tmp_path, fake_npm(tmp_path))
+
+    app = tmp_path / 'work' / 'vibe-one'
+    files = generator._create_template_app(str(app), '', is_ai_infused=False)
+
+    assert 'package-lock.json' not in files
+    assert not (app / 'package-lock.json').exists()
+    assert npm_calls(tmp_path) == []
+
+    # Once the store has the lockfile templates, generated apps get them
+    store = generator.dep_store
+    version = TEMPLATE_BUNDLES['standard']['version']
+    for template, _, package in generator._template_packages(str(app), 'standard', json.loads(
+            (app / 'package.json').read_text())):
+        key = store.lock_key(template, version, package)
+        with open(os.path.join(store.locks_dir, f"{key}.json"), 'w') as f:
+            json.dump({'name': 'x', 'lockfileVersion': 3, 'packages': {'': {'name': 'x'}}}, f)
+
+    app = tmp_path / 'work' / 'vibe-two'
+    files = generator._create_template_app(str(app), '', is_ai_infused=False)
+
+    assert {'package-lock.json', 'client/package-lock.json'} <= set(files)
+    with open(app / 'package-lock.json') as f:
+        assert json.load(f)['packages']['']['name'] == 'vibe-two'
+    assert npm_calls(tmp_path) == []
+
+
+def test_prepare_dependencies_resolves_every_template(tmp_path, monkeypatch):
+    monkeypatch.delenv('VIBE_NPM_REGISTRY', raising=False)
+    generator = make_generator(tmp_path, fake_npm(tmp_path))
+
+    stats = generator.prepare_dependencies()
+    # Both bundles share the client template, so three distinct resolutions
+    assert stats['failed'] == 3
+    assert len(npm_calls(tmp_path)) == 3
+
+    generator.prepare_dependencies()
+    assert len(npm_calls(tmp_path)) == 3
+    generator.prepare_dependencies(force=True)
+    assert len(npm_calls(tmp_path)) == 6
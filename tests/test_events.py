@@ -0,0 +1,51 @@
+"""Event bus and its local socket server."""
+
+import asyncio
+
+import yaml
+
+from core.config import CONFIG_FILE
+from core.events import CYCLE_DONE, EventBus, EventServer, event_address, stream_events
+
+
+def test_tcp_fallback_is_off_by_default():
+    with open(CONFIG_FILE) as f:
+        config = yaml.safe_load(f)
+    config['events']['socket'] = ''
+
+    assert event_address(config) == (None, 0)
+    assert EventServer.from_config(EventBus(), config) is None
+
+
+def test_tcp_fallback_binds_to_localhost_only():
+    bus = EventBus()
+    config = {'events': {'socket': '', 'port': 0}}
+
+    async def run():
+        server = EventServer(bus, port=0)
+        await server.start()
+        try:
+            host, port = server._server.sockets[0].getsockname()[:2]
+            config['events']['port'] = port
+            received = asyncio.ensure_future(asyncio.to_thread(lambda: next(stream_events(config))))
+            await asyncio.sleep(0.2)
+            bus.publish(CYCLE_DONE, cycle_id='c1')
+            event = await asyncio.wait_for(received, 5)
+        finally:
+            await server.stop()
+        return host, event
+
+    host, event = asyncio.run(run())
+
+    assert host == '127.0.0.1'
+    assert (event.type, event.data) == (CYCLE_DONE, {'cycle_id': 'c1'})
+
+
+def test_slow_subscriber_loses_oldest_events():
+    bus = EventBus()
+    with bus.subscribe(maxsize=2) as subscription:
+        for i in range(3):
+            bus.publish(CYCLE_DONE, n=i)
+
+        assert [subscription.get(0).data['n'] for _ in range(2)] == [1, 2]
+        assert subscription.dropped == 1
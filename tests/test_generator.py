@@ -0,0 +1,120 @@
+"""Failed generations, and rolling back projects a cut-off generation left part-way."""
+
+import asyncio
+import subprocess
+
+import pytest
+
+from core.generator import AppGenerator
+from core.journal import GENERATING, SYNCING
+from core.profiles import Profile
+
+
+@pytest.fixture
+def generator(tmp_path):
+    config = {'deps': {'enabled': False}}
+    profile = Profile('default', config, str(tmp_path / 'projects'), str(tmp_path / 'state'),
+                      str(tmp_path / 'logs'), str(tmp_path / 'projects'))
+    return AppGenerator(config, profile)
+
+
+def git(path, *args):
+    return subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+                          cwd=path, check=True, capture_output=True, text=True).stdout
+
+
+def roll_back(generator, name, **project):
+    path = generator.projects_dir + '/' + name
+    asyncio.run(generator._roll_back_project(name, path, project))
+    return path
+
+
+def test_project_created_by_the_run_is_removed(generator, tmp_path):
+    app = tmp_path / 'projects' / 'vibe-new'
+    app.mkdir(parents=True)
+    (app / 'index.js').write_text('half written')
+
+    roll_back(generator, 'vibe-new', existed=False, stage=SYNCING, paths=['index.js'])
+
+    assert not app.exists()
+
+
+@pytest.mark.parametrize('setup', ['no-git', 'no-commits'])
+def test_existing_project_without_commits_is_left_alone(generator, tmp_path, setup):
+    app = tmp_path / 'projects' / 'vibe-mine'
+    app.mkdir(parents=True)
+    if setup == 'no-commits':
+        git(app, 'init', '-q')
+    (app / 'notes.txt').write_text('my notes')
+    (app / 'index.js').write_text('synced')
+
+    roll_back(generator, 'vibe-mine', existed=True, stage=SYNCING, paths=['index.js'])
+
+    assert (app / 'notes.txt').read_text() == 'my notes'
+    assert (app / 'index.js').read_text() == 'synced'
+
+
+def test_existing_project_only_loses_what_the_sync_wrote(generator, tmp_path):
+    """A user's repo on master: synced paths go back to HEAD, the user's own work stays."""
+    app = tmp_path / 'projects' / 'vibe-mine'
+    app.mkdir(parents=True)
+    git(app, 'init', '-q', '-b', 'master')
+    (app / 'index.js').write_text('v1')
+    (app / 'lib.js').write_text('lib v1')
+    git(app, 'add', '.')
+    git(app, 'commit', '-qm', 'init')
+
+    # The cut-off sync rewrote index.js and added new.js
+    (app / 'index.js').write_text('v2 partial')
+    (app / 'new.js').write_text('generated')
+    # The user's uncommitted work
+    (app / 'lib.js').write_text('lib edited by hand')
+    (app / 'notes.txt').write_text('my notes')
+
+    roll_back(generator, 'vibe-mine', existed=True, stage=SYNCING, paths=['index.js', 'new.js'])
+
+    assert (app / 'index.js').read_text() == 'v1'
+    assert not (app / 'new.js').exists()
+    assert (app / 'lib.js').read_text() == 'lib edited by hand'
+    assert (app / 'notes.txt').read_text() == 'my notes'
+
+
+def test_existing_project_untouched_before_the_sync(generator, tmp_path):
+    app = tmp_path / 'projects' / 'vibe-mine'
+    app.mkdir(parents=True)
+    (app / 'notes.txt').write_text('my notes')
+
+    roll_back(generator, 'vibe-mine', existed=True, stage=GENERATING)
+
+    assert (app / 'notes.txt').read_text() == 'my notes'
+
+
+def make_fake_tool(tmp_path, script):
+    tool = tmp_path / 'fake-qwen'
+    tool.write_text('#!/bin/sh\n' + script)
+    tool.chmod(0o755)
+    return str(tool)
+
+
+def generate(generator):
+    return asyncio.run(generator.generate_app('Vibe Broken', 'desc', ['a'], 'idea-1', is_ai_infused=False))
+
+
+@pytest.mark.parametrize('script', [
+    # Wrote something, then failed
+    'for a; do case "$prev" in --output) echo partial > "$a/index.js";; esac; prev=$a; done\nexit 1\n',
+    # Succeeded without writing anything
+    'exit 0\n',
+], ids=['exit-1', 'no-files'])
+def test_failed_tool_run_is_not_committed_or_published(generator, tmp_path, script):
+    generator.tool_path = make_fake_tool(tmp_path, script)
+    generator.use_cache = False
+
+    result = generate(generator)
+
+    assert not result.success
+    assert result.git_commit is None and result.publish_job is None
+    app = tmp_path / 'projects' / result.app_name
+    assert not (app / '.git').exists()
+    assert not (app / 'index.js').exists()
+    assert generator.outbox.jobs() == []
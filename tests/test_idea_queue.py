@@ -0,0 +1,293 @@
+"""Shared idea queue: claim exclusivity, lease expiry and handing claims back."""
+
+import asyncio
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+
+from core.duplicate_checker import DuplicateCheck, DuplicateChecker
+from core.idea_queue import DONE, DUPLICATE, FAILED, GENERATING, LEASED, QUEUED, IdeaQueue
+from core.journal import CycleJournal
+from core.pipeline import CyclePipeline
+from core.research import AppIdea
+
+
+def make_ideas(count, prefix='idea'):
+    return [AppIdea(id=f"{prefix}-{i}", title=f"App {i}", description=f"Does thing {i}",
+                    trend_source='test', priority=float(i % 3)) for i in range(count)]
+
+
+def make_queue(db_file, worker_id, **kwargs):
+    return IdeaQueue(str(db_file), worker_id=worker_id, **kwargs)
+
+
+def status_of(queue, idea_id):
+    with sqlite3.connect(queue.db_file) as db:
+        row = db.execute("SELECT status, owner, attempts FROM ideas WHERE idea_id = ?", (idea_id,)).fetchone()
+    return row
+
+
+def claim_all(db_file, worker_id, results):
+    queue = make_queue(db_file, worker_id)
+    claimed = []
+    while True:
+        idea = queue.claim()
+        if idea is None:
+            break
+        claimed.append(idea.id)
+    results.put((worker_id, claimed))
+
+
+def test_concurrent_workers_never_claim_the_same_idea(tmp_path):
+    db_file = tmp_path / 'ideas.db'
+    assert make_queue(db_file, 'seed').enqueue(make_ideas(60)) == 60
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=claim_all, args=(str(db_file), f"w{i}", results)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = dict(results.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=60)
+
+    every_claim = [idea_id for ids in claimed.values() for idea_id in ids]
+    assert len(every_claim) == 60
+    assert len(set(every_claim)) == 60
+    assert make_queue(db_file, 'seed').stats()['counts'] == {LEASED: 60}
+
+
+def test_claims_follow_priority_then_order(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1')
+    queue.enqueue(make_ideas(6))
+
+    assert [queue.claim().id for _ in range(6)] == ['idea-2', 'idea-5', 'idea-1', 'idea-4', 'idea-0', 'idea-3']
+    assert queue.claim() is None
+
+
+def test_enqueue_ignores_ideas_already_queued(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1')
+    assert queue.enqueue(make_ideas(3)) == 3
+    assert queue.enqueue(make_ideas(5)) == 2
+
+
+def test_expired_lease_goes_back_to_the_queue(tmp_path):
+    db_file = tmp_path / 'ideas.db'
+    dead = make_queue(db_file, 'dead', lease_seconds=0.2)
+    alive = make_queue(db_file, 'alive', lease_seconds=0.2)
+    dead.enqueue(make_ideas(1))
+
+    assert dead.claim().id == 'idea-0'
+    assert alive.claim() is None
+
+    time.sleep(0.3)
+    assert alive.claim().id == 'idea-0'
+    assert status_of(alive, 'idea-0') == (LEASED, 'alive', 1)
+    # The worker that lost its lease can no longer start the idea
+    assert dead.start('idea-0') is False
+    assert alive.start('idea-0') is True
+
+
+def test_heartbeats_keep_the_lease(tmp_path):
+    db_file = tmp_path / 'ideas.db'
+    holder = make_queue(db_file, 'holder', lease_seconds=0.3)
+    other = make_queue(db_file, 'other', lease_seconds=0.3)
+    holder.enqueue(make_ideas(1))
+    holder.claim()
+
+    for _ in range(3):
+        time.sleep(0.15)
+        assert holder.heartbeat() == 1
+        assert other.claim() is None
+    assert holder.start('idea-0') is True
+
+
+def test_lease_expiring_too_often_fails_the_idea(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1', lease_seconds=0.05, max_attempts=2)
+    queue.enqueue(make_ideas(1))
+
+    assert queue.claim() is not None
+    time.sleep(0.1)
+    assert queue.claim() is not None
+    time.sleep(0.1)
+    assert queue.claim() is None
+    assert status_of(queue, 'idea-0')[0] == FAILED
+
+
+def test_generation_is_never_handed_out_twice(tmp_path):
+    db_file = tmp_path / 'ideas.db'
+    dead = make_queue(db_file, 'dead', lease_seconds=0.05)
+    dead.enqueue(make_ideas(1))
+    dead.claim()
+    assert dead.start('idea-0')
+
+    time.sleep(0.1)
+    assert make_queue(db_file, 'other').claim() is None
+    assert status_of(dead, 'idea-0')[0] == FAILED
+
+
+def test_stale_queued_ideas_are_dropped(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1', max_age_hours=1)
+    queue.enqueue(make_ideas(2))
+    with sqlite3.connect(queue.db_file) as db:
+        db.execute("UPDATE ideas SET enqueued_at = ? WHERE idea_id = 'idea-0'", (time.time() - 7200,))
+
+    assert queue.claim().id == 'idea-1'
+    assert queue.claim() is None
+    assert status_of(queue, 'idea-0') is None
+    # Research may bring it back later
+    assert queue.enqueue(make_ideas(1)) == 1
+
+
+def test_settle_requeues_unstarted_and_fails_interrupted(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1')
+    queue.enqueue(make_ideas(3))
+    for _ in range(3):
+        queue.claim()
+    queue.start('idea-1')
+    queue.start('idea-2')
+
+    class Result:
+        idea_id, app_name, success, error = 'idea-1', 'vibe-app-1', True, None
+
+    queue.settle([Result()])
+
+    assert status_of(queue, 'idea-0')[0] == QUEUED
+    assert status_of(queue, 'idea-1')[0] == DONE
+    assert status_of(queue, 'idea-2')[0] == FAILED
+
+
+def test_resumed_cycle_hands_back_the_killed_runs_claims(tmp_path):
+    """A restarted process has a new worker id; the journal links it to the old one."""
+    db_file = tmp_path / 'ideas.db'
+    journal_file = str(tmp_path / 'cycle.json')
+    killed = make_queue(db_file, 'host-111')
+    killed.enqueue(make_ideas(3))
+    assert CycleJournal(journal_file).begin(killed.worker_id) is False
+    for _ in range(3):
+        killed.claim()
+    killed.start('idea-1')   # then rolled back on resume
+    killed.start('idea-2')   # built before the kill
+
+    restarted = make_queue(db_file, 'host-222')
+    journal = CycleJournal(journal_file)
+    assert journal.begin(restarted.worker_id) is True
+    assert journal.previous_workers() == ['host-111']
+
+    assert restarted.adopt(journal.previous_workers()) == 3
+    # Only leased, so it can be claimed again right away
+    assert status_of(restarted, 'idea-0') == (QUEUED, None, 0)
+    assert status_of(restarted, 'idea-1') == (GENERATING, 'host-222', 0)
+    restarted.release('idea-1')
+
+    class Built:
+        idea_id, app_name, success, error = 'idea-2', 'vibe-app-2', True, None
+
+    restarted.settle([Built()])
+
+    assert status_of(restarted, 'idea-1') == (QUEUED, None, 0)
+    assert status_of(restarted, 'idea-2')[0] == DONE
+    assert restarted.adopt(['host-111']) == 0
+
+
+def test_pipeline_claims_no_more_than_its_idea_limit(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1')
+    queue.enqueue(make_ideas(10))
+    pipeline = CyclePipeline(None, None, None, idea_queue=queue)
+
+    async def claim(limit):
+        candidates = asyncio.Queue()
+        await pipeline._claim_ideas(candidates, {'idea-2'}, limit)
+        return [candidates.get_nowait().id for _ in range(candidates.qsize())]
+
+    claimed = asyncio.run(claim(3))
+
+    # idea-2 was already built this cycle, so it's finished instead of counted
+    assert claimed == ['idea-5', 'idea-8', 'idea-1']
+    assert status_of(queue, 'idea-2')[0] == DONE
+    assert queue.stats()['counts'] == {QUEUED: 6, LEASED: 3, DONE: 1}
+
+
+def test_in_flight_is_only_other_workers_generations_and_builds(tmp_path):
+    db_file = tmp_path / 'ideas.db'
+    mine = make_queue(db_file, 'w1')
+    other = make_queue(db_file, 'w2')
+    mine.enqueue(make_ideas(6))
+    # w1 leases three ideas ahead and starts one
+    assert [mine.claim().id for _ in range(3)] == ['idea-2', 'idea-5', 'idea-1']
+    mine.start('idea-2')
+    # w2 built one, is generating one and has one leased
+    assert [other.claim().id for _ in range(3)] == ['idea-4', 'idea-0', 'idea-3']
+    other.start('idea-4')
+    other.finish('idea-4', DONE, app_name='vibe-app-4')
+    other.start('idea-0')
+
+    assert {r['idea_id'] for r in mine.in_flight('idea-5')} == {'idea-4', 'idea-0'}
+    assert {r['idea_id'] for r in other.in_flight('idea-3')} == {'idea-2'}
+
+
+def make_ai_idea(idea_id, trend):
+    # Research's templated description, the same for every AI idea
+    return AppIdea(id=idea_id, title=f"AI-Powered: {trend}", trend_source='hackernews',
+                   description="AI-infused app with text generation inspired by: a trending project")
+
+
+def make_checker(tmp_path, worker_id):
+    return DuplicateChecker(registry=make_queue(tmp_path / 'ideas.db', worker_id),
+                            projects_dir=str(tmp_path / 'projects'), state_dir=str(tmp_path / 'state'))
+
+
+def test_in_flight_check_compares_titles_not_templated_descriptions(tmp_path):
+    builder = make_queue(tmp_path / 'ideas.db', 'w2')
+    building = make_ai_idea('ai-0', 'Show HN: A tiny database')
+    builder.enqueue([building])
+    builder.claim()
+    builder.start(building.id)
+    checker = make_checker(tmp_path, 'w1')
+
+    assert checker.check_in_flight('ai-1', 'AI-Powered: Show HN: I built a game engine')[0] is False
+    assert checker.check_in_flight('ai-2', 'AI-Powered: Show HN: A tiny database in Rust')[0] is True
+
+
+@pytest.mark.parametrize('finished', [False, True], ids=['generating', 'built'])
+def test_duplicate_of_a_running_generation_is_pending(tmp_path, monkeypatch, finished):
+    builder = make_queue(tmp_path / 'ideas.db', 'w2')
+    building = make_ai_idea('ai-0', 'Show HN: A tiny database')
+    builder.enqueue([building])
+    builder.claim()
+    builder.start(building.id)
+    if finished:
+        builder.finish(building.id, DONE, app_name='vibe-tiny-database')
+    checker = make_checker(tmp_path, 'w1')
+
+    async def no_repos(refresh=False):
+        return []
+
+    monkeypatch.setattr(checker, 'fetch_repo_catalog', no_repos)
+    idea = make_ai_idea('ai-1', 'Show HN: A tiny database')
+    check = asyncio.run(checker.check_duplicate(idea.id, idea.title, idea.description))
+
+    assert check.is_duplicate
+    assert check.pending is not finished
+
+
+def test_pending_duplicates_go_back_to_the_queue(tmp_path):
+    queue = make_queue(tmp_path / 'ideas.db', 'w1')
+    pending, duplicate = make_ideas(2)
+    queue.enqueue([pending, duplicate])
+    queue.claim(), queue.claim()
+    pipeline = CyclePipeline(None, None, None, idea_queue=queue)
+
+    def check(idea, **kwargs):
+        return DuplicateCheck(idea_id=idea.id, is_duplicate=True, similarity_score=0.9,
+                              matching_projects=[], checked_at='2026-10-19T00:00:00', **kwargs)
+
+    assert asyncio.run(pipeline._settle_verdict(pending, check(pending, pending=True))) is False
+    assert asyncio.run(pipeline._settle_verdict(duplicate, check(duplicate))) is False
+
+    assert status_of(queue, duplicate.id)[0] == DUPLICATE
+    assert status_of(queue, pending.id)[0] == LEASED
+    queue.settle()
+    assert status_of(queue, pending.id)[0] == QUEUED
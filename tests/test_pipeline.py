@@ -0,0 +1,36 @@
+"""The cycle pipeline's backlog of verified ideas."""
+
+import time
+
+from core.duplicate_checker import DuplicateCheck
+from core.pipeline import IdeaBacklog
+from core.research import AppIdea
+
+
+def make_idea(idea_id):
+    return AppIdea(id=idea_id, title=f"App {idea_id}", description='Does a thing', trend_source='test')
+
+
+def make_check(idea_id, score=0.2):
+    return DuplicateCheck(idea_id=idea_id, is_duplicate=False, similarity_score=score,
+                          matching_projects=[], checked_at='2026-10-19T00:00:00')
+
+
+def test_rechecked_ideas_keep_their_age_and_expire(tmp_path, monkeypatch):
+    backlog = IdeaBacklog(str(tmp_path / 'backlog.json'), max_age_hours=1)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    backlog.update(add=[(make_idea('a'), make_check('a'))])
+
+    # Re-verified 50 minutes later: still the same entry, now re-checked
+    now += 50 * 60
+    backlog.update(add=[(make_idea('a'), make_check('a', 0.3))])
+    entry = backlog._read()[0]
+    assert entry['backlogged_at'] == now - 50 * 60
+    assert entry['rechecked_at'] == now
+    assert entry['similarity_score'] == 0.3
+    assert [idea.id for idea in backlog.load()] == ['a']
+
+    # An hour after it was first backlogged, it ages out however often it was re-checked
+    now += 15 * 60
+    assert backlog.load() == []
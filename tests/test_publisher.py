@@ -0,0 +1,198 @@
+"""Publish outbox: retries with backoff against a fake `gh`."""
+
+import asyncio
+import json
+import os
+import stat
+import subprocess
+import textwrap
+import time
+
+import pytest
+
+from core.publisher import DONE, FAILED, QUEUED, PublishOutbox, PublishWorker
+
+
+def make_fake_gh(tmp_path, create_failures=0, create_error='connection reset by peer'):
+    """A `gh` that fails `repo create` create_failures times, logging every call."""
+    (tmp_path / 'failures').write_text(str(create_failures))
+    gh = tmp_path / 'gh'
+    gh.write_text(textwrap.dedent(f"""\
+        #!/bin/sh
+        echo "$*" >> "{tmp_path}/calls.log"
+        case "$1 $2" in
+          "repo create")
+            n=$(cat "{tmp_path}/failures")
+            if [ "$n" -gt 0 ]; then
+              echo $((n - 1)) > "{tmp_path}/failures"
+              echo "{create_error}" >&2
+              exit 1
+            fi
+            echo "https://github.com/me/$3"
+            ;;
+          "repo view")
+            echo "https://github.com/me/$3"
+            ;;
+        esac
+        exit 0
+    """))
+    gh.chmod(gh.stat().st_mode | stat.S_IXUSR)
+    return str(gh)
+
+
+def gh_calls(tmp_path):
+    log = tmp_path / 'calls.log'
+    return log.read_text().splitlines() if log.exists() else []
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return PublishOutbox(str(tmp_path / 'outbox'), str(tmp_path / 'published.json'))
+
+
+def make_worker(outbox, gh, **publish):
+    config = {'publish': {'gh_path': gh, 'backoff_seconds': 30, 'backoff_max_seconds': 3600,
+                          'max_attempts': 3, **publish}}
+    return PublishWorker(outbox, config)
+
+
+def test_failed_publish_is_retried_after_backoff(tmp_path, outbox, monkeypatch):
+    monkeypatch.delenv('VIBE_GH', raising=False)
+    worker = make_worker(outbox, make_fake_gh(tmp_path, create_failures=1))
+    outbox.enqueue('app', str(tmp_path), 'vibe-app', topics=['vibe'])
+
+    job = outbox.claim_due()
+    before = time.time()
+    asyncio.run(worker.process(job))
+
+    [job] = outbox.jobs()
+    assert job.status == QUEUED
+    assert job.attempts == 1
+    assert 'connection reset' in job.last_error
+    # backoff_seconds with +-20% jitter
+    assert before + 24 <= job.next_attempt_at <= time.time() + 36
+    assert outbox.claim_due() is None
+    assert 0 < outbox.next_due_in() <= 36
+
+    job = outbox.claim_due(now=job.next_attempt_at)
+    asyncio.run(worker.process(job))
+
+    assert outbox.jobs() == []
+    with open(outbox.published_file) as f:
+        published = json.load(f)
+    assert published['app']['url'] == 'https://github.com/me/vibe-app'
+    calls = gh_calls(tmp_path)
+    assert [c.split()[:2] for c in calls].count(['repo', 'create']) == 2
+    assert 'repo edit vibe-app --add-topic vibe' in calls
+
+
+def test_backoff_doubles_until_max_attempts(tmp_path, outbox, monkeypatch):
+    monkeypatch.delenv('VIBE_GH', raising=False)
+    worker = make_worker(outbox, make_fake_gh(tmp_path, create_failures=10))
+    monkeypatch.setattr('core.publisher.random.uniform', lambda a, b: 1.0)
+    outbox.enqueue('app', str(tmp_path), 'vibe-app')
+
+    delays = []
+    now = time.time()
+    for _ in range(3):
+        job = outbox.claim_due(now=now + 10 ** 6)
+        start = time.time()
+        asyncio.run(worker.process(job))
+        [job] = outbox.jobs()
+        delays.append(round(job.next_attempt_at - start))
+
+    assert job.status == FAILED
+    assert job.attempts == 3
+    assert job.finished_at is not None
+    # The first two failures were rescheduled 30s, then 60s out
+    assert delays[:2] == [30, 60]
+    assert outbox.claim_due(now=now + 10 ** 7) is None
+
+
+def test_retry_after_repo_was_created_pushes_to_existing_origin(tmp_path, outbox, monkeypatch):
+    """A retry finds the repo created and origin already set (gh added it before the push failed)."""
+    monkeypatch.delenv('VIBE_GH', raising=False)
+    app = tmp_path / 'app'
+    bare = tmp_path / 'remote.git'
+    git = lambda *args, cwd=app: subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True)
+    app.mkdir()
+    git('init', '-q', '--bare', str(bare), cwd=tmp_path)
+    git('init', '-q')
+    (app / 'README.md').write_text('hi\n')
+    git('add', '.')
+    git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init')
+    git('remote', 'add', 'origin', 'https://github.com/me/old.git')
+    # Pushes to the "GitHub" URL land in the local bare repo
+    git('config', f'url.{bare}.insteadOf', 'https://github.com/me/vibe-app.git')
+
+    worker = make_worker(outbox, make_fake_gh(tmp_path, create_failures=10, create_error='already exists'))
+    outbox.enqueue('app', str(app), 'vibe-app')
+    asyncio.run(worker.process(outbox.claim_due()))
+
+    assert outbox.jobs() == []
+    origin = git('config', 'remote.origin.url').stdout.decode().strip()
+    assert origin == 'https://github.com/me/vibe-app.git'
+    heads = subprocess.run(['git', 'branch', '--list'], cwd=bare, capture_output=True, text=True).stdout
+    assert heads.strip()
+
+
+def test_enqueue_coalesces_pending_jobs_for_a_repo(tmp_path, outbox):
+    first = outbox.enqueue('app', str(tmp_path), 'vibe-app', topics=['a'])
+    second = outbox.enqueue('app', str(tmp_path), 'vibe-app', topics=['b'], description='new')
+
+    assert second.job_id == first.job_id
+    [job] = outbox.jobs()
+    assert job.topics == ['a', 'b']
+    assert job.description == 'new'
+
+
+def test_recover_requeues_jobs_left_running(tmp_path, outbox):
+    outbox.enqueue('app', str(tmp_path), 'vibe-app')
+    assert outbox.claim_due() is not None
+    assert outbox.claim_due() is None
+
+    outbox.recover()
+
+    assert outbox.claim_due().status != DONE
+
+
+def test_enqueue_wakes_only_its_own_outboxs_worker(tmp_path):
+    work = PublishOutbox(str(tmp_path / 'work' / 'outbox'), str(tmp_path / 'work' / 'published.json'))
+    personal = PublishOutbox(str(tmp_path / 'personal' / 'outbox'), str(tmp_path / 'personal' / 'published.json'))
+    # The generator enqueues through its own instance for the same directory
+    generator_side = PublishOutbox(str(tmp_path / 'work' / 'outbox'), str(tmp_path / 'work' / 'published.json'))
+    work.wakeup.clear()
+    personal.wakeup.clear()
+
+    generator_side.enqueue('app', str(tmp_path), 'vibe-app')
+
+    assert work.wakeup.is_set()
+    assert not personal.wakeup.is_set()
+
+
+def test_workers_for_two_outboxes_both_publish(tmp_path, monkeypatch):
+    """Each worker clears only its own wakeup, so neither swallows the other's enqueue."""
+    monkeypatch.delenv('VIBE_GH', raising=False)
+    gh = make_fake_gh(tmp_path)
+    outboxes = [PublishOutbox(str(tmp_path / name / 'outbox'), str(tmp_path / name / 'published.json'))
+                for name in ('work', 'personal')]
+
+    async def run():
+        workers = [make_worker(outbox, gh) for outbox in outboxes]
+        for worker in workers:
+            worker.start()
+        await asyncio.sleep(0.2)
+        for i, outbox in enumerate(outboxes):
+            await asyncio.to_thread(outbox.enqueue, f"app{i}", str(tmp_path), f"vibe-app{i}")
+        for _ in range(50):
+            if not any(outbox.jobs() for outbox in outboxes):
+                break
+            await asyncio.sleep(0.1)
+        await asyncio.gather(*(worker.stop(timeout=5) for worker in workers))
+
+    asyncio.run(run())
+
+    assert [outbox.jobs() for outbox in outboxes] == [[], []]
+    for i, outbox in enumerate(outboxes):
+        with open(outbox.published_file) as f:
+            assert f"app{i}" in json.load(f)
@@ -0,0 +1,77 @@
+"""Warm tool sessions handed out to generation jobs."""
+
+import asyncio
+import contextlib
+import io
+import sys
+
+import pytest
+
+from core.tool_pool import ToolPool
+from core.tool_runner import run_session
+
+FAKE_TOOL = '''#!{python}
+import json, sys, time
+for line in sys.stdin:
+    message = json.loads(line)
+    if message['type'] == 'ping':
+        print(json.dumps({{'type': 'pong', 'id': message['id']}}), flush=True)
+    elif message['prompt'] == 'slow':
+        time.sleep(3600)
+    else:
+        print(json.dumps({{'type': 'done', 'id': message['id'], 'returncode': 0}}), flush=True)
+'''
+
+
+@pytest.fixture
+def pool(tmp_path):
+    tool = tmp_path / 'fake-tool'
+    tool.write_text(FAKE_TOOL.format(python=sys.executable))
+    tool.chmod(0o755)
+    pool = ToolPool(str(tool), session_args=['--session'], size=1)
+    yield pool
+    pool.shutdown()
+
+
+def generate(session, prompt, tmp_path):
+    return run_session(session, {'type': 'generate', 'prompt': prompt}, str(tmp_path), io.StringIO(),
+                       wall_seconds=60, poll_interval=0.1)
+
+
+async def job(pool, prompt, tmp_path, seen):
+    async with pool.session_async() as session:
+        seen.append(session)
+        return await asyncio.to_thread(generate, session, prompt, tmp_path)
+
+
+def test_finished_session_is_reused(pool, tmp_path):
+    seen = []
+
+    async def main():
+        await job(pool, 'fast', tmp_path, seen)
+        await job(pool, 'fast', tmp_path, seen)
+
+    asyncio.run(main())
+
+    assert seen[0] is seen[1]
+    assert pool.stats() == {'enabled': True, 'sessions': 1, 'idle': 1}
+
+
+def test_cancelled_job_closes_its_session(pool, tmp_path):
+    seen = []
+
+    async def main():
+        task = asyncio.ensure_future(job(pool, 'slow', tmp_path, seen))
+        await asyncio.sleep(1)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        assert pool.stats() == {'enabled': True, 'sessions': 0, 'idle': 0}
+        # The next job gets a fresh session, not the one still busy
+        return await job(pool, 'fast', tmp_path, seen)
+
+    result = asyncio.run(main())
+
+    assert not seen[0].alive()
+    assert seen[1] is not seen[0]
+    assert result.returncode == 0
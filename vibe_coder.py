@@ -10,145 +10,388 @@ import asyncio
 import json
 import os
 import sys
+import time
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Optional
 
 # Add current directory to path for local imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from core.config import ConfigError, get_config, load_config
 from core.research import ResearchAgent
 from core.duplicate_checker import DuplicateChecker
 from core.generator import AppGenerator, AppGenerationResult
+from core.scheduler import GenerationScheduler, load_queue
+from core.pipeline import CyclePipeline, IdeaBacklog
+from core.planner import CyclePlanner, StageLatencies
+from core.idea_queue import IdeaQueue, load_idea_queue
+from core.journal import SETTLED, CycleJournal, load_journal
+from core.prefetch import get_cache, load_prefetch, warm_up
+from core.events import CYCLE_DONE, EVENT_TYPES, EventServer, emit, get_bus, stream_events
+from core.shutdown import get_shutdown
+from core.profiles import DEFAULT_PROFILE, Profile, get_profile, gh_env, load_profiles
+from core.schedule import CycleLock, Schedule, ScheduledRunner, load_schedule_state, sleep_until
+from core.archive import ProjectArchive
+from core.publisher import PublishOutbox, PublishWorker, load_published
 
 
-def load_config() -> dict:
-    """Load configuration."""
-    import yaml
-    config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    return {}
+async def run_vibe_cycle(max_iterations: int = 1, force_regenerate: bool = False,
+                         publisher: Optional[PublishWorker] = None,
+                         budget_seconds: Optional[float] = None,
+                         profile: Optional[Profile] = None) -> dict:
+    """Run a single vibe coding cycle.
 
+    profile (default: config.yaml as is) picks the settings, GitHub account
+    and projects/state directories the cycle works with.
 
-async def run_vibe_cycle(max_iterations: int = 1) -> dict:
-    """Run a single vibe coding cycle."""
+    force_regenerate skips the generation cache and always runs the AI tool.
+    publisher is a long-running publish worker (daemon mode); without one the
+    cycle starts its own and gives it publish.drain_seconds to flush at the end.
+    budget_seconds (default planner.cycle_budget_seconds) caps the cycle: the
+    planner sizes it from past stage latencies and every stage stops at the deadline.
+    Stages are checkpointed to state/cycle.json; a cycle that was killed is
+    resumed from there by the next call instead of starting over. On SIGTERM
+    (once an entry point has installed shutdown handling) the cycle drains:
+    running generations get shutdown.grace_seconds, and ideas whose
+    generation was cut off go back to the idea queue and backlog.
+    Subprocesses and network calls run on the event loop and blocking file
+    work in worker threads, so other tasks can share the loop.
+    """
     print("\n" + "="*60)
     print("  🎨 VIBE CODER - Autonomous App Factory")
     print("="*60)
     print(f"  Starting cycle at {datetime.utcnow().isoformat()}")
+    profile = profile or get_profile(load_config())
+    if profile.name != DEFAULT_PROFILE:
+        print(f"  Profile: {profile.name} ({profile.github_user})")
     print("="*60)
     
-    config = load_config()
-    
-    # Initialize components
-    research_agent = ResearchAgent()
-    duplicate_checker = DuplicateChecker(
-        github_user=config.get('duplicate_check', {}).get('github_user', 'vkumar-dev')
+    config = profile.config
+    
+    # Initialize components (research and duplicate checks use what the warm-up
+    # prefetched, and see what other workers sharing the idea queue are building)
+    idea_queue = IdeaQueue.from_config(config, profile.state_dir)
+    research_agent, duplicate_checker = build_checkers(config, idea_queue, profile)
+    shutdown = get_shutdown(config)
+    generator = AppGenerator(config, profile)
+    if force_regenerate:
+        generator.use_cache = False
+    scheduler = GenerationScheduler.from_config(generator, config, profile.state_dir)
+    lookahead = config.get('pipeline', {}).get('lookahead', 2)
+    
+    # Pick up an interrupted cycle where it left off
+    journal = CycleJournal.from_config(config, profile.state_dir)
+    resumed = await asyncio.to_thread(journal.begin, idea_queue.worker_id if idea_queue is not None else None)
+    generator.journal = journal
+    if resumed:
+        print(f"♻️  Resuming interrupted cycle {journal.cycle_id}")
+        # Ideas the killed run claimed are handed back or settled as this run's own
+        if idea_queue is not None:
+            await asyncio.to_thread(idea_queue.adopt, journal.previous_workers())
+        await generator.recover_projects()
+    
+    # Size the cycle to its time budget from how long stages took before
+    latencies = StageLatencies(profile.state_path('latencies.json'))
+    plan = CyclePlanner.from_config(config, latencies, budget_seconds).plan(
+        max_iterations,
+        scheduler.apps_per_cycle,
+        workers=scheduler.workers,
+        lookahead=lookahead,
+        duplicate_rate=duplicate_rate(load_history(profile))
     )
-    generator = AppGenerator(config)
-    
-    results = {
-        'cycle_start': datetime.utcnow().isoformat(),
-        'ideas_processed': 0,
-        'apps_generated': 0,
-        'duplicates_skipped': 0,
-        'apps': []
-    }
-    
-    # Phase 1: Research
-    print("\n" + "="*60)
-    print("  Phase 1: Research")
-    print("="*60)
-    
-    research_result = research_agent.run_full_research()
-    
-    # Get generated ideas
-    ideas = research_agent.ideas
-    
-    if not ideas:
-        print("⚠️  No ideas generated from research")
-        return results
-    
-    # Phase 2: Check duplicates and generate apps
-    print("\n" + "="*60)
-    print("  Phase 2: Duplicate Check & Generation")
-    print("="*60)
-    
-    apps_generated = 0
-    
-    for idea in ideas[:max_iterations]:
-        results['ideas_processed'] += 1
+    work_deadline, cycle_deadline = plan.deadlines()
+    print(f"  Plan: {plan.summary()}")
+    
+    # Start warm AI tool sessions while research runs
+    warming = None
+    if generator.tool_pool.enabled:
+        warming = asyncio.ensure_future(asyncio.to_thread(generator.tool_pool.warm))
+    
+    # Publishing runs in the background, off the cycle's critical path
+    owns_publisher = publisher is None
+    try:
+        if owns_publisher:
+            publisher = PublishWorker(generator.outbox, config)
+            publisher.start()
         
-        print(f"\n📋 Processing idea: {idea.title[:50]}...")
+        results = {
+            'cycle_id': journal.cycle_id,
+            'profile': profile.name,
+            'resumed': resumed,
+            'cycle_start': datetime.utcnow().isoformat(),
+            'ideas_processed': 0,
+            'apps_generated': 0,
+            'duplicates_skipped': 0,
+            'backlogged': 0,
+            'handed_back': 0,
+            'plan': plan.to_dict(),
+            'apps': []
+        }
         
-        # Check for duplicates
-        duplicate_check = duplicate_checker.check_duplicate(
-            idea_id=idea.id,
-            idea_title=idea.title,
-            idea_description=idea.description
+        # Research, duplicate checks and generation overlap: checks run ahead
+        # on the next ideas while earlier ones are being generated
+        pipeline = CyclePipeline(
+            research_agent,
+            duplicate_checker,
+            scheduler,
+            backlog=IdeaBacklog.from_config(config, profile.state_dir),
+            lookahead=lookahead,
+            deadline=work_deadline,
+            latencies=latencies,
+            journal=journal,
+            idea_queue=idea_queue,
+            shutdown=shutdown
         )
         
-        if duplicate_check.is_duplicate:
-            print(f"⚠️  Skipping duplicate idea")
-            results['duplicates_skipped'] += 1
-            continue
-        
-        # Generate app
-        gen_result = generator.generate_app(
-            idea_title=idea.title,
-            idea_description=idea.description,
-            idea_features=idea.features,
-            idea_id=idea.id,
-            is_ai_infused=idea.is_ai_infused,
-            ai_capabilities=idea.ai_capabilities
-        )
+        # Apps finished before an interruption count towards this cycle
+        built_before = []
+        for app_name, project in journal.built_projects().items():
+            built_before.append(AppGenerationResult(
+                idea_id=project.get('idea_id'),
+                app_name=app_name,
+                app_path=os.path.join(generator.projects_dir, app_name),
+                success=True
+            ))
+            results['apps'].append({
+                'idea_id': project.get('idea_id'),
+                'app_name': app_name,
+                'success': True,
+                'github_repo': None,
+                'publish_job': project.get('publish_job'),
+                'error': None
+            })
+            results['apps_generated'] += 1
+            print(f"✅ App generated before the interruption: {app_name}")
+        remaining_apps = plan.apps - results['apps_generated']
         
-        results['apps'].append({
-            'idea_id': idea.id,
-            'app_name': gen_result.app_name,
-            'success': gen_result.success,
-            'github_repo': gen_result.github_repo,
-            'error': gen_result.error
-        })
+        # Generate apps concurrently until the apps-per-cycle target is met;
+        # ideas claimed from the shared queue stay leased while heartbeats run
+        generated = []
+        heartbeats = asyncio.ensure_future(idea_queue.keep_alive()) if idea_queue is not None else None
+        try:
+            if remaining_apps > 0:
+                scheduler.apps_per_cycle = remaining_apps
+                generated = await pipeline.run(plan.ideas)
+                results['ideas_processed'] = pipeline.stats['ideas_processed']
+                results['duplicates_skipped'] = pipeline.stats['duplicates_skipped']
+                results['backlogged'] = pipeline.stats['backlogged']
+            elif plan.apps > 0:
+                print("\n🎯 This cycle's apps were all built before the interruption")
+            else:
+                print("\n⏰ Budget too small for a generation this cycle, skipping")
+            await asyncio.to_thread(latencies.save)
+            
+            # Complete or roll back projects left part-way by cancelled or failed jobs
+            generated += await generator.recover_projects()
+            
+            # Generations cut off by the deadline or a drain left nothing behind; retry them later
+            interrupted = journal.rolled_back_ideas() - {r.idea_id for r in generated}
+            results['handed_back'] = await pipeline.hand_back(interrupted)
+        finally:
+            # Record outcomes and hand unbuilt ideas back to the other workers
+            if heartbeats is not None:
+                heartbeats.cancel()
+                await asyncio.to_thread(idea_queue.settle, generated + built_before)
         
-        if gen_result.success:
-            apps_generated += 1
-            results['apps_generated'] += 1
-            print(f"✅ App generated: {gen_result.app_name}")
+        for gen_result in generated:
+            results['apps'].append({
+                'idea_id': gen_result.idea_id,
+                'app_name': gen_result.app_name,
+                'success': gen_result.success,
+                'github_repo': gen_result.github_repo,
+                'publish_job': gen_result.publish_job,
+                'error': gen_result.error
+            })
             
-            # Only generate 1 app per cycle (as per requirement)
-            if apps_generated >= 1:
-                print(f"\n🎯 Generated 1 app this cycle (limit reached)")
-                break
-        else:
-            print(f"❌ App generation failed: {gen_result.error}")
-    
-    # Summary
-    results['cycle_end'] = datetime.utcnow().isoformat()
-    results['duration_seconds'] = (
-        datetime.fromisoformat(results['cycle_end']) - 
-        datetime.fromisoformat(results['cycle_start'])
-    ).total_seconds()
+            if gen_result.success:
+                results['apps_generated'] += 1
+                print(f"✅ App generated: {gen_result.app_name}")
+            else:
+                print(f"❌ App generation failed: {gen_result.error}")
+        
+        if results['apps_generated'] >= plan.apps > 0:
+            print(f"\n🎯 Generated {results['apps_generated']} app(s) this cycle (limit reached)")
+        
+        # Summary
+        results['cycle_end'] = datetime.utcnow().isoformat()
+        results['duration_seconds'] = (
+            datetime.fromisoformat(results['cycle_end']) - 
+            datetime.fromisoformat(results['cycle_start'])
+        ).total_seconds()
+        
+        print("\n" + "="*60)
+        print("  Cycle Complete")
+        print("="*60)
+        print(f"  Ideas processed: {results['ideas_processed']}")
+        print(f"  Apps generated: {results['apps_generated']}")
+        print(f"  Duplicates skipped: {results['duplicates_skipped']}")
+        print(f"  Backlogged: {results['backlogged']}")
+        if results['handed_back']:
+            print(f"  Handed back: {results['handed_back']}")
+        print(f"  Duration: {results['duration_seconds']:.1f}s")
+        print("="*60)
+        
+        # Save cycle result; from here on a restart begins a new cycle. A cycle
+        # that raised before this point keeps its journal open to be resumed
+        await asyncio.to_thread(save_cycle_result, results, profile)
+        await asyncio.to_thread(journal.finish)
+        emit(CYCLE_DONE, **{key: results[key] for key in (
+            'cycle_id', 'profile', 'cycle_end', 'duration_seconds', 'ideas_processed',
+            'apps_generated', 'duplicates_skipped', 'backlogged', 'handed_back'
+        )})
+        await asyncio.to_thread(duplicate_checker.cache.save)
+        
+        # Move old and already-published projects to the archive tier
+        if config.get('archive', {}).get('enabled', False) and not cycle_deadline.expired() and not shutdown.requested:
+            await asyncio.to_thread(generator.archive.archive_eligible)
+        
+        return results
+    finally:
+        # Give this cycle's publish jobs a bounded chance to finish (the rest
+        # stay in the outbox for the next run), even when the cycle failed
+        if owns_publisher and publisher is not None:
+            drain_seconds = config.get('publish', {}).get('drain_seconds', 300)
+            if shutdown.requested:
+                drain_seconds = shutdown.grace.clamp(drain_seconds)
+            await publisher.stop(timeout=cycle_deadline.clamp(drain_seconds), drain=True)
+        
+        if warming is not None:
+            await asyncio.gather(warming, return_exceptions=True)
+
+
+def build_checkers(config: dict, idea_queue: Optional[IdeaQueue] = None, profile: Optional[Profile] = None):
+    """Research agent and duplicate checker sharing the process's prefetch cache.
+
+    Research is the same for every profile; duplicate checks look at the
+    profile's own account and projects. With idea_queue, they also consult
+    its in-flight ideas.
+    """
+    profile = profile or get_profile(config)
+    cache = get_cache(config)
+    research_agent = ResearchAgent(cache=cache, config=config)
+    duplicate_checker = DuplicateChecker(
+        github_user=profile.github_user,
+        cache=cache,
+        registry=idea_queue,
+        projects_dir=profile.projects_dir,
+        state_dir=profile.state_dir,
+        gh_env=gh_env(config),
+        similarity_threshold=config.get('duplicate_check', {}).get('similarity_threshold', 0.7)
+    )
+    return research_agent, duplicate_checker
+
+
+async def warm_caches(config: dict, profile: Optional[Profile] = None) -> dict:
+    """Prefetch research, the repo catalog, the local index and template dependencies; re-rank the backlog."""
+    profile = profile or get_profile(config)
+    research_agent, duplicate_checker = build_checkers(profile.config, profile=profile)
+    dependencies = None
+    if profile.config.get('deps', {}).get('enabled', True):
+        dependencies = AppGenerator(profile.config, profile).prepare_dependencies
+    return await warm_up(research_agent, duplicate_checker, IdeaBacklog.from_config(profile.config, profile.state_dir),
+                         dependencies)
+
+
+async def idle_until(next_run: float, config: dict, heartbeat=None, profile: Optional[Profile] = None):
+    """Sleep until next_run (a time.time()), warming caches prefetch.lead_minutes before it."""
+    lead_seconds = config.get('prefetch', {}).get('lead_minutes', 10) * 60
+    warm_at = next_run - lead_seconds
+    if lead_seconds and warm_at > time.time():
+        await sleep_until(warm_at, heartbeat)
+        try:
+            await warm_caches(config, profile)
+        except Exception as e:
+            print(f"⚠️  Warm-up failed: {e}")
+    await sleep_until(next_run, heartbeat)
+
+
+def make_runner(config: dict, interval_hours: Optional[float] = None, max_ideas: int = 5,
+                publisher: Optional[PublishWorker] = None, heartbeat_file: Optional[str] = None,
+                profile: Optional[Profile] = None) -> ScheduledRunner:
+    """Scheduled cycles shared by the daemon, the cloud worker and worker.sh.
+
+    interval_hours overrides loop.interval_hours / loop.schedule. Each cycle's
+    budget runs up to the following scheduled run at most. Each profile has
+    its own runner, schedule state and lock; every cycle and warm-up uses the
+    current config.yaml, and a watched change to loop.* reschedules.
+    """
+    profile = profile or get_profile(config)
+    schedule = Schedule.from_config(profile.config, interval_hours)
+    
+    def current_profile() -> Profile:
+        return get_profile(load_config(), profile.name)
+    
+    async def run_cycle(slot: float):
+        cycle_profile = current_profile()
+        return await run_vibe_cycle(
+            max_iterations=max_ideas,
+            publisher=publisher,
+            budget_seconds=cycle_budget(cycle_profile.config, schedule.next_after(slot) - time.time()),
+            profile=cycle_profile
+        )
     
-    print("\n" + "="*60)
-    print("  Cycle Complete")
-    print("="*60)
-    print(f"  Ideas processed: {results['ideas_processed']}")
-    print(f"  Apps generated: {results['apps_generated']}")
-    print(f"  Duplicates skipped: {results['duplicates_skipped']}")
-    print(f"  Duration: {results['duration_seconds']:.1f}s")
-    print("="*60)
+    async def idle(until: float):
+        idle_profile = current_profile()
+        await idle_until(until, idle_profile.config, heartbeat, idle_profile)
+    
+    heartbeat = (lambda: write_heartbeat(heartbeat_file)) if heartbeat_file else None
+    runner = ScheduledRunner(
+        schedule,
+        run_cycle,
+        idle=idle,
+        heartbeat=heartbeat,
+        state_file=profile.state_path('schedule.json'),
+        lock=CycleLock(profile.state_path('cycle.lock')),
+        shutdown=get_shutdown(config)
+    )
     
-    # Save cycle result
-    save_cycle_result(results)
+    def reschedule(config: dict):
+        new_schedule = Schedule.from_config(get_profile(config, profile.name).config, interval_hours)
+        if new_schedule.describe() != runner.schedule.describe():
+            runner.reschedule(new_schedule)
     
-    return results
+    get_config().subscribe(('loop', 'profiles'), reschedule)
+    return runner
+
 
+def write_heartbeat(heartbeat_file: str):
+    """Tell supervisor.sh we're alive while waiting for the next run."""
+    with open(heartbeat_file, 'w') as f:
+        f.write(datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ') + '\n')
 
-def save_cycle_result(results: dict):
+
+def load_history(profile: Optional[Profile] = None) -> list:
+    """Load past cycle results."""
+    history_file = (profile or get_profile(load_config())).state_path('history.json')
+    if os.path.exists(history_file):
+        try:
+            with open(history_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return []
+
+
+def duplicate_rate(history: list, cycles: int = 20) -> float:
+    """Share of checked ideas that turned out to be duplicates recently."""
+    recent = history[-cycles:]
+    processed = sum(h.get('ideas_processed', 0) for h in recent)
+    if not processed:
+        return 0.0
+    return sum(h.get('duplicates_skipped', 0) for h in recent) / processed
+
+
+def cycle_budget(config: dict, until_next_run: float) -> float:
+    """Budget for a recurring cycle: the configured one, never past the next run."""
+    budget = config.get('planner', {}).get('cycle_budget_seconds', 0)
+    until_next_run = max(60.0, until_next_run)
+    return min(budget, until_next_run) if budget else until_next_run
+
+
+def save_cycle_result(results: dict, profile: Optional[Profile] = None):
     """Save cycle result to history."""
-    history_file = os.path.join(os.path.dirname(__file__), 'state', 'history.json')
+    history_file = (profile or get_profile(load_config())).state_path('history.json')
     os.makedirs(os.path.dirname(history_file), exist_ok=True)
     
     # Load existing history
@@ -168,42 +411,139 @@ def save_cycle_result(results: dict):
         json.dump(history[-100:], f, indent=2)
 
 
-async def run_daemon(interval_hours: float = 4.0):
-    """Run vibe coder as daemon (continuous)."""
+async def run_daemon(interval_hours: Optional[float] = None):
+    """Run vibe coder as daemon (continuous), for every profile."""
+    config = load_config()
+    profiles = load_profiles(config)
+    
+    # Per profile, one publish worker for the daemon's lifetime, busy while we sleep
+    publishers = [profile_publisher(profile) for profile in profiles]
+    runners = [make_runner(config, interval_hours, publisher=publisher, profile=profile)
+               for profile, publisher in zip(profiles, publishers)]
+    
     print("\n" + "="*60)
     print("  🎨 VIBE CODER - Daemon Mode")
     print("="*60)
-    print(f"  Interval: {interval_hours} hours")
-    print(f"  Apps per day: {24 / interval_hours:.0f}")
+    for profile, runner in zip(profiles, runners):
+        label = f"{profile.name} ({profile.github_user})" if len(profiles) > 1 else "Schedule"
+        print(f"  {label}: {runner.schedule.describe()}")
     print(f"  Press Ctrl+C to stop")
     print("="*60)
     
-    while True:
+    watcher = watch_config()
+    try:
+        for publisher in publishers:
+            publisher.start()
+        
+        # Runs start on the schedule's wall-clock times, however long cycles take;
+        # caches are warmed shortly before each one. Profiles share the research,
+        # caches and AI tool pool. Ctrl+C or SIGTERM drains.
+        await until_stopped(serve_events(asyncio.gather(*(runner.run_forever() for runner in runners))))
+    finally:
+        print("\n\n🛑 Stopping daemon...")
+        watcher.cancel()
+        timeout = get_shutdown().grace.clamp(30)
+        await asyncio.gather(*(publisher.stop(timeout=timeout) for publisher in publishers))
+
+
+def profile_publisher(profile: Profile) -> PublishWorker:
+    """A publish worker for the profile's outbox and GitHub account."""
+    outbox = PublishOutbox(profile.state_path('outbox'), profile.state_path('published.json'))
+    publisher = PublishWorker(outbox, profile.config)
+    get_config().subscribe(
+        ('publish', 'profiles'),
+        lambda config: publisher.configure(get_profile(config, profile.name).config)
+    )
+    return publisher
+
+
+def watch_config() -> asyncio.Task:
+    """Apply config.yaml edits to the running process (reload.poll_seconds) until cancelled.
+
+    Cycles read the current config as they start; long-lived parts (schedules,
+    publish workers, the drain grace period, the prefetch cache) subscribe.
+    """
+    service = get_config()
+    service.subscribe('shutdown', get_shutdown)
+    service.subscribe('prefetch', get_cache)
+    return asyncio.create_task(service.watch())
+
+
+def profile_archive(profile: Profile) -> ProjectArchive:
+    """The profile's projects, archived ones included."""
+    return ProjectArchive(profile.projects_dir, profile.config, profile.state_path('published.json'))
+
+
+async def serve_events(awaitable):
+    """Await awaitable while streaming pipeline events to local clients (events.*)."""
+    server = EventServer.from_config(get_bus(), load_config())
+    if server is not None:
         try:
-            await run_vibe_cycle(max_iterations=5)
-            
-            next_run = datetime.utcnow().timestamp() + (interval_hours * 3600)
-            print(f"\n💤 Sleeping until {datetime.fromtimestamp(next_run).isoformat()}")
-            print(f"   (Next app in {interval_hours} hours)")
-            
-            await asyncio.sleep(interval_hours * 3600)
-            
-        except KeyboardInterrupt:
-            print("\n\n🛑 Stopping daemon...")
-            break
-        except Exception as e:
-            print(f"\n❌ Error in cycle: {e}")
-            print("   Retrying in 1 hour...")
-            await asyncio.sleep(3600)
+            await server.start()
+        except OSError as e:
+            print(f"⚠️  Not streaming events: {e}")
+            server = None
+    try:
+        return await awaitable
+    finally:
+        if server is not None:
+            await server.stop()
+
+
+async def until_stopped(awaitable, cycle: bool = False):
+    """Run an entry point's work with SIGTERM and Ctrl+C draining it.
+
+    cycle marks the work itself as a cycle, to be given the drain's grace
+    period. A second signal cancels it outright (returns None).
+    """
+    shutdown = get_shutdown(load_config())
+    shutdown.install()
+    try:
+        with shutdown.working() if cycle else nullcontext():
+            return await awaitable
+    except asyncio.CancelledError:
+        print("🛑 Stopped; an interrupted cycle resumes on the next start")
+        return None
+
 
+def run_once(max_ideas: int = 5, force_regenerate: bool = False, budget_seconds: Optional[float] = None,
+             profile_name: Optional[str] = None):
+    """One cycle now, unless a scheduled one is already running."""
+    profile = get_profile(load_config(), profile_name)
+    with CycleLock(profile.state_path('cycle.lock')) as acquired:
+        if not acquired:
+            print("⏳ Another cycle is already running; try again when it finishes")
+            sys.exit(1)
+        asyncio.run(until_stopped(
+            serve_events(run_vibe_cycle(max_ideas, force_regenerate=force_regenerate,
+                                        budget_seconds=budget_seconds, profile=profile)),
+            cycle=True
+        ))
 
-def show_status():
+
+def run_scheduled(max_ideas: int = 5, heartbeat_file: Optional[str] = None, profile_name: Optional[str] = None):
+    """Wait for the next scheduled (or missed) run and do it, for worker.sh."""
+    config = load_config()
+    runner = make_runner(config, max_ideas=max_ideas, heartbeat_file=heartbeat_file,
+                         profile=get_profile(config, profile_name))
+    asyncio.run(until_stopped(serve_events(runner.run_next())))
+
+
+def show_status(profile_name: Optional[str] = None):
     """Show vibe coder status."""
+    config = load_config()
+    profile = get_profile(config, profile_name)
+    
     print("\n" + "="*60)
     print("  🎨 VIBE CODER - Status")
     print("="*60)
     
-    history_file = os.path.join(os.path.dirname(__file__), 'state', 'history.json')
+    profiles = load_profiles(config)
+    if len(profiles) > 1:
+        print(f"  Profile: {profile.name} ({profile.github_user}); "
+              f"all: {', '.join(p.name for p in profiles)}")
+    
+    history_file = profile.state_path('history.json')
     
     if os.path.exists(history_file):
         with open(history_file, 'r') as f:
@@ -225,44 +565,171 @@ def show_status():
     else:
         print("  No cycles run yet")
     
-    # Show recent apps
-    projects_dir = os.path.join(os.path.dirname(__file__), 'projects')
-    if os.path.exists(projects_dir):
-        projects = os.listdir(projects_dir)
-        if projects:
-            print(f"\n  Recent apps ({len(projects)} total):")
-            for proj in projects[-5:]:
-                print(f"    - {proj}")
+    # Show the schedule
+    schedule = Schedule.from_config(profile.config)
+    schedule_state = load_schedule_state(profile.state_path('schedule.json'))
+    print(f"\n  Schedule: {schedule.describe()}")
+    if schedule_state.get('running_slot'):
+        print(f"    Running: the {datetime.fromtimestamp(schedule_state['running_slot'], schedule.tz).isoformat()} run")
+    if schedule_state.get('last_slot'):
+        print(f"    Last run: {datetime.fromtimestamp(schedule_state['last_slot'], schedule.tz).isoformat()}")
+    print(f"    Next run: {datetime.fromtimestamp(schedule.next_after(time.time()), schedule.tz).isoformat()}")
+    
+    # Show an interrupted cycle waiting to be resumed
+    journal = load_journal(profile.state_path('cycle.json'))
+    if journal.get('status') == 'running':
+        unsettled = [name for name, p in journal.get('projects', {}).items()
+                     if p.get('stage') not in SETTLED]
+        print(f"\n  Unfinished cycle: {journal['cycle_id']} (started {journal.get('started_at', 'N/A')})")
+        print(f"    Research: {'done' if journal.get('research') is not None else 'pending'}, "
+              f"{len(journal.get('verdicts', {}))} verdict(s), {len(unsettled)} project(s) to settle")
+    
+    # Show generation queue
+    queue = load_queue(profile.state_path('queue.json'))
+    if queue:
+        print(f"\n  Generation queue ({queue.get('workers', 1)} workers):")
+        print(f"    Pending: {len(queue.get('pending', []))}")
+        print(f"    Running: {len(queue.get('running', []))}")
+        for job in queue.get('running', []):
+            print(f"      - {job['app_name']} (since {job['started_at']})")
+        print(f"    Finished: {len(queue.get('finished', []))}")
+    
+    # Show the idea queue shared between workers
+    idea_queue = load_idea_queue(profile.config, profile.state_dir)
+    if idea_queue.get('counts'):
+        counts = ', '.join(f"{n} {status}" for status, n in sorted(idea_queue['counts'].items()))
+        print(f"\n  Shared idea queue: {counts}")
+        print(f"    Active workers: {', '.join(idea_queue['workers']) or 'none'}")
+        for held in idea_queue['held'][:5]:
+            print(f"    - {held['title'][:50]} ({held['status']} by {held['owner']})")
+    
+    # Show verified ideas waiting for a later cycle
+    backlog = IdeaBacklog.from_config(profile.config, profile.state_dir).load()
+    if backlog:
+        print(f"\n  Idea backlog: {len(backlog)} verified idea(s)")
+        for idea in backlog[:5]:
+            print(f"    - {idea.title[:50]}")
+    
+    # Show idle-time prefetch timing and hit rates
+    prefetch = load_prefetch()
+    if prefetch.get('warmups') or prefetch.get('stats'):
+        print(f"\n  Prefetch:")
+        if prefetch.get('warmups'):
+            last = prefetch['warmups'][-1]
+            steps = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in last['steps'].items())
+            print(f"    Last warm-up: {last['at']} took {last['seconds']:.1f}s ({steps})")
+        for key, counts in sorted(prefetch.get('stats', {}).items()):
+            total = counts['hits'] + counts['misses']
+            print(f"    {key}: {counts['hits']}/{total} hits ({counts['hits'] / total:.0%})")
+    
+    # Show publish outbox
+    outbox = PublishOutbox(profile.state_path('outbox'), profile.state_path('published.json'))
+    pending = outbox.jobs('queued') + outbox.jobs('running')
+    failed = outbox.jobs('failed')
+    published = load_published(profile.state_path('published.json'))
+    print(f"\n  Publishing: {len(published)} confirmed, {len(pending)} pending, {len(failed)} failed")
+    for job in pending[:5]:
+        note = f" (attempt {job.attempts}: {job.last_error})" if job.last_error else ""
+        print(f"    - {job.repo_name}{note}")
+    
+    # Show recent apps (archived ones come from the archive manifest)
+    archive = profile_archive(profile)
+    projects = archive.list_projects()
+    if projects:
+        archive_stats = archive.stats()
+        print(f"\n  Recent apps ({len(projects)} total, {archive_stats['archived']} archived):")
+        for proj in projects[-5:]:
+            print(f"    - {proj.name}{' (archived)' if proj.archived else ''}")
     
     print("="*60)
 
 
-def list_apps():
+def list_apps(profile_name: Optional[str] = None):
     """List all generated apps."""
     print("\n" + "="*60)
     print("  🎨 Generated Apps")
     print("="*60)
     
-    projects_dir = os.path.join(os.path.dirname(__file__), 'projects')
+    projects = profile_archive(get_profile(load_config(), profile_name)).list_projects()
     
-    if not os.path.exists(projects_dir):
+    if not projects:
         print("  No apps generated yet")
         return
     
-    for project in sorted(os.listdir(projects_dir)):
-        project_path = os.path.join(projects_dir, project)
-        if os.path.isdir(project_path):
-            readme_path = os.path.join(project_path, 'README.md')
-            
-            print(f"\n📦 {project}")
-            
-            if os.path.exists(readme_path):
-                with open(readme_path, 'r') as f:
-                    first_line = f.readline().strip()
-                    if first_line.startswith('#'):
-                        print(f"   {first_line[1:].strip()}")
-            
-            print(f"   Path: {project_path}")
+    for project in projects:
+        print(f"\n📦 {project.name}{' (archived)' if project.archived else ''}")
+        
+        first_line = project.readme_head.split('\n', 1)[0].strip()
+        if first_line.startswith('#'):
+            print(f"   {first_line[1:].strip()}")
+        
+        print(f"   Path: {project.path}")
+
+
+def archive_projects(dry_run: bool = False, profile_name: Optional[str] = None):
+    """Archive old or already-pushed projects."""
+    archive = profile_archive(get_profile(load_config(), profile_name))
+    
+    names = archive.archive_eligible(dry_run=dry_run)
+    verb = "Would archive" if dry_run else "Archived"
+    print(f"🗄️  {verb} {len(names)} project(s)")
+    for name in names:
+        print(f"   - {name}")
+
+
+def publish_pending(profile_name: Optional[str] = None):
+    """Publish due jobs from the outbox in the foreground (every profile's by default)."""
+    config = load_config()
+    profiles = [get_profile(config, profile_name)] if profile_name else load_profiles(config)
+    for profile in profiles:
+        ran = asyncio.run(profile_publisher(profile).drain(timeout=3600))
+        label = f" for {profile.name}" if len(profiles) > 1 else ""
+        print(f"🚀 Processed {ran} publish job(s){label}")
+
+
+def extract_project(name: str, profile_name: Optional[str] = None):
+    """Extract an archived project back into projects/."""
+    archive = profile_archive(get_profile(load_config(), profile_name))
+    
+    if not archive.is_archived(name):
+        print(f"⚠️  {name} is not archived")
+        return
+    
+    print(f"✅ Extracted to {archive.ensure_extracted(name)}")
+
+
+def follow_events(types: Optional[list] = None):
+    """Print a running daemon's events as JSON lines until it stops."""
+    try:
+        for event in stream_events(load_config(), types):
+            print(event.to_json(), flush=True)
+    except OSError as e:
+        print(f"⚠️  No events to follow (is a daemon or run going?): {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def prepare_dependencies(install: Optional[str] = None, profile_name: Optional[str] = None):
+    """Pre-resolve template dependencies, or install a project from the store."""
+    profile = get_profile(load_config(), profile_name)
+    generator = AppGenerator(profile.config, profile)
+    
+    if install is None:
+        # Asked for explicitly, so earlier failures are retried too
+        stats = generator.prepare_dependencies(force=True)
+        print(f"📦 Dependency store: {stats['lockfiles']} lockfile(s), {stats['packages']} package(s)"
+              + (f", {stats['failed']} failed resolution(s)" if stats['failed'] else ''))
+        return
+    
+    project_dir = install
+    if not os.path.isdir(project_dir):
+        project_dir = generator.archive.ensure_extracted(install)
+    for package_dir in (project_dir, os.path.join(project_dir, 'client')):
+        if os.path.exists(os.path.join(package_dir, 'package-lock.json')):
+            result = generator.dep_store.install(package_dir)
+            print(f"✅ {package_dir}: {result.packages} package(s) via {result.clone_method}, "
+                  f"{result.fetched} fetched")
 
 
 def main():
@@ -272,43 +739,131 @@ def main():
     
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
+    # Commands working on one profile (the daemon runs them all)
+    profile_parser = argparse.ArgumentParser(add_help=False)
+    profile_parser.add_argument(
+        '--profile', '-p',
+        metavar='NAME',
+        help='Profile from profiles: in config.yaml (default: config.yaml as is)'
+    )
+    
     # Run command
-    run_parser = subparsers.add_parser('run', help='Run single cycle')
+    run_parser = subparsers.add_parser('run', help='Run single cycle', parents=[profile_parser])
     run_parser.add_argument(
         '--max-ideas', '-n',
         type=int,
         default=5,
         help='Maximum ideas to process'
     )
+    run_parser.add_argument(
+        '--budget',
+        type=float,
+        metavar='SECONDS',
+        help='Time budget for the cycle (default: planner.cycle_budget_seconds)'
+    )
+    run_parser.add_argument(
+        '--force-regenerate',
+        action='store_true',
+        help='Ignore the generation cache and always run the AI tool'
+    )
+    run_parser.add_argument(
+        '--scheduled',
+        action='store_true',
+        help='Wait for the next scheduled run (loop.* in config.yaml) first'
+    )
+    run_parser.add_argument(
+        '--heartbeat',
+        metavar='FILE',
+        help='With --scheduled, refresh this heartbeat file while waiting'
+    )
     
     # Daemon command
     daemon_parser = subparsers.add_parser('daemon', help='Run continuously')
     daemon_parser.add_argument(
         '--interval', '-i',
         type=float,
-        default=4.0,
-        help='Hours between cycles'
+        help='Hours between cycles (default: loop.schedule / loop.interval_hours)'
     )
     
     # Status command
-    subparsers.add_parser('status', help='Show status')
+    subparsers.add_parser('status', help='Show status', parents=[profile_parser])
     
     # List command
-    subparsers.add_parser('list', help='List generated apps')
+    subparsers.add_parser('list', help='List generated apps', parents=[profile_parser])
+    
+    # Archive commands
+    archive_parser = subparsers.add_parser('archive', help='Archive old or pushed projects', parents=[profile_parser])
+    archive_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Only show what would be archived'
+    )
+    extract_parser = subparsers.add_parser('extract', help='Extract an archived project', parents=[profile_parser])
+    extract_parser.add_argument('name', help='Project name')
+    
+    # Publish command
+    subparsers.add_parser('publish', help='Publish pending apps to GitHub now', parents=[profile_parser])
+    
+    # Events command
+    events_parser = subparsers.add_parser('events', help='Follow pipeline events of a running daemon')
+    events_parser.add_argument(
+        '--type', '-t',
+        action='append',
+        choices=EVENT_TYPES,
+        help='Only these event types (repeatable)'
+    )
     
-    args = parser.parse_args()
+    # Dependency store command
+    deps_parser = subparsers.add_parser('deps', help='Pre-resolve template dependencies', parents=[profile_parser])
+    deps_parser.add_argument(
+        '--install',
+        metavar='PROJECT',
+        help='Install a project\'s node_modules offline from the store'
+    )
     
-    if args.command == 'run' or args.command is None:
-        asyncio.run(run_vibe_cycle(getattr(args, 'max_ideas', 5)))
+    args = parser.parse_args()
+    profile_name = getattr(args, 'profile', None)
+    
+    try:
+        load_config()
+    except ConfigError as e:
+        print(f"❌ Invalid config.yaml: {e}")
+        sys.exit(1)
+    
+    if args.command == 'run' and args.scheduled:
+        run_scheduled(args.max_ideas, args.heartbeat, profile_name)
+    
+    elif args.command == 'run' or args.command is None:
+        run_once(
+            getattr(args, 'max_ideas', 5),
+            force_regenerate=getattr(args, 'force_regenerate', False),
+            budget_seconds=getattr(args, 'budget', None),
+            profile_name=profile_name
+        )
     
     elif args.command == 'daemon':
         asyncio.run(run_daemon(args.interval))
     
     elif args.command == 'status':
-        show_status()
+        show_status(profile_name)
     
     elif args.command == 'list':
-        list_apps()
+        list_apps(profile_name)
+    
+    elif args.command == 'archive':
+        archive_projects(args.dry_run, profile_name)
+    
+    elif args.command == 'extract':
+        extract_project(args.name, profile_name)
+    
+    elif args.command == 'publish':
+        publish_pending(profile_name)
+    
+    elif args.command == 'events':
+        follow_events(args.type)
+    
+    elif args.command == 'deps':
+        prepare_dependencies(args.install, profile_name)
     
     else:
         parser.print_help()
@@ -3,7 +3,8 @@
 ################################################################################
 # Vibe Coder - Worker Script
 #
-# The actual execution loop. Generates 1 app every 4 hours.
+# The actual execution loop. Runs a cycle at each scheduled time (loop.*
+# in config.yaml), waiting inside vibe_coder.py so cycles don't drift.
 # Gets monitored by supervisor.sh
 #
 # Usage: ./worker.sh
@@ -33,19 +34,16 @@ echo $$ > "$PID_FILE"
 
 echo "[$(date)] Worker starting..."
 
-while : do
-  TIMESTAMP=$(date "+%Y-%m-%d %H:%M:%S")
-  TIMESTAMP_ISO=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
+while :; do
+  echo "[$(date "+%Y-%m-%d %H:%M:%S")] Waiting for the next scheduled cycle..."
   
-  echo "[$TIMESTAMP] Executing vibe coding cycle..."
-  
-  # Execute the vibe coder cycle
+  # Wait for the next scheduled run (heartbeating meanwhile), then run it
   OUTPUT=$(
     cd "$WORK_DIR"
-    python3 vibe_coder.py run --max-ideas 5 2>&1
-  )
-  
-  EXIT_CODE=$?
+    python3 vibe_coder.py run --scheduled --heartbeat "$HEARTBEAT_FILE" --max-ideas 5 2>&1
+  ) && EXIT_CODE=0 || EXIT_CODE=$?
+  TIMESTAMP=$(date "+%Y-%m-%d %H:%M:%S")
+  TIMESTAMP_ISO=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
   
   # Write output
   {
@@ -70,10 +68,9 @@ while : do
     } >> "$ERROR_FILE"
     
     echo "[$TIMESTAMP] ERROR: Execution failed with code $EXIT_CODE"
+    # Don't spin if the cycle fails straight away
+    sleep 60
   else
-    echo "[$TIMESTAMP] Success. Next cycle in 4 hours."
+    echo "[$TIMESTAMP] Success."
   fi
-  
-  # Sleep 4 hours (14400 seconds)
-  sleep 14400
 done